@@ -20,13 +20,15 @@ import tempfile
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, project_root)
 
-from backend.database import Database
+from backend.bulk_insert import BULK_INSERTS
+from backend.database import Database, RollbackTransaction
 from backend.cloud_backup import (
     GCSBackupService,
     create_backup_filename,
     is_gcs_available,
 )
 from utils.logger import log_info, log_error
+from utils.helpers import generate_id
 
 # Initialize Flask app
 # Set static folder to serve web frontend
@@ -41,6 +43,12 @@ if cors_available:
 # Initialize database instance
 db = Database()
 
+
+@app.teardown_appcontext
+def release_db_connection(exception=None):
+    """Hand this request thread's SQLite connection back to the pool"""
+    db.release_connection()
+
 # ============================================================================
 # Authentication Middleware (Optional - can be enhanced with JWT)
 # ============================================================================
@@ -54,6 +62,25 @@ def require_auth(f):
         return f(*args, **kwargs)
     return decorated_function
 
+def list_filters(*names):
+    """Collect the list filters given in the query string (see build_filtered_query)"""
+    return {name: request.args[name] for name in names if request.args.get(name)}
+
+def list_fields():
+    """Columns requested with ?fields=a,b,c (None for every column)"""
+    fields = [name.strip() for name in request.args.get('fields', '').split(',') if name.strip()]
+    return fields or None
+
+def list_response(entity, key, filters, fields=None):
+    """Body of a list endpoint: one keyset page when ?limit= or ?cursor= is given
+    (with next_cursor for the following page), otherwise the whole list"""
+    if request.args.get('limit') or request.args.get('cursor'):
+        limit = max(1, min(int(request.args.get('limit', 50)), 1000))
+        rows, next_cursor = db.find_page(entity, filters, fields=fields, limit=limit,
+                                         cursor=request.args.get('cursor'))
+        return {'success': True, key: rows, 'next_cursor': next_cursor}
+    return {'success': True, key: db.find_records(entity, fields=fields, **filters)}
+
 # ============================================================================
 # Error Handlers
 # ============================================================================
@@ -96,7 +123,19 @@ def health_check():
     return jsonify({
         'status': 'healthy',
         'service': 'Hospital Management System API',
-        'database': 'connected'
+        'database': 'connected',
+        'cache': db.cache_stats()
+    })
+
+@app.route('/api/health/queries', methods=['GET'])
+def query_stats():
+    """Per-method query latency histograms and recent slow queries (needs HMS_SLOW_QUERY_MS)"""
+    if request.args.get('reset') == '1':
+        db.reset_query_stats()
+    return jsonify({
+        'enabled': db.query_profiling,
+        'methods': db.query_stats(),
+        'slow_queries': db.slow_queries()
     })
 
 # ============================================================================
@@ -126,6 +165,37 @@ def login():
         log_error("Login error", e)
         return jsonify({'error': str(e)}), 500
 
+# ============================================================================
+# Bulk Load Routes
+# ============================================================================
+
+@app.route('/api/<entity>/bulk', methods=['POST'])
+def bulk_add(entity):
+    """Insert many patients, doctors, appointments, admissions or bills in one request
+
+    Body: a JSON array of rows (the same fields as the single-row POST), or
+    {"rows": [...]}. Valid rows are kept even when others are rejected.
+    """
+    try:
+        if entity not in BULK_INSERTS:
+            return jsonify({'error': f'Bulk insert is not supported for {entity}'}), 404
+        data = request.get_json()
+        rows = data.get('rows') if isinstance(data, dict) else data
+        if not isinstance(rows, list) or not rows:
+            return jsonify({'error': 'No rows provided'}), 400
+
+        result = db.bulk_add(entity, rows)
+        status = 201 if result['inserted'] else 400
+        return jsonify({
+            'success': not result['errors'],
+            'inserted': result['inserted'],
+            'rejected': len(result['errors']),
+            'errors': result['errors'],
+        }), status
+    except Exception as e:
+        log_error(f"Bulk add {entity} error", e)
+        return jsonify({'error': str(e)}), 500
+
 # ============================================================================
 # Patient Routes
 # ============================================================================
@@ -136,10 +206,13 @@ def get_patients():
     try:
         search_query = request.args.get('search', '')
         if search_query:
-            patients = db.search_patients(search_query)
-        else:
-            patients = db.get_all_patients()
-        return jsonify({'success': True, 'patients': patients}), 200
+            # Search results are ranked by relevance, so they are bounded rather than paged
+            limit = max(1, min(int(request.args.get('limit', 100)), 500))
+            patients = db.search_patients(search_query, limit)
+            return jsonify({'success': True, 'patients': patients}), 200
+        return jsonify(list_response('patients', 'patients', {}, list_fields())), 200
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         log_error("Get patients error", e)
         return jsonify({'error': str(e)}), 500
@@ -217,29 +290,14 @@ def get_patient_active_admission(patient_id):
 
 @app.route('/api/admissions', methods=['GET'])
 def get_all_admissions():
-    """Get all admissions with optional status filter"""
+    """Get all admissions with optional filters"""
     try:
-        status = request.args.get('status')  # Optional: 'Admitted', 'Discharged', or None for all
-        
-        # Get all patients and their admissions
-        all_patients = db.get_all_patients()
-        all_admissions = []
-        
-        for patient in all_patients:
-            patient_admissions = db.get_admissions_by_patient(patient['patient_id'])
-            for admission in patient_admissions:
-                # Apply status filter if provided
-                if status and admission.get('status') != status:
-                    continue
-                
-                admission['patient_name'] = f"{patient['first_name']} {patient['last_name']}"
-                admission['patient_id'] = patient['patient_id']
-                all_admissions.append(admission)
-        
-        # Sort by admission date (newest first)
-        all_admissions.sort(key=lambda x: x.get('admission_date', ''), reverse=True)
-        
-        return jsonify({'success': True, 'admissions': all_admissions}), 200
+        # status: 'Admitted', 'Discharged', or omitted for all
+        filters = list_filters('status', 'patient_name', 'patient_id', 'doctor_id', 'ward', 'date_from', 'date_to',
+                               'order')
+        return jsonify(list_response('admissions', 'admissions', filters, list_fields())), 200
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         log_error("Get all admissions error", e)
         return jsonify({'error': str(e)}), 500
@@ -267,10 +325,24 @@ def create_admission():
             if not data.get(r):
                 return jsonify({'error': f'{r} is required'}), 400
 
-        success = db.add_admission(data)
-        if success:
-            return jsonify({'success': True, 'message': 'Admission created successfully'}), 201
-        return jsonify({'error': 'Failed to create admission'}), 400
+        # Optional first progress note, saved in the same transaction as the admission
+        note = data.get('first_note')
+        if note is not None:
+            if not isinstance(note, dict) or not note.get('note_text'):
+                return jsonify({'error': 'first_note.note_text is required'}), 400
+            note = dict(note)
+            note['admission_id'] = data['admission_id']
+            note.setdefault('note_id', generate_id('ADN'))
+            note.setdefault('note_date', data['admission_date'])
+
+        with db.transaction():
+            success = db.add_admission(data) and (note is None or db.add_admission_note(note))
+            if not success:
+                # Undo the admission as well when its note could not be saved
+                raise RollbackTransaction()
+        if not success:
+            return jsonify({'error': 'Failed to create admission'}), 400
+        return jsonify({'success': True, 'message': 'Admission created successfully'}), 201
     except Exception as e:
         log_error("Create admission error", e)
         return jsonify({'error': str(e)}), 500
@@ -333,8 +405,9 @@ def add_admission_note(admission_id):
 def get_doctors():
     """Get all doctors"""
     try:
-        doctors = db.get_all_doctors()
-        return jsonify({'success': True, 'doctors': doctors}), 200
+        return jsonify(list_response('doctors', 'doctors', {}, list_fields())), 200
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         log_error("Get doctors error", e)
         return jsonify({'error': str(e)}), 500
@@ -407,28 +480,10 @@ def delete_doctor(doctor_id):
 def get_appointments():
     """Get all appointments with optional filters"""
     try:
-        date = request.args.get('date')
-        status = request.args.get('status')
-        patient_name = request.args.get('patient_name')
-        
-        if patient_name and date and status:
-            appointments = db.get_appointments_by_patient_name_date_and_status(patient_name, date, status)
-        elif patient_name and date:
-            appointments = db.get_appointments_by_patient_name_and_date(patient_name, date)
-        elif patient_name and status:
-            appointments = db.get_appointments_by_patient_name_and_status(patient_name, status)
-        elif patient_name:
-            appointments = db.get_appointments_by_patient_name(patient_name)
-        elif date and status:
-            appointments = db.get_appointments_by_date_and_status(date, status)
-        elif date:
-            appointments = db.get_appointments_by_date(date)
-        elif status:
-            appointments = db.get_appointments_by_status(status)
-        else:
-            appointments = db.get_all_appointments()
-        
-        return jsonify({'success': True, 'appointments': appointments}), 200
+        filters = list_filters('patient_name', 'date', 'date_from', 'date_to', 'status', 'doctor_id', 'order')
+        return jsonify(list_response('appointments', 'appointments', filters, list_fields())), 200
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         log_error("Get appointments error", e)
         return jsonify({'error': str(e)}), 500
@@ -488,26 +543,27 @@ def update_appointment(appointment_id):
 def get_prescriptions():
     """Get all prescriptions with optional filters"""
     try:
-        date = request.args.get('date')
-        patient_id = request.args.get('patient_id')
-        patient_name = request.args.get('patient_name')
-        
-        if patient_id:
-            prescriptions = db.get_prescriptions_by_patient(patient_id)
-        elif patient_name:
-            prescriptions = db.get_prescriptions_by_patient_name(patient_name)
-        elif date:
-            prescriptions = db.get_prescriptions_by_date(date)
-        else:
-            prescriptions = db.get_all_prescriptions()
+        filters = list_filters('patient_id', 'patient_name', 'date', 'date_from', 'date_to', 'doctor_id', 'order')
+        # 'items' is not a column; it asks for each prescription's medicines
+        fields = list_fields()
+        with_items = fields is None or 'items' in fields
+        if fields:
+            fields = [name for name in fields if name != 'items']
+            # The items lookup is keyed on prescription_id
+            if with_items and 'prescription_id' not in fields:
+                fields.append('prescription_id')
+        body = list_response('prescriptions', 'prescriptions', filters, fields)
         
         # Add prescription items to each prescription
-        for prescription in prescriptions:
-            prescription_id = prescription.get('prescription_id')
-            if prescription_id:
-                prescription['items'] = db.get_prescription_items(prescription_id)
-        
-        return jsonify({'success': True, 'prescriptions': prescriptions}), 200
+        if with_items:
+            for prescription in body['prescriptions']:
+                prescription_id = prescription.get('prescription_id')
+                if prescription_id:
+                    prescription['items'] = db.get_prescription_items(prescription_id)
+        
+        return jsonify(body), 200
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         log_error("Get prescriptions error", e)
         return jsonify({'error': str(e)}), 500
@@ -574,28 +630,10 @@ def update_prescription(prescription_id):
 def get_bills():
     """Get all bills with optional filters"""
     try:
-        date = request.args.get('date')
-        status = request.args.get('status')
-        patient_name = request.args.get('patient_name')
-        
-        if patient_name and date and status:
-            bills = db.get_bills_by_patient_name_date_and_status(patient_name, date, status)
-        elif patient_name and date:
-            bills = db.get_bills_by_patient_name_and_date(patient_name, date)
-        elif patient_name and status:
-            bills = db.get_bills_by_patient_name_and_status(patient_name, status)
-        elif patient_name:
-            bills = db.get_bills_by_patient_name(patient_name)
-        elif date and status:
-            bills = db.get_bills_by_date_and_status(date, status)
-        elif date:
-            bills = db.get_bills_by_date(date)
-        elif status:
-            bills = db.get_bills_by_status(status)
-        else:
-            bills = db.get_all_bills()
-        
-        return jsonify({'success': True, 'bills': bills}), 200
+        filters = list_filters('patient_id', 'patient_name', 'date', 'date_from', 'date_to', 'status', 'order')
+        return jsonify(list_response('bills', 'bills', filters, list_fields())), 200
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         log_error("Get bills error", e)
         return jsonify({'error': str(e)}), 500
@@ -666,23 +704,32 @@ def delete_bill(bill_id):
 
 @app.route('/api/medicines', methods=['GET'])
 def get_medicines():
-    """Get all medicines with optional search and pagination"""
+    """Get all medicines with optional search and pagination
+    
+    Numbered pages (?page=, default 1, with a total) unless ?paging=cursor or
+    ?cursor= is given; then pages are read by keyset, following next_cursor
+    """
     try:
         search = request.args.get('search', '')
+        limit = max(1, min(int(request.args.get('limit', 50)), 1000))
+        
+        if request.args.get('cursor') or request.args.get('paging') == 'cursor':
+            medicines, next_cursor = db.search_medicines_master_after(
+                search, limit, request.args.get('cursor'), list_fields())
+            return jsonify({'success': True, 'medicines': medicines, 'next_cursor': next_cursor}), 200
+        
         page = int(request.args.get('page', 1))
-        limit = int(request.args.get('limit', 50))
         offset = (page - 1) * limit
         
         if search:
-            medicines = db.search_medicines_master_paginated(search, limit, offset)
-            total_count = db.get_search_medicines_count(search)
+            medicines, total_count = db.search_medicines_master_page(search, limit, offset)
         else:
             medicines = db.get_all_medicines_master_paginated(limit, offset)
             total_count = db.get_total_medicines_count()
         
         return jsonify({
             'success': True,
-            'medicines': medicines,
+            'medicines': [dict(medicine) for medicine in medicines],
             'pagination': {
                 'page': page,
                 'limit': limit,
@@ -690,16 +737,22 @@ def get_medicines():
                 'pages': (total_count + limit - 1) // limit
             }
         }), 200
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         log_error("Get medicines error", e)
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/medicines/autocomplete', methods=['GET'])
 def get_medicine_autocomplete():
-    """Get medicine names for autocomplete"""
+    """Get medicine names for autocomplete (?q=partial name&limit=20, limit capped at 100)"""
     try:
-        medicines = db.get_all_medicines()
+        query = request.args.get('q', '')
+        limit = max(1, min(int(request.args.get('limit', 20)), 100))
+        medicines = db.autocomplete_medicines(query, limit)
         return jsonify({'success': True, 'medicines': medicines}), 200
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         log_error("Get medicine autocomplete error", e)
         return jsonify({'error': str(e)}), 500
@@ -735,6 +788,8 @@ def get_statistics():
             stats = db.get_statistics()
         
         return jsonify({'success': True, 'statistics': stats}), 200
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         log_error("Get statistics error", e)
         return jsonify({'error': str(e)}), 500
@@ -750,47 +805,29 @@ def get_financial_report():
         from_date = request.args.get('from_date')
         to_date = request.args.get('to_date')
         
-        bills = db.get_all_bills()
-        
-        # Filter by date if provided
+        # Totals come from the daily_stats rollup; only the listed pending bills are read
         if from_date and to_date:
-            bills = [b for b in bills 
-                    if from_date <= b.get('bill_date', '') <= to_date]
-        
-        paid_bills = [b for b in bills if b.get('payment_status') == 'Paid']
-        pending_bills = [b for b in bills if b.get('payment_status') == 'Pending']
-        
-        total_revenue = sum(float(b.get('total_amount', 0)) for b in paid_bills)
-        total_pending = sum(float(b.get('total_amount', 0)) for b in pending_bills)
-        total_amount = sum(float(b.get('total_amount', 0)) for b in bills)
-        
-        # Daily revenue breakdown
-        daily_revenue = {}
-        for bill in paid_bills:
-            date = bill.get('bill_date', 'Unknown')
-            amount = float(bill.get('total_amount', 0))
-            daily_revenue[date] = daily_revenue.get(date, 0) + amount
-        
-        # Payment method breakdown
-        payment_methods = {}
-        for bill in bills:
-            method = bill.get('payment_method', 'Unknown')
-            payment_methods[method] = payment_methods.get(method, 0) + 1
+            summary = db.get_financial_summary(from_date, to_date)
+            pending_list = db.find_bills(status='Pending', date_from=from_date, date_to=to_date, limit=50)
+        else:
+            summary = db.get_financial_summary()
+            pending_list = db.find_bills(status='Pending', limit=50)
         
+        total_amount = summary['total_amount']
         return jsonify({
             'success': True,
             'report': {
-                'total_revenue': total_revenue,
-                'total_pending': total_pending,
+                'total_revenue': summary['total_revenue'],
+                'total_pending': summary['total_pending'],
                 'total_amount': total_amount,
-                'total_bills': len(bills),
-                'paid_bills': len(paid_bills),
-                'pending_bills': len(pending_bills),
-                'collection_rate': (total_revenue / max(1, total_amount) * 100),
-                'average_bill': (total_amount / max(1, len(bills))),
-                'daily_revenue': daily_revenue,
-                'payment_methods': payment_methods,
-                'pending_bills_list': pending_bills[:50]  # Limit to 50
+                'total_bills': summary['total_bills'],
+                'paid_bills': summary['paid_bills'],
+                'pending_bills': summary['pending_bills'],
+                'collection_rate': (summary['total_revenue'] / max(1, total_amount) * 100),
+                'average_bill': (total_amount / max(1, summary['total_bills'])),
+                'daily_revenue': summary['daily_revenue'],
+                'payment_methods': summary['payment_methods'],
+                'pending_bills_list': pending_list
             }
         }), 200
     except Exception as e:
@@ -804,75 +841,23 @@ def get_patient_report():
         from_date = request.args.get('from_date')
         to_date = request.args.get('to_date')
         
-        patients = db.get_all_patients()
-        appointments = db.get_all_appointments()
-        prescriptions = db.get_all_prescriptions()
-        
-        # Filter by date if provided
+        # Counts and the top patients are aggregated in SQL
         if from_date and to_date:
-            appointments = [a for a in appointments 
-                          if from_date <= a.get('appointment_date', '') <= to_date]
-            prescriptions = [p for p in prescriptions 
-                           if from_date <= p.get('prescription_date', '2000-01-01') <= to_date]
-        
-        # Calculate demographics
-        gender_dist = {}
-        age_groups = {'0-18': 0, '19-35': 0, '36-50': 0, '51-65': 0, '65+': 0}
-        blood_group_dist = {}
-        patient_visits = {}
-        
-        for appointment in appointments:
-            patient_id = appointment.get('patient_id')
-            if patient_id:
-                patient_visits[patient_id] = patient_visits.get(patient_id, 0) + 1
-        
-        for patient in patients:
-            gender = patient.get('gender', 'Unknown')
-            gender_dist[gender] = gender_dist.get(gender, 0) + 1
-            
-            blood_group = patient.get('blood_group', 'Unknown')
-            if blood_group:
-                blood_group_dist[blood_group] = blood_group_dist.get(blood_group, 0) + 1
-            
-            try:
-                from datetime import datetime
-                dob = datetime.strptime(patient.get('date_of_birth', '2000-01-01'), '%Y-%m-%d')
-                age = (datetime.now() - dob).days // 365
-                if age <= 18:
-                    age_groups['0-18'] += 1
-                elif age <= 35:
-                    age_groups['19-35'] += 1
-                elif age <= 50:
-                    age_groups['36-50'] += 1
-                elif age <= 65:
-                    age_groups['51-65'] += 1
-                else:
-                    age_groups['65+'] += 1
-            except:
-                pass
-        
-        # Top patients
-        top_patients = sorted(patient_visits.items(), key=lambda x: x[1], reverse=True)[:10]
-        top_patients_list = []
-        for patient_id, visits in top_patients:
-            patient = next((p for p in patients if p.get('patient_id') == patient_id), None)
-            top_patients_list.append({
-                'patient_id': patient_id,
-                'name': f"{patient.get('first_name', '')} {patient.get('last_name', '')}" if patient else patient_id,
-                'visits': visits
-            })
+            summary = db.get_patient_demographics(from_date, to_date)
+        else:
+            summary = db.get_patient_demographics()
         
         return jsonify({
             'success': True,
             'report': {
-                'total_patients': len(patients),
-                'total_appointments': len(appointments),
-                'total_prescriptions': len(prescriptions),
-                'avg_appointments_per_patient': (len(appointments) / max(1, len(patients))),
-                'gender_distribution': gender_dist,
-                'age_groups': age_groups,
-                'blood_group_distribution': blood_group_dist,
-                'top_patients': top_patients_list
+                'total_patients': summary['total_patients'],
+                'total_appointments': summary['total_appointments'],
+                'total_prescriptions': summary['total_prescriptions'],
+                'avg_appointments_per_patient': (summary['total_appointments'] / max(1, summary['total_patients'])),
+                'gender_distribution': summary['gender_distribution'],
+                'age_groups': summary['age_groups'],
+                'blood_group_distribution': summary['blood_group_distribution'],
+                'top_patients': summary['top_patients']
             }
         }), 200
     except Exception as e:
@@ -886,44 +871,20 @@ def get_doctor_report():
         from_date = request.args.get('from_date')
         to_date = request.args.get('to_date')
         
-        doctors = db.get_all_doctors()
-        appointments = db.get_all_appointments()
-        
-        # Filter by date if provided
+        # Per-doctor counts are aggregated in SQL
         if from_date and to_date:
-            appointments = [a for a in appointments 
-                          if from_date <= a.get('appointment_date', '') <= to_date]
-        
-        # Doctor statistics
-        doctor_stats = {}
-        specialization_dist = {}
-        
-        for doctor in doctors:
-            doctor_id = doctor.get('doctor_id')
-            specialization = doctor.get('specialization', 'Unknown')
-            specialization_dist[specialization] = specialization_dist.get(specialization, 0) + 1
-            
-            doctor_appointments = [a for a in appointments if a.get('doctor_id') == doctor_id]
-            completed = sum(1 for a in doctor_appointments if a.get('status') == 'Completed')
-            
-            doctor_stats[doctor_id] = {
-                'name': f"{doctor.get('first_name', '')} {doctor.get('last_name', '')}",
-                'specialization': specialization,
-                'total': len(doctor_appointments),
-                'completed': completed,
-                'scheduled': sum(1 for a in doctor_appointments if a.get('status') == 'Scheduled'),
-                'cancelled': sum(1 for a in doctor_appointments if a.get('status') == 'Cancelled'),
-                'completion_rate': (completed / max(1, len(doctor_appointments)) * 100)
-            }
+            summary = db.get_doctor_performance(from_date, to_date)
+        else:
+            summary = db.get_doctor_performance()
         
         return jsonify({
             'success': True,
             'report': {
-                'total_doctors': len(doctors),
-                'total_appointments': len(appointments),
-                'avg_appointments_per_doctor': (len(appointments) / max(1, len(doctors))),
-                'specialization_distribution': specialization_dist,
-                'doctor_performance': list(doctor_stats.values())
+                'total_doctors': summary['total_doctors'],
+                'total_appointments': summary['total_appointments'],
+                'avg_appointments_per_doctor': (summary['total_appointments'] / max(1, summary['total_doctors'])),
+                'specialization_distribution': summary['specialization_distribution'],
+                'doctor_performance': summary['doctor_performance']
             }
         }), 200
     except Exception as e:
@@ -937,36 +898,19 @@ def get_appointment_report():
         from_date = request.args.get('from_date')
         to_date = request.args.get('to_date')
         
-        appointments = db.get_all_appointments()
-        
-        # Filter by date if provided
+        # Counts come from the daily_stats rollup, not the appointment rows
         if from_date and to_date:
-            appointments = [a for a in appointments 
-                          if from_date <= a.get('appointment_date', '') <= to_date]
-        
-        # Status breakdown
-        status_dist = {}
-        daily_appointments = {}
-        
-        for appointment in appointments:
-            status = appointment.get('status', 'Unknown')
-            status_dist[status] = status_dist.get(status, 0) + 1
-            
-            date = appointment.get('appointment_date', 'Unknown')
-            daily_appointments[date] = daily_appointments.get(date, 0) + 1
-        
-        # Top busiest days
-        sorted_daily = sorted(daily_appointments.items(), key=lambda x: x[1], reverse=True)[:10]
-        
-        unique_days = len(set(a.get('appointment_date') for a in appointments))
+            summary = db.get_appointment_summary(from_date, to_date)
+        else:
+            summary = db.get_appointment_summary()
         
         return jsonify({
             'success': True,
             'report': {
-                'total_appointments': len(appointments),
-                'avg_appointments_per_day': (len(appointments) / max(1, unique_days)),
-                'status_distribution': status_dist,
-                'busiest_days': [{'date': date, 'count': count} for date, count in sorted_daily]
+                'total_appointments': summary['total'],
+                'avg_appointments_per_day': (summary['total'] / max(1, summary['days'])),
+                'status_distribution': summary['status_distribution'],
+                'busiest_days': [{'date': date, 'count': count} for date, count in summary['busiest_days']]
             }
         }), 200
     except Exception as e:
@@ -0,0 +1,112 @@
+"""
+Bulk inserts for Hospital Management System
+Column lists and per-row parameter building for Database.bulk_add(), which
+loads many patients, doctors, appointments, admissions or bills with one
+executemany() per chunk instead of one INSERT and commit per row
+"""
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Tuple
+
+# Marks a column the caller must supply (the add_* methods index these directly)
+REQUIRED = object()
+
+
+def _admission_values(data: Dict) -> Dict:
+    """Fill expected_days / expected_discharge_date the way add_admission() does"""
+    data = dict(data)
+    expected_days = int(data.get('expected_days') or 0)
+    data['expected_days'] = expected_days
+    if data.get('admission_date') and expected_days > 0 and not data.get('expected_discharge_date'):
+        try:
+            data['expected_discharge_date'] = (datetime.strptime(data['admission_date'], '%Y-%m-%d')
+                                               + timedelta(days=expected_days)).strftime('%Y-%m-%d')
+        except ValueError:
+            data['expected_discharge_date'] = ''
+    return data
+
+
+# Per-entity table, ID column and (column, default) pairs, matching the
+# defaults of the corresponding add_* method. 'prepare' derives columns
+# from the row before its values are read.
+BULK_INSERTS: Dict[str, Dict[str, Any]] = {
+    'patients': {
+        'table': 'patients',
+        'id': 'patient_id',
+        'columns': (
+            ('patient_id', REQUIRED), ('first_name', REQUIRED), ('last_name', REQUIRED),
+            ('date_of_birth', REQUIRED), ('gender', REQUIRED), ('phone', ''), ('email', ''),
+            ('address', ''), ('emergency_contact', ''), ('emergency_phone', ''),
+            ('blood_group', ''), ('allergies', ''),
+        ),
+    },
+    'doctors': {
+        'table': 'doctors',
+        'id': 'doctor_id',
+        'columns': (
+            ('doctor_id', REQUIRED), ('first_name', REQUIRED), ('last_name', REQUIRED),
+            ('specialization', REQUIRED), ('qualification', ''), ('phone', ''), ('email', ''),
+            ('address', ''), ('consultation_fee', 0), ('available_days', ''), ('available_time', ''),
+        ),
+    },
+    'appointments': {
+        'table': 'appointments',
+        'id': 'appointment_id',
+        'columns': (
+            ('appointment_id', REQUIRED), ('patient_id', REQUIRED), ('doctor_id', REQUIRED),
+            ('appointment_date', REQUIRED), ('appointment_time', REQUIRED),
+            ('status', 'Scheduled'), ('notes', ''),
+        ),
+    },
+    'admissions': {
+        'table': 'admissions',
+        'id': 'admission_id',
+        'prepare': _admission_values,
+        'columns': (
+            ('admission_id', REQUIRED), ('patient_id', REQUIRED), ('doctor_id', None),
+            ('admission_date', None), ('expected_days', 0), ('expected_discharge_date', ''),
+            ('status', 'Admitted'), ('ward', ''), ('bed', ''), ('reason', ''),
+        ),
+    },
+    'bills': {
+        'table': 'billing',
+        'id': 'bill_id',
+        'columns': (
+            ('bill_id', REQUIRED), ('patient_id', REQUIRED), ('appointment_id', None),
+            ('bill_date', REQUIRED), ('consultation_fee', 0), ('medicine_cost', 0),
+            ('other_charges', 0), ('total_amount', REQUIRED), ('payment_status', 'Pending'),
+            ('payment_method', ''), ('notes', ''),
+        ),
+    },
+}
+
+
+def bulk_insert_sql(entity: str) -> str:
+    """INSERT statement for one row of entity; ValueError for an entity without bulk support"""
+    spec = BULK_INSERTS.get(entity)
+    if spec is None:
+        raise ValueError(f"Bulk insert is not supported for {entity}")
+    names = [name for name, _ in spec['columns']]
+    return f"INSERT INTO {spec['table']} ({', '.join(names)}) VALUES ({', '.join('?' * len(names))})"
+
+
+def bulk_row_values(entity: str, data: Dict) -> Tuple:
+    """Parameters for bulk_insert_sql(entity) from one row dict
+
+    Raises ValueError naming the first required column that is missing or
+    empty, or if data is not a dict.
+    """
+    spec = BULK_INSERTS[entity]
+    if not isinstance(data, dict):
+        raise ValueError("Row must be an object")
+    prepare: Callable[[Dict], Dict] = spec.get('prepare')
+    if prepare is not None:
+        data = prepare(data)
+    values: List = []
+    for name, default in spec['columns']:
+        if default is REQUIRED:
+            if data.get(name) in (None, ''):
+                raise ValueError(f"{name} is required")
+            values.append(data[name])
+        else:
+            values.append(data.get(name, default))
+    return tuple(values)
@@ -0,0 +1,182 @@
+"""
+Connection pool for Hospital Management System
+Gives every thread its own SQLite connection and cursor so Flask request
+threads and the desktop UI never share (and interleave) a single cursor
+"""
+import os
+import sqlite3
+import threading
+import weakref
+from typing import Callable, Dict, List, Optional
+
+from utils.logger import log_debug, log_info, log_warning
+
+
+# PRAGMA settings applied to every new connection, keyed by profile name.
+# journal_mode is stored in the database file; the rest are per-connection.
+STORAGE_PROFILES: Dict[str, Dict[str, object]] = {
+    # Pre-WAL behaviour: rollback journal, fsync on every commit
+    'legacy': {
+        'journal_mode': 'DELETE',
+        'synchronous': 'FULL',
+        'cache_size': -2000,
+        'mmap_size': 0,
+        'temp_store': 'DEFAULT',
+        'busy_timeout': 5000,
+    },
+    # WAL so readers never block on a writer, still fsync on every commit
+    'safe': {
+        'journal_mode': 'WAL',
+        'synchronous': 'FULL',
+        'cache_size': -16000,
+        'mmap_size': 0,
+        'temp_store': 'MEMORY',
+        'busy_timeout': 5000,
+    },
+    # WAL + NORMAL sync: durable across application crashes, fsync only at checkpoints
+    'balanced': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': -32000,
+        'mmap_size': 64 * 1024 * 1024,
+        'temp_store': 'MEMORY',
+        'busy_timeout': 5000,
+    },
+    # Large cache and memory map for big databases on machines with RAM to spare
+    'performance': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': -128000,
+        'mmap_size': 512 * 1024 * 1024,
+        'temp_store': 'MEMORY',
+        'busy_timeout': 10000,
+    },
+}
+
+DEFAULT_STORAGE_PROFILE = 'balanced'
+
+
+def resolve_storage_profile(name: Optional[str] = None) -> str:
+    """Pick the storage profile: explicit name, then HMS_DB_PROFILE, then the default"""
+    name = (name or os.environ.get('HMS_DB_PROFILE') or DEFAULT_STORAGE_PROFILE).lower()
+    if name not in STORAGE_PROFILES:
+        log_warning(f"Unknown storage profile '{name}', using '{DEFAULT_STORAGE_PROFILE}'")
+        name = DEFAULT_STORAGE_PROFILE
+    return name
+
+
+def apply_storage_profile(conn: sqlite3.Connection, name: str) -> None:
+    """Apply a storage profile's PRAGMAs to a connection"""
+    settings = STORAGE_PROFILES[name]
+    # Wait for locks before anything else so journal_mode does not fail under contention
+    conn.execute(f"PRAGMA busy_timeout = {int(settings['busy_timeout'])}")
+    mode = conn.execute(f"PRAGMA journal_mode = {settings['journal_mode']}").fetchone()[0]
+    if str(mode).upper() != str(settings['journal_mode']).upper():
+        # e.g. in-memory databases cannot use WAL
+        log_debug(f"journal_mode {settings['journal_mode']} not available, using {mode}")
+    conn.execute(f"PRAGMA synchronous = {settings['synchronous']}")
+    conn.execute(f"PRAGMA cache_size = {int(settings['cache_size'])}")
+    conn.execute(f"PRAGMA mmap_size = {int(settings['mmap_size'])}")
+    conn.execute(f"PRAGMA temp_store = {settings['temp_store']}")
+
+
+class PooledConnection(sqlite3.Connection):
+    """sqlite3.Connection subclass (plain connections cannot be weak-referenced)"""
+
+
+class ConnectionPool:
+    """Thread-affine pool of SQLite connections for one database file.
+
+    A thread gets a connection on first use and keeps it until it calls
+    release(), which parks the connection for reuse by the next thread.
+    Threads that never release (e.g. the Tkinter main loop) simply keep theirs.
+    """
+
+    def __init__(self, db_path: str, max_idle: int = 8,
+                 on_connect: Optional[Callable[[sqlite3.Connection], None]] = None,
+                 factory: type = PooledConnection):
+        self.db_path = db_path
+        self.max_idle = max_idle
+        self.on_connect = on_connect
+        # Connection class (a PooledConnection subclass, e.g. the query profiler's)
+        self.factory = factory
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._idle: List[sqlite3.Connection] = []
+        self._open = weakref.WeakSet()
+        # Bumped by close_all() so threads drop connections that were closed under them
+        self._generation = 0
+
+    def _new_connection(self) -> sqlite3.Connection:
+        """Open and configure a new connection"""
+        log_debug(f"Opening pooled connection to {self.db_path}")
+        # Connections move between threads when released back to the pool,
+        # but are only ever used by the thread that currently owns them
+        conn = sqlite3.connect(self.db_path, check_same_thread=False,
+                               factory=self.factory)
+        conn.row_factory = sqlite3.Row
+        if self.on_connect:
+            self.on_connect(conn)
+        with self._lock:
+            self._open.add(conn)
+        return conn
+
+    def _acquire(self) -> sqlite3.Connection:
+        """Take an idle connection or open a new one"""
+        with self._lock:
+            conn = self._idle.pop() if self._idle else None
+        return conn if conn is not None else self._new_connection()
+
+    def connection(self) -> sqlite3.Connection:
+        """Get the calling thread's connection, acquiring one if needed"""
+        local = self._local
+        conn = getattr(local, 'conn', None)
+        if conn is None or local.generation != self._generation:
+            conn = self._acquire()
+            local.conn = conn
+            local.cursor = conn.cursor()
+            local.generation = self._generation
+        return conn
+
+    def cursor(self) -> sqlite3.Cursor:
+        """Get the calling thread's cursor"""
+        self.connection()
+        return self._local.cursor
+
+    def release(self) -> None:
+        """Return the calling thread's connection to the pool"""
+        local = self._local
+        conn = getattr(local, 'conn', None)
+        if conn is None:
+            return
+        local.conn = None
+        local.cursor = None
+        if local.generation != self._generation:
+            return
+        try:
+            if conn.in_transaction:
+                # Never hand a half-finished transaction to another thread
+                conn.rollback()
+        except sqlite3.Error:
+            conn.close()
+            return
+        with self._lock:
+            if len(self._idle) < self.max_idle:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    def close_all(self) -> None:
+        """Close every connection opened by this pool"""
+        with self._lock:
+            self._generation += 1
+            connections = list(self._open)
+            self._idle.clear()
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+        self._local.conn = None
+        self._local.cursor = None
+        log_info(f"Closed {len(connections)} pooled connection(s)")
@@ -2,16 +2,44 @@
 Database module for Hospital Management System
 Handles all database operations using SQLite
 """
+import csv
+import re
 import sqlite3
 import os
 import sys
+import threading
+from concurrent.futures import Future
+from contextlib import contextmanager
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from typing import Iterator, List, Dict, Optional, Tuple
 
 # Utils imports
 from utils.logger import log_info, log_error, log_debug, log_database_operation, log_warning
 from utils.helpers import generate_id
 
+# Backend imports
+from backend.connection_pool import (
+    ConnectionPool, PooledConnection, apply_storage_profile, resolve_storage_profile
+)
+from backend.migrations import (
+    DAILY_STATS_KEY, DAILY_STATS_SOURCES, PRESCRIPTION_ITEM_POSITION_STEP, SCHEMA_VERSION, apply_migrations,
+    daily_stats_source_query, get_schema_version, rebuild_daily_stats
+)
+from backend.query_builder import (
+    ENTITY_QUERIES, build_filtered_query, decode_cursor, encode_cursor, keyset_condition, keyset_params,
+    make_cursor
+)
+from backend.bulk_insert import BULK_INSERTS, bulk_insert_sql, bulk_row_values
+from backend.entity_cache import EntityCache, cached_read, invalidates
+from backend.query_profiler import ProfiledConnection, QueryProfiler
+from backend.records import RECORD_NAMES, RecordMixin, record_factory
+from backend.write_queue import WriteQueue, queued_write
+
+
+def _escape_like(text: str) -> str:
+    """Escape LIKE wildcards in user input (use with ESCAPE '\\')"""
+    return text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
 
 def get_app_data_dir():
     """Get the application data directory for logs and database"""
@@ -40,38 +68,428 @@ def get_app_data_dir():
         return os.path.dirname(os.path.abspath(__file__))
 
 
+# Bundled seed data (backend/data, or <bundle>/backend/data when frozen)
+MEDICINE_SEED_FILE = "medicines_seed.csv"
+
+
+def get_seed_data_path(filename: str) -> str:
+    """Get the path of a bundled seed data file"""
+    if getattr(sys, 'frozen', False) and hasattr(sys, '_MEIPASS'):
+        base_path = os.path.join(sys._MEIPASS, 'backend')
+    else:
+        base_path = os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(base_path, 'data', filename)
+
+
+class RollbackTransaction(Exception):
+    """Raise inside Database.transaction() to roll the block back; the exception is not propagated"""
+
+
 class Database:
     """Database manager for hospital management system"""
     
-    def __init__(self, db_name: str = "hospital.db"):
-        """Initialize database connection"""
+    # Rows read per fetchmany() call by the iter_* methods
+    FETCH_BATCH_SIZE = 500
+    
+    # Default number of cached lookups (see backend/entity_cache.py)
+    CACHE_SIZE = 1024
+    
+    def __init__(self, db_name: str = "hospital.db", storage_profile: Optional[str] = None,
+                 single_writer: Optional[bool] = None, cache_size: Optional[int] = None,
+                 slow_query_ms: Optional[float] = None):
+        """Initialize database connection
+        
+        Args:
+            db_name: Database file name (relative to the app data directory) or absolute path
+            storage_profile: PRAGMA profile from STORAGE_PROFILES ('legacy', 'safe',
+                'balanced', 'performance'); defaults to $HMS_DB_PROFILE or 'balanced'
+            single_writer: run write methods on one writer thread with group commit
+                (see backend/write_queue.py); defaults to $HMS_SINGLE_WRITER ('1' enables it)
+            cache_size: entries in the lookup cache (see backend/entity_cache.py); defaults
+                to $HMS_CACHE_SIZE or 1024, 0 disables it
+            slow_query_ms: turn on the query profiler (see backend/query_profiler.py) and
+                log statements slower than this; defaults to $HMS_SLOW_QUERY_MS (unset: off)
+        """
         # Get the appropriate directory for the database
         app_data_dir = get_app_data_dir()
         # Use full path for database file
         self.db_name = os.path.join(app_data_dir, db_name)
-        self.conn: Optional[sqlite3.Connection] = None
-        self.cursor: Optional[sqlite3.Cursor] = None
-        log_info(f"Database location: {self.db_name}")
+        self.storage_profile = resolve_storage_profile(storage_profile)
+        if slow_query_ms is None and os.environ.get('HMS_SLOW_QUERY_MS'):
+            slow_query_ms = float(os.environ['HMS_SLOW_QUERY_MS'])
+        self._profiler: Optional[QueryProfiler] = None
+        if slow_query_ms is not None:
+            # Statements are attributed to the outermost method of this file on the stack
+            self._profiler = QueryProfiler(slow_query_ms, Database.__init__.__code__.co_filename)
+            log_info(f"Query profiling on (slow query threshold {slow_query_ms} ms)")
+        # One connection (and cursor) per thread - see backend/connection_pool.py
+        self._pool = ConnectionPool(
+            self.db_name,
+            on_connect=self._configure_connection,
+            factory=ProfiledConnection if self._profiler is not None else PooledConnection
+        )
+        log_info(f"Database location: {self.db_name} (storage profile: {self.storage_profile})")
+        self._writer: Optional[WriteQueue] = None
+        # Per-thread transaction() nesting depth, failed-write flag and pending cache invalidations
+        self._local = threading.local()
+        if cache_size is None:
+            cache_size = int(os.environ.get('HMS_CACHE_SIZE') or self.CACHE_SIZE)
+        self._cache: Optional[EntityCache] = EntityCache(cache_size) if cache_size > 0 else None
+        # Last PRAGMA data_version seen per connection (see _check_external_commits)
+        self._data_versions: Dict[int, int] = {}
         self.init_database()
+        if single_writer is None:
+            single_writer = os.environ.get('HMS_SINGLE_WRITER', '').strip().lower() in ('1', 'true', 'yes', 'on')
+        if single_writer:
+            self.start_writer()
+    
+    def _configure_connection(self, conn: sqlite3.Connection) -> None:
+        """Set up a new pooled connection (storage profile PRAGMAs, profiler)"""
+        if self._profiler is not None:
+            conn.profiler = self._profiler
+        apply_storage_profile(conn, self.storage_profile)
+    
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """Connection owned by the calling thread"""
+        return self._pool.connection()
+    
+    @property
+    def cursor(self) -> sqlite3.Cursor:
+        """Cursor owned by the calling thread"""
+        return self._pool.cursor()
     
     def connect(self) -> None:
-        """Establish database connection"""
+        """Establish database connection for the calling thread"""
         log_info(f"Connecting to database: {self.db_name}")
-        # Allow SQLite connections to be used across threads (for Flask)
-        self.conn = sqlite3.connect(self.db_name, check_same_thread=False)
-        self.conn.row_factory = sqlite3.Row
-        self.cursor = self.conn.cursor()
+        self._pool.connection()
         log_info("Database connection established")
     
+    def release_connection(self) -> None:
+        """Return the calling thread's connection to the pool (e.g. at the end of a request)"""
+        self._pool.release()
+    
     def close(self) -> None:
-        """Close database connection"""
-        if self.conn:
-            self.conn.close()
+        """Close all database connections"""
+        self.stop_writer()
+        self._pool.close_all()
+    
+    def start_writer(self, max_batch: int = 256) -> None:
+        """Switch to single-writer mode: write methods queue to one thread that commits them in groups"""
+        if self._writer is None:
+            self._writer = WriteQueue(self, max_batch)
+            self._writer.start()
+    
+    def stop_writer(self) -> None:
+        """Finish queued writes and go back to committing on the calling thread"""
+        writer, self._writer = self._writer, None
+        if writer is not None:
+            writer.stop()
+    
+    def submit_write(self, method: str, *args, **kwargs) -> Future:
+        """Queue a write method without waiting for it; the Future holds its return value
+        
+        Without a writer thread the method runs immediately and the returned
+        Future is already done.
+        """
+        if self._writer is not None:
+            fn = getattr(type(self), method)
+            return self._writer.submit(getattr(fn, '__wrapped__', fn), self, *args, **kwargs)
+        future: Future = Future()
+        try:
+            future.set_result(getattr(self, method)(*args, **kwargs))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+    
+    @contextmanager
+    def transaction(self):
+        """Unit of work: run several write methods and commit them once, atomically
+        
+            with db.transaction():
+                db.add_admission(admission)
+                db.add_admission_note(first_note)
+        
+        Commits made by the write methods inside the block are deferred to
+        its end; an exception rolls the whole block back (raise
+        RollbackTransaction to roll back without the exception escaping).
+        Each write method runs in its own savepoint, so one that fails
+        (returns False) leaves nothing behind and the block can decide
+        whether to carry on. Nested transaction() blocks become savepoints
+        of the enclosing one.
+        
+        The block runs on the calling thread's connection, also in
+        single-writer mode.
+        """
+        conn = self.conn
+        depth = getattr(self._local, 'depth', 0)
+        if depth == 0:
+            if conn.in_transaction:
+                conn.commit()
+            conn.execute("BEGIN IMMEDIATE")
+        else:
+            conn.execute(f"SAVEPOINT transaction_{depth}")
+        self._local.depth = depth + 1
+        try:
+            yield self
+        except BaseException as e:
+            self._local.depth = depth
+            try:
+                if depth == 0:
+                    conn.rollback()
+                else:
+                    conn.execute(f"ROLLBACK TO transaction_{depth}")
+                    conn.execute(f"RELEASE transaction_{depth}")
+            finally:
+                if depth == 0:
+                    self._flush_invalidations()
+            if isinstance(e, RollbackTransaction):
+                return
+            raise
+        self._local.depth = depth
+        if depth == 0:
+            try:
+                conn.commit()
+            finally:
+                self._flush_invalidations()
+        else:
+            conn.execute(f"RELEASE transaction_{depth}")
+    
+    @contextmanager
+    def _deferred_commits(self):
+        """Treat the calling thread as inside a transaction that someone else commits (the writer's group)"""
+        depth = getattr(self._local, 'depth', 0)
+        self._local.depth = depth + 1
+        try:
+            yield
+        finally:
+            self._local.depth = depth
+    
+    def _in_transaction(self) -> bool:
+        """True inside transaction() (or a writer group) on the calling thread"""
+        return getattr(self._local, 'depth', 0) > 0
+    
+    def _savepoint_write(self, fn, *args, **kwargs):
+        """Run one write inside a savepoint of the open transaction
+        
+        The savepoint is rolled back if the write raises, returns False or
+        calls _rollback(), so a failed write never leaves partial rows.
+        """
+        conn = self.conn
+        outer_failed = getattr(self._local, 'failed', False)
+        self._local.failed = False
+        conn.execute("SAVEPOINT write_method")
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException:
+            conn.execute("ROLLBACK TO write_method")
+            conn.execute("RELEASE write_method")
+            raise
+        finally:
+            failed = self._local.failed
+            self._local.failed = outer_failed
+        if failed or result is False:
+            conn.execute("ROLLBACK TO write_method")
+        conn.execute("RELEASE write_method")
+        return result
+    
+    def _invalidate(self, *tables: str) -> None:
+        """Bump the cache versions of tables, once the current transaction (if any) has ended"""
+        if self._cache is None:
+            return
+        if self._in_transaction():
+            pending = getattr(self._local, 'invalidated', None)
+            if pending is None:
+                pending = self._local.invalidated = set()
+            pending.update(tables)
+        else:
+            self._cache.bump(tables)
+    
+    def _flush_invalidations(self) -> None:
+        """Apply the invalidations deferred by _invalidate() on the calling thread"""
+        pending = getattr(self._local, 'invalidated', None)
+        if pending:
+            self._local.invalidated = set()
+            self._cache.bump(pending)
+    
+    def _check_external_commits(self) -> None:
+        """Drop the whole cache if another connection committed since this one last looked
+        
+        Our own write methods bump the tables they change, but commits by
+        other connections (other threads, or the desktop app and the API
+        sharing one file) only show up in PRAGMA data_version.
+        """
+        conn = self.conn
+        version = conn.execute("PRAGMA data_version").fetchone()[0]
+        if self._data_versions.get(id(conn)) != version:
+            self._data_versions[id(conn)] = version
+            self._cache.clear()
+    
+    def cache_stats(self) -> Dict:
+        """Hit/miss statistics of the lookup cache ({'enabled': False} when it is off)"""
+        if self._cache is None:
+            return {'enabled': False}
+        return dict(self._cache.stats(), enabled=True)
+    
+    @property
+    def query_profiling(self) -> bool:
+        """True when statements are being timed (slow_query_ms / $HMS_SLOW_QUERY_MS set)"""
+        return self._profiler is not None
+    
+    def query_stats(self) -> Dict:
+        """Per-method statement latency histograms from the query profiler ({} when it is off)"""
+        if self._profiler is None:
+            return {}
+        return self._profiler.method_stats()
+    
+    def slow_queries(self) -> List[Dict]:
+        """Recent statements over the slow query threshold, with parameters and query plan"""
+        if self._profiler is None:
+            return []
+        return self._profiler.slow_queries()
+    
+    def reset_query_stats(self) -> None:
+        """Start the query profiler's histograms and slow query list afresh"""
+        if self._profiler is not None:
+            self._profiler.reset()
+    
+    def _commit(self) -> None:
+        """Commit a write method's changes (deferred inside transaction() and writer groups)"""
+        if self._in_transaction():
+            return
+        self.conn.commit()
+    
+    def _rollback(self) -> None:
+        """Undo a write method's changes (just its savepoint inside transaction() and writer groups)"""
+        if self._in_transaction():
+            self._local.failed = True
+            return
+        self.conn.rollback()
+    
+    def _has_table(self, name: str) -> bool:
+        """Check (once per schema load) whether an optional table such as an FTS index exists"""
+        if name not in self._optional_tables:
+            self.cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE type IN ('table', 'view') AND name = ?", (name,)
+            )
+            self._optional_tables[name] = self.cursor.fetchone() is not None
+        return self._optional_tables[name]
+    
+    def _table_columns(self, table: str) -> List[str]:
+        """Column names of a table (read once per schema load)"""
+        if table not in self._table_columns_cache:
+            self.cursor.execute(f"PRAGMA table_info({table})")
+            self._table_columns_cache[table] = [row[1] for row in self.cursor.fetchall()]
+        return self._table_columns_cache[table]
+    
+    def _filtered_query(self, entity: str, filters: Dict) -> Tuple[str, List]:
+        """SQL and parameters of the filtered list query for entity (see backend/query_builder.py)"""
+        if filters.get('fields'):
+            filters = dict(filters, table_columns=self._table_columns(ENTITY_QUERIES[entity]['table']))
+        return build_filtered_query(entity, use_fts=self._has_table('patients_fts'), **filters)
+    
+    def _find_records(self, entity: str, filters: Dict) -> List[Dict]:
+        """Run the filtered list query for entity"""
+        sql, params = self._filtered_query(entity, filters)
+        self.cursor.execute(sql, params)
+        return [dict(row) for row in self.cursor.fetchall()]
+    
+    def _fetch_records(self, sql: str, params=(), record: str = 'Record') -> List[RecordMixin]:
+        """All rows of a query as compact record tuples (see backend/records.py)"""
+        cursor = self.conn.cursor()
+        cursor.row_factory = record_factory(record)
+        try:
+            cursor.execute(sql, params)
+            return cursor.fetchall()
+        finally:
+            cursor.close()
+    
+    def _list_records(self, entity: str, filters: Dict) -> List[RecordMixin]:
+        """Run the filtered list query for entity, returning records instead of dicts"""
+        sql, params = self._filtered_query(entity, filters)
+        return self._fetch_records(sql, params, RECORD_NAMES[entity])
+    
+    def _iter_rows(self, sql: str, params=(), batch_size: Optional[int] = None,
+                   record: str = 'Record') -> Iterator[RecordMixin]:
+        """Stream a query's rows as records, fetching batch_size rows at a time
+        
+        Runs on a cursor of its own, so queries made while the caller is
+        still iterating do not reset it. The cursor is closed when the
+        iteration finishes or the generator is discarded.
+        """
+        cursor = self.conn.cursor()
+        cursor.row_factory = record_factory(record)
+        try:
+            cursor.execute(sql, params)
+            while True:
+                batch = cursor.fetchmany(batch_size or self.FETCH_BATCH_SIZE)
+                if not batch:
+                    break
+                yield from batch
+        finally:
+            cursor.close()
+    
+    def iter_records(self, entity: str, batch_size: Optional[int] = None, **filters) -> Iterator[RecordMixin]:
+        """Stream the rows of entity matching filters (see build_filtered_query)
+        
+        Same rows and order as find_records(), but only one batch is held
+        in memory at a time. Bad filters raise ValueError here, before the
+        first row is read.
+        """
+        sql, params = self._filtered_query(entity, filters)
+        return self._iter_rows(sql, params, batch_size, RECORD_NAMES[entity])
+    
+    def find_records(self, entity: str, **filters) -> List[Dict]:
+        """Get the rows of entity matching any mix of filters (see build_filtered_query)"""
+        return self._find_records(entity, filters)
+    
+    def find_page(self, entity: str, filters: Optional[Dict] = None, fields: Optional[List[str]] = None,
+                  limit: int = 50, cursor: Optional[str] = None) -> Tuple[List[Dict], Optional[str]]:
+        """One page of a filtered list and the cursor for the next page (None on the last page)
+        
+        Pages are read by keyset (WHERE sort key after the previous page's
+        last row) rather than OFFSET, so every page costs the same however
+        deep into the list it is. Raises ValueError for bad filters, fields
+        or cursors.
+        """
+        filters = dict(filters or {}, fields=fields, cursor=cursor, with_cursor=True, limit=limit + 1)
+        rows = self._find_records(entity, filters)
+        next_cursor = encode_cursor(rows[limit - 1]['_cursor']) if len(rows) > limit else None
+        rows = rows[:limit]
+        for row in rows:
+            del row['_cursor']
+        return rows, next_cursor
     
     def init_database(self) -> None:
-        """Initialize database with all required tables"""
+        """Initialize database with all required tables
+        
+        An up-to-date database costs a single PRAGMA user_version read; the
+        full table/column pass only runs for new or pre-versioning databases.
+        """
         self.connect()
+        self._optional_tables: Dict[str, bool] = {}
+        self._table_columns_cache: Dict[str, List[str]] = {}
+        
+        version = get_schema_version(self.conn)
+        if version >= SCHEMA_VERSION:
+            log_info(f"Database schema up to date (version {version})")
+            return
+        
+        if version == 0:
+            # New database, or one created before schema versioning
+            self._create_base_schema()
         
+        # Versioned migrations (PRAGMA user_version) - see backend/migrations.py
+        try:
+            version = apply_migrations(self.conn)
+            log_info(f"Database schema at version {version}")
+        except Exception as e:
+            log_error("Error applying schema migrations", e)
+        
+        log_info("Database initialized successfully")
+    
+    def _create_base_schema(self) -> None:
+        """Create the pre-versioning schema, apply the legacy column fixes and seed data"""
         # Patients table
         self.cursor.execute("""
             CREATE TABLE IF NOT EXISTS patients (
@@ -441,7 +859,6 @@ class Database:
             log_error("Error creating xray_reports table", e)
         
         self.conn.commit()
-        log_info("Database initialized successfully")
         
         # Create default user if no users exist
         self.create_default_user()
@@ -449,7 +866,99 @@ class Database:
         # Populate medicines if table is empty
         self.populate_medicines()
     
+    # Bulk operations
+    # Rows inserted per executemany() call and transaction by bulk_add()
+    BULK_CHUNK_SIZE = 1000
+    
+    def bulk_add(self, entity: str, rows: List[Dict], chunk_size: Optional[int] = None) -> Dict:
+        """Insert many rows of one entity (see backend/bulk_insert.BULK_INSERTS)
+        
+        Rows go in with one executemany() and one commit per chunk. A row
+        that is invalid or violates a constraint does not stop the load: if
+        a chunk fails, its rows are retried one at a time (each in its own
+        savepoint) to find the bad ones, and the rest of the chunk is kept.
+        
+        Returns {'inserted': n, 'errors': [{'index', 'id', 'error'}, ...]},
+        index being the row's position in rows. Raises ValueError for an
+        entity without bulk support.
+        
+        Like transaction(), a bulk load runs on the calling thread's
+        connection and is not queued to the writer thread in single-writer
+        mode; each chunk takes the write lock in turn with the writer.
+        """
+        sql = bulk_insert_sql(entity)
+        id_column = BULK_INSERTS[entity]['id']
+        chunk_size = chunk_size or self.BULK_CHUNK_SIZE
+        inserted = 0
+        errors: List[Dict] = []
+        
+        def row_error(index: int, error: Exception) -> None:
+            row = rows[index]
+            errors.append({
+                'index': index,
+                'id': row.get(id_column) if isinstance(row, dict) else None,
+                'error': str(error),
+            })
+        
+        log_info(f"Bulk adding {len(rows)} {entity}")
+        try:
+            for start in range(0, len(rows), chunk_size):
+                chunk = []
+                for index in range(start, min(start + chunk_size, len(rows))):
+                    try:
+                        chunk.append((index, bulk_row_values(entity, rows[index])))
+                    except (ValueError, TypeError) as e:
+                        row_error(index, e)
+                if not chunk:
+                    continue
+                try:
+                    # No savepoint around the fast path: inside one, every row of
+                    # a table with triggers (daily_stats) gets a statement journal
+                    with self.transaction():
+                        self.cursor.executemany(sql, [values for _, values in chunk])
+                    inserted += len(chunk)
+                    continue
+                except sqlite3.Error:
+                    pass
+                # The chunk was rolled back; insert its rows one at a time to find the bad ones
+                with self.transaction():
+                    for index, values in chunk:
+                        try:
+                            with self.transaction():
+                                self.cursor.execute(sql, values)
+                            inserted += 1
+                        except sqlite3.Error as e:
+                            row_error(index, e)
+        finally:
+            # Chunks committed before a failure are visible too
+            self._invalidate(BULK_INSERTS[entity]['table'])
+        errors.sort(key=lambda error: error['index'])
+        log_info(f"Bulk added {inserted} {entity} ({len(errors)} rejected)")
+        return {'inserted': inserted, 'errors': errors}
+    
+    def bulk_add_patients(self, rows: List[Dict], chunk_size: Optional[int] = None) -> Dict:
+        """Insert many patients; see bulk_add()"""
+        return self.bulk_add('patients', rows, chunk_size)
+    
+    def bulk_add_doctors(self, rows: List[Dict], chunk_size: Optional[int] = None) -> Dict:
+        """Insert many doctors; see bulk_add()"""
+        return self.bulk_add('doctors', rows, chunk_size)
+    
+    def bulk_add_appointments(self, rows: List[Dict], chunk_size: Optional[int] = None) -> Dict:
+        """Insert many appointments; see bulk_add()"""
+        return self.bulk_add('appointments', rows, chunk_size)
+    
+    def bulk_add_admissions(self, rows: List[Dict], chunk_size: Optional[int] = None) -> Dict:
+        """Insert many admissions; see bulk_add()"""
+        return self.bulk_add('admissions', rows, chunk_size)
+    
+    def bulk_add_bills(self, rows: List[Dict], chunk_size: Optional[int] = None) -> Dict:
+        """Insert many bills; see bulk_add()"""
+        return self.bulk_add('bills', rows, chunk_size)
+    
     # Patient operations
+    @queued_write
+    @invalidates('patients')
     def add_patient(self, patient_data: Dict) -> bool:
         """Add a new patient"""
         log_debug(f"Adding patient: {patient_data.get('patient_id')}")
@@ -473,7 +982,7 @@ class Database:
                 patient_data.get('blood_group', ''),
                 patient_data.get('allergies', '')
             ))
-            self.conn.commit()
+            self._commit()
             log_info(f"Patient added successfully: {patient_data['patient_id']}")
             return True
         except sqlite3.IntegrityError as e:
@@ -483,30 +992,54 @@ class Database:
             log_error(f"Failed to add patient: {patient_data.get('patient_id')}", e)
             return False
     
-    def get_all_patients(self) -> List[Dict]:
-        """Get all patients"""
+    def get_all_patients(self) -> List[RecordMixin]:
+        """Get all patients (newest first) as read-only PatientRecords"""
         log_debug("Fetching all patients from database")
-        self.cursor.execute("SELECT * FROM patients ORDER BY created_at DESC")
-        patients = [dict(row) for row in self.cursor.fetchall()]
+        patients = self._list_records('patients', {})
         log_info(f"Retrieved {len(patients)} patients from database")
         return patients
     
-    def search_patients(self, query: str) -> List[Dict]:
-        """Search patients by name, ID, or phone"""
+    def iter_patients(self, batch_size: Optional[int] = None, **filters) -> Iterator[RecordMixin]:
+        """Stream patients (newest first, like get_all_patients) without building a list"""
+        return self.iter_records('patients', batch_size, **filters)
+    
+    def search_patients(self, query: str, limit: int = 100) -> List[Dict]:
+        """Search patients by name, ID, phone or email (best matches first)
+        
+        Uses the patients_fts trigram index; terms shorter than three characters
+        cannot be looked up there, so all-short queries fall back to a LIKE scan.
+        """
+        terms = [term for term in query.split() if len(term) >= 3]
+        if terms and self._has_table('patients_fts'):
+            # Quote each term so user input is never parsed as FTS5 syntax
+            match = ' '.join('"' + term.replace('"', '""') + '"' for term in terms)
+            self.cursor.execute("""
+                SELECT p.* FROM patients_fts f
+                JOIN patients p ON p.id = f.rowid
+                WHERE patients_fts MATCH ?
+                ORDER BY f.rank, p.created_at DESC
+                LIMIT ?
+            """, (match, limit))
+            return [dict(row) for row in self.cursor.fetchall()]
+        
         self.cursor.execute("""
             SELECT * FROM patients 
             WHERE patient_id LIKE ? OR first_name LIKE ? OR last_name LIKE ? 
             OR phone LIKE ? OR email LIKE ?
             ORDER BY created_at DESC
-        """, (f'%{query}%', f'%{query}%', f'%{query}%', f'%{query}%', f'%{query}%'))
+            LIMIT ?
+        """, (f'%{query}%', f'%{query}%', f'%{query}%', f'%{query}%', f'%{query}%', limit))
         return [dict(row) for row in self.cursor.fetchall()]
     
+    @cached_read('patients')
     def get_patient_by_id(self, patient_id: str) -> Optional[Dict]:
         """Get patient by ID"""
         self.cursor.execute("SELECT * FROM patients WHERE patient_id = ?", (patient_id,))
         row = self.cursor.fetchone()
         return dict(row) if row else None
     
+    @queued_write
+    @invalidates('patients')
     def update_patient(self, patient_id: str, patient_data: Dict) -> bool:
         """Update patient information"""
         try:
@@ -533,7 +1066,7 @@ class Database:
                 datetime.now().isoformat(),
                 patient_id
             ))
-            self.conn.commit()
+            self._commit()
             log_database_operation("UPDATE", "patients", True, f"Patient ID: {patient_id}")
             return True
         except Exception as e:
@@ -542,6 +1075,8 @@ class Database:
             return False
     
     # Doctor operations
+    @queued_write
+    @invalidates('doctors')
     def add_doctor(self, doctor_data: Dict) -> bool:
         """Add a new doctor"""
         log_debug(f"Adding doctor: {doctor_data.get('doctor_id')}")
@@ -564,7 +1099,7 @@ class Database:
                 doctor_data.get('available_days', ''),
                 doctor_data.get('available_time', '')
             ))
-            self.conn.commit()
+            self._commit()
             log_info(f"Doctor added successfully: {doctor_data['doctor_id']}")
             return True
         except sqlite3.IntegrityError as e:
@@ -574,17 +1109,24 @@ class Database:
             log_error(f"Failed to add doctor: {doctor_data.get('doctor_id')}", e)
             return False
     
-    def get_all_doctors(self) -> List[Dict]:
-        """Get all doctors"""
-        self.cursor.execute("SELECT * FROM doctors ORDER BY specialization, last_name")
-        return [dict(row) for row in self.cursor.fetchall()]
+    @cached_read('doctors')
+    def get_all_doctors(self) -> List[RecordMixin]:
+        """Get all doctors as read-only DoctorRecords"""
+        return self._list_records('doctors', {})
+    
+    def iter_doctors(self, batch_size: Optional[int] = None, **filters) -> Iterator[RecordMixin]:
+        """Stream doctors (ordered like get_all_doctors) without building a list"""
+        return self.iter_records('doctors', batch_size, **filters)
     
+    @cached_read('doctors')
     def get_doctor_by_id(self, doctor_id: str) -> Optional[Dict]:
         """Get doctor by ID"""
         self.cursor.execute("SELECT * FROM doctors WHERE doctor_id = ?", (doctor_id,))
         row = self.cursor.fetchone()
         return dict(row) if row else None
     
+    @queued_write
+    @invalidates('doctors')
     def update_doctor(self, doctor_id: str, doctor_data: Dict) -> bool:
         """Update doctor information"""
         try:
@@ -608,7 +1150,7 @@ class Database:
                 doctor_data.get('available_time', ''),
                 doctor_id
             ))
-            self.conn.commit()
+            self._commit()
             log_database_operation("UPDATE", "doctors", True, f"Doctor ID: {doctor_id}")
             return True
         except Exception as e:
@@ -616,6 +1158,8 @@ class Database:
             log_error(f"Error updating doctor: {doctor_id}", e)
             return False
     
+    @queued_write
+    @invalidates('doctors')
     def delete_doctor(self, doctor_id: str) -> bool:
         """Delete a doctor"""
         try:
@@ -635,7 +1179,7 @@ class Database:
             
             # Delete the doctor
             self.cursor.execute("DELETE FROM doctors WHERE doctor_id = ?", (doctor_id,))
-            self.conn.commit()
+            self._commit()
             log_database_operation("DELETE", "doctors", True, f"Doctor ID: {doctor_id}")
             return True
         except Exception as e:
@@ -644,6 +1188,7 @@ class Database:
             return False
     
     # Appointment operations
+    @queued_write
     def add_appointment(self, appointment_data: Dict) -> bool:
         """Add a new appointment"""
         log_debug(f"Adding appointment: {appointment_data.get('appointment_id')}")
@@ -661,7 +1206,7 @@ class Database:
                 appointment_data.get('status', 'Scheduled'),
                 appointment_data.get('notes', '')
             ))
-            self.conn.commit()
+            self._commit()
             log_info(f"Appointment added successfully: {appointment_data['appointment_id']}")
             return True
         except sqlite3.IntegrityError as e:
@@ -671,113 +1216,25 @@ class Database:
             log_error(f"Failed to add appointment: {appointment_data.get('appointment_id')}", e)
             return False
     
-    def get_all_appointments(self) -> List[Dict]:
-        """Get all appointments"""
-        self.cursor.execute("""
-            SELECT a.*, p.first_name || ' ' || p.last_name as patient_name,
-            d.first_name || ' ' || d.last_name as doctor_name
-            FROM appointments a
-            LEFT JOIN patients p ON a.patient_id = p.patient_id
-            LEFT JOIN doctors d ON a.doctor_id = d.doctor_id
-            ORDER BY a.appointment_date DESC, a.appointment_time DESC
-        """)
-        return [dict(row) for row in self.cursor.fetchall()]
+    def get_all_appointments(self) -> List[RecordMixin]:
+        """Get all appointments as read-only AppointmentRecords"""
+        return self._list_records('appointments', {})
     
     def get_appointments_by_date(self, date: str) -> List[Dict]:
         """Get appointments for a specific date"""
-        self.cursor.execute("""
-            SELECT a.*, p.first_name || ' ' || p.last_name as patient_name,
-            d.first_name || ' ' || d.last_name as doctor_name
-            FROM appointments a
-            LEFT JOIN patients p ON a.patient_id = p.patient_id
-            LEFT JOIN doctors d ON a.doctor_id = d.doctor_id
-            WHERE a.appointment_date = ?
-            ORDER BY a.appointment_time
-        """, (date,))
-        return [dict(row) for row in self.cursor.fetchall()]
+        return self._find_records('appointments', {'date': date})
     
     def get_appointments_by_status(self, status: str) -> List[Dict]:
         """Get appointments by status"""
-        self.cursor.execute("""
-            SELECT a.*, p.first_name || ' ' || p.last_name as patient_name,
-            d.first_name || ' ' || d.last_name as doctor_name
-            FROM appointments a
-            LEFT JOIN patients p ON a.patient_id = p.patient_id
-            LEFT JOIN doctors d ON a.doctor_id = d.doctor_id
-            WHERE a.status = ?
-            ORDER BY a.appointment_date DESC, a.appointment_time DESC
-        """, (status,))
-        return [dict(row) for row in self.cursor.fetchall()]
+        return self._find_records('appointments', {'status': status})
     
-    def get_appointments_by_date_and_status(self, date: str, status: str) -> List[Dict]:
-        """Get appointments by date and status"""
-        self.cursor.execute("""
-            SELECT a.*, p.first_name || ' ' || p.last_name as patient_name,
-            d.first_name || ' ' || d.last_name as doctor_name
-            FROM appointments a
-            LEFT JOIN patients p ON a.patient_id = p.patient_id
-            LEFT JOIN doctors d ON a.doctor_id = d.doctor_id
-            WHERE a.appointment_date = ? AND a.status = ?
-            ORDER BY a.appointment_time
-        """, (date, status))
-        return [dict(row) for row in self.cursor.fetchall()]
-    
-    def get_appointments_by_patient_name(self, patient_name: str) -> List[Dict]:
-        """Get appointments by patient name (searches first name and last name)"""
-        self.cursor.execute("""
-            SELECT a.*, p.first_name || ' ' || p.last_name as patient_name,
-            d.first_name || ' ' || d.last_name as doctor_name
-            FROM appointments a
-            LEFT JOIN patients p ON a.patient_id = p.patient_id
-            LEFT JOIN doctors d ON a.doctor_id = d.doctor_id
-            WHERE p.first_name LIKE ? OR p.last_name LIKE ? 
-            OR (p.first_name || ' ' || p.last_name) LIKE ?
-            ORDER BY a.appointment_date DESC, a.appointment_time DESC
-        """, (f'%{patient_name}%', f'%{patient_name}%', f'%{patient_name}%'))
-        return [dict(row) for row in self.cursor.fetchall()]
-    
-    def get_appointments_by_patient_name_and_date(self, patient_name: str, date: str) -> List[Dict]:
-        """Get appointments by patient name and date"""
-        self.cursor.execute("""
-            SELECT a.*, p.first_name || ' ' || p.last_name as patient_name,
-            d.first_name || ' ' || d.last_name as doctor_name
-            FROM appointments a
-            LEFT JOIN patients p ON a.patient_id = p.patient_id
-            LEFT JOIN doctors d ON a.doctor_id = d.doctor_id
-            WHERE (p.first_name LIKE ? OR p.last_name LIKE ? 
-            OR (p.first_name || ' ' || p.last_name) LIKE ?) AND a.appointment_date = ?
-            ORDER BY a.appointment_time
-        """, (f'%{patient_name}%', f'%{patient_name}%', f'%{patient_name}%', date))
-        return [dict(row) for row in self.cursor.fetchall()]
-    
-    def get_appointments_by_patient_name_and_status(self, patient_name: str, status: str) -> List[Dict]:
-        """Get appointments by patient name and status"""
-        self.cursor.execute("""
-            SELECT a.*, p.first_name || ' ' || p.last_name as patient_name,
-            d.first_name || ' ' || d.last_name as doctor_name
-            FROM appointments a
-            LEFT JOIN patients p ON a.patient_id = p.patient_id
-            LEFT JOIN doctors d ON a.doctor_id = d.doctor_id
-            WHERE (p.first_name LIKE ? OR p.last_name LIKE ? 
-            OR (p.first_name || ' ' || p.last_name) LIKE ?) AND a.status = ?
-            ORDER BY a.appointment_date DESC, a.appointment_time DESC
-        """, (f'%{patient_name}%', f'%{patient_name}%', f'%{patient_name}%', status))
-        return [dict(row) for row in self.cursor.fetchall()]
+    def find_appointments(self, **filters) -> List[Dict]:
+        """Get appointments matching any mix of filters (see build_filtered_query)"""
+        return self._find_records('appointments', filters)
     
-    def get_appointments_by_patient_name_date_and_status(self, patient_name: str, date: str, status: str) -> List[Dict]:
-        """Get appointments by patient name, date and status"""
-        self.cursor.execute("""
-            SELECT a.*, p.first_name || ' ' || p.last_name as patient_name,
-            d.first_name || ' ' || d.last_name as doctor_name
-            FROM appointments a
-            LEFT JOIN patients p ON a.patient_id = p.patient_id
-            LEFT JOIN doctors d ON a.doctor_id = d.doctor_id
-            WHERE (p.first_name LIKE ? OR p.last_name LIKE ? 
-            OR (p.first_name || ' ' || p.last_name) LIKE ?) 
-            AND a.appointment_date = ? AND a.status = ?
-            ORDER BY a.appointment_time
-        """, (f'%{patient_name}%', f'%{patient_name}%', f'%{patient_name}%', date, status))
-        return [dict(row) for row in self.cursor.fetchall()]
+    def iter_appointments(self, batch_size: Optional[int] = None, **filters) -> Iterator[RecordMixin]:
+        """Stream appointments matching filters without building a list"""
+        return self.iter_records('appointments', batch_size, **filters)
     
     def get_appointment_by_id(self, appointment_id: str) -> Optional[Dict]:
         """Get appointment by ID"""
@@ -792,6 +1249,7 @@ class Database:
         row = self.cursor.fetchone()
         return dict(row) if row else None
     
+    @queued_write
     def update_appointment(self, appointment_id: str, appointment_data: Dict) -> bool:
         """Update an existing appointment"""
         log_debug(f"Updating appointment: {appointment_id}")
@@ -810,7 +1268,7 @@ class Database:
                 appointment_data.get('notes', ''),
                 appointment_id
             ))
-            self.conn.commit()
+            self._commit()
             log_database_operation("UPDATE", "appointments", True, f"Appointment ID: {appointment_id}")
             log_info(f"Appointment updated successfully: {appointment_id}")
             return True
@@ -820,6 +1278,7 @@ class Database:
             return False
 
     # Admission (IPD) operations
+    @queued_write
     def add_admission(self, admission_data: Dict) -> bool:
         """Add a new in-patient admission"""
         try:
@@ -851,7 +1310,7 @@ class Database:
                 admission_data.get('bed', ''),
                 admission_data.get('reason', '')
             ))
-            self.conn.commit()
+            self._commit()
             log_info(f"Admission added successfully: {admission_data['admission_id']}")
             return True
         except sqlite3.IntegrityError as e:
@@ -889,19 +1348,17 @@ class Database:
     
     def get_all_active_admissions(self) -> List[Dict]:
         """Get all currently active admissions with patient and doctor details"""
-        self.cursor.execute("""
-            SELECT a.*,
-                   p.first_name || ' ' || p.last_name AS patient_name,
-                   p.patient_id,
-                   d.first_name || ' ' || d.last_name AS doctor_name
-            FROM admissions a
-            LEFT JOIN patients p ON a.patient_id = p.patient_id
-            LEFT JOIN doctors d ON a.doctor_id = d.doctor_id
-            WHERE a.status = 'Admitted'
-            ORDER BY a.admission_date DESC, a.created_at DESC
-        """)
-        return [dict(row) for row in self.cursor.fetchall()]
+        return self._find_records('admissions', {'status': 'Admitted'})
+
+    def find_admissions(self, **filters) -> List[Dict]:
+        """Get admissions matching any mix of filters (see build_filtered_query)"""
+        return self._find_records('admissions', filters)
+    
+    def iter_admissions(self, batch_size: Optional[int] = None, **filters) -> Iterator[RecordMixin]:
+        """Stream admissions matching filters without building a list"""
+        return self.iter_records('admissions', batch_size, **filters)
 
+    @queued_write
     def discharge_admission(self, admission_id: str, discharge_date: str = None, discharge_summary: str = '') -> bool:
         """Discharge an admission"""
         try:
@@ -914,13 +1371,14 @@ class Database:
                     updated_at = ?
                 WHERE admission_id = ?
             """, (discharge_date, discharge_summary or '', datetime.now().isoformat(), admission_id))
-            self.conn.commit()
+            self._commit()
             log_info(f"Admission discharged: {admission_id}")
             return True
         except Exception as e:
             log_error(f"Failed to discharge admission: {admission_id}", e)
             return False
 
+    @queued_write
     def add_admission_note(self, note_data: Dict) -> bool:
         """Add a daily progress note for an admission"""
         try:
@@ -937,7 +1395,7 @@ class Database:
                 note_data['note_text'],
                 note_data.get('created_by', '')
             ))
-            self.conn.commit()
+            self._commit()
             log_info(f"Admission note added successfully: {note_data['note_id']}")
             return True
         except sqlite3.IntegrityError as e:
@@ -961,6 +1419,7 @@ class Database:
         return [dict(row) for row in self.cursor.fetchall()]
     
     # Prescription operations
+    @queued_write
     def add_prescription(self, prescription_data: Dict, items: List[Dict]) -> bool:
         """Add a new prescription with items"""
         log_debug(f"Adding prescription: {prescription_data.get('prescription_id')}")
@@ -990,84 +1449,43 @@ class Database:
                 prescription_data.get('icd_codes', '')
             ))
             
-            for item in items:
-                self.cursor.execute("""
-                    INSERT INTO prescription_items (prescription_id, medicine_name,
-                    dosage, frequency, duration, instructions, purpose)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    prescription_data['prescription_id'],
-                    item['medicine_name'],
-                    item['dosage'],
-                    item['frequency'],
-                    item['duration'],
-                    item.get('instructions', ''),
-                    item.get('purpose', '')
-                ))
+            self._insert_prescription_items(prescription_data['prescription_id'], [
+                self._prescription_item_values(item) + ((number + 1) * PRESCRIPTION_ITEM_POSITION_STEP,)
+                for number, item in enumerate(items)
+            ])
             
-            self.conn.commit()
+            self._commit()
             log_info(f"Prescription added successfully: {prescription_data['prescription_id']}")
             return True
         except Exception as e:
             log_error(f"Failed to add prescription: {prescription_data.get('prescription_id')}", e)
+            self._rollback()
             return False
     
-    def get_all_prescriptions(self) -> List[Dict]:
-        """Get all prescriptions"""
-        self.cursor.execute("""
-            SELECT p.*, d.first_name || ' ' || d.last_name as doctor_name,
-            pat.first_name || ' ' || pat.last_name as patient_name
-            FROM prescriptions p
-            LEFT JOIN doctors d ON p.doctor_id = d.doctor_id
-            LEFT JOIN patients pat ON p.patient_id = pat.patient_id
-            ORDER BY p.prescription_date DESC
-        """)
-        return [dict(row) for row in self.cursor.fetchall()]
+    def get_all_prescriptions(self) -> List[RecordMixin]:
+        """Get all prescriptions as read-only PrescriptionRecords"""
+        return self._list_records('prescriptions', {})
     
     def get_prescriptions_by_date(self, date: str) -> List[Dict]:
         """Get prescriptions by date"""
-        self.cursor.execute("""
-            SELECT p.*, d.first_name || ' ' || d.last_name as doctor_name,
-            pat.first_name || ' ' || pat.last_name as patient_name
-            FROM prescriptions p
-            LEFT JOIN doctors d ON p.doctor_id = d.doctor_id
-            LEFT JOIN patients pat ON p.patient_id = pat.patient_id
-            WHERE p.prescription_date = ?
-            ORDER BY p.prescription_date DESC
-        """, (date,))
-        return [dict(row) for row in self.cursor.fetchall()]
+        return self._find_records('prescriptions', {'date': date})
     
     def get_prescriptions_by_patient(self, patient_id: str) -> List[Dict]:
         """Get all prescriptions for a patient"""
-        self.cursor.execute("""
-            SELECT p.*, d.first_name || ' ' || d.last_name as doctor_name,
-            pat.first_name || ' ' || pat.last_name as patient_name
-            FROM prescriptions p
-            LEFT JOIN doctors d ON p.doctor_id = d.doctor_id
-            LEFT JOIN patients pat ON p.patient_id = pat.patient_id
-            WHERE p.patient_id = ?
-            ORDER BY p.prescription_date DESC
-        """, (patient_id,))
-        return [dict(row) for row in self.cursor.fetchall()]
+        return self._find_records('prescriptions', {'patient_id': patient_id})
     
-    def get_prescriptions_by_patient_name(self, patient_name: str) -> List[Dict]:
-        """Get prescriptions by patient name (searches first name and last name)"""
-        self.cursor.execute("""
-            SELECT p.*, d.first_name || ' ' || d.last_name as doctor_name,
-            pat.first_name || ' ' || pat.last_name as patient_name
-            FROM prescriptions p
-            LEFT JOIN doctors d ON p.doctor_id = d.doctor_id
-            LEFT JOIN patients pat ON p.patient_id = pat.patient_id
-            WHERE pat.first_name LIKE ? OR pat.last_name LIKE ? 
-            OR (pat.first_name || ' ' || pat.last_name) LIKE ?
-            ORDER BY p.prescription_date DESC
-        """, (f'%{patient_name}%', f'%{patient_name}%', f'%{patient_name}%'))
-        return [dict(row) for row in self.cursor.fetchall()]
+    def find_prescriptions(self, **filters) -> List[Dict]:
+        """Get prescriptions matching any mix of filters (see build_filtered_query)"""
+        return self._find_records('prescriptions', filters)
+    
+    def iter_prescriptions(self, batch_size: Optional[int] = None, **filters) -> Iterator[RecordMixin]:
+        """Stream prescriptions matching filters without building a list"""
+        return self.iter_records('prescriptions', batch_size, **filters)
     
     def get_prescription_items(self, prescription_id: str) -> List[Dict]:
-        """Get items for a prescription"""
+        """Get items for a prescription, in prescribed order"""
         self.cursor.execute("""
-            SELECT * FROM prescription_items WHERE prescription_id = ?
+            SELECT * FROM prescription_items WHERE prescription_id = ? ORDER BY position, id
         """, (prescription_id,))
         return [dict(row) for row in self.cursor.fetchall()]
     
@@ -1082,6 +1500,135 @@ class Database:
         row = self.cursor.fetchone()
         return dict(row) if row else None
     
+    # Editable prescription_items columns, in the order of _prescription_item_values()
+    PRESCRIPTION_ITEM_COLUMNS = ('medicine_name', 'dosage', 'frequency', 'duration', 'instructions', 'purpose')
+    
+    @staticmethod
+    def _prescription_item_values(item: Dict) -> Tuple:
+        """Column values of one prescription item (KeyError if a required field is missing)"""
+        return (item['medicine_name'], item['dosage'], item['frequency'], item['duration'],
+                item.get('instructions', ''), item.get('purpose', ''))
+    
+    def _insert_prescription_items(self, prescription_id: str, rows: List[Tuple]) -> None:
+        """Insert items (_prescription_item_values tuples plus a position) with one executemany()"""
+        if rows:
+            self.cursor.executemany(f"""
+                INSERT INTO prescription_items
+                    (prescription_id, {', '.join(self.PRESCRIPTION_ITEM_COLUMNS)}, position)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, [(prescription_id,) + row for row in rows])
+    
+    @staticmethod
+    def _positions_in_order(positions: List[Optional[int]]) -> set:
+        """Indexes of the longest run of positions that are already increasing (None is skipped)"""
+        best: List[List[int]] = []
+        for index, position in enumerate(positions):
+            chain: List[int] = []
+            if position is not None:
+                for earlier in range(index):
+                    if positions[earlier] is not None and positions[earlier] < position \
+                            and len(best[earlier]) > len(chain):
+                        chain = best[earlier]
+                chain = chain + [index]
+            best.append(chain)
+        return set(max(best, key=len, default=[]))
+    
+    @staticmethod
+    def _fill_positions(positions: List[Optional[int]]) -> List[int]:
+        """Give every None in positions a value between its neighbours, numbering afresh if a gap is full"""
+        step = PRESCRIPTION_ITEM_POSITION_STEP
+        filled = list(positions)
+        index = 0
+        while index < len(filled):
+            if filled[index] is not None:
+                index += 1
+                continue
+            end = index
+            while end < len(filled) and filled[end] is None:
+                end += 1
+            count = end - index
+            low = filled[index - 1] if index else None
+            high = filled[end] if end < len(filled) else None
+            if low is None and high is None:
+                new = [(number + 1) * step for number in range(count)]
+            elif low is None:
+                new = [high - (count - number) * step for number in range(count)]
+            elif high is None:
+                new = [low + (number + 1) * step for number in range(count)]
+            else:
+                gap = (high - low) // (count + 1)
+                if not gap:
+                    return [(number + 1) * step for number in range(len(filled))]
+                new = [low + (number + 1) * gap for number in range(count)]
+            filled[index:end] = new
+            index = end
+        return filled
+    
+    def _sync_prescription_items(self, prescription_id: str, items: List[Dict]) -> Dict[str, int]:
+        """Make the stored items of a prescription match items, touching only rows that differ
+        
+        Items are matched to stored rows by their 'id' (as returned by
+        get_prescription_items), then to an unclaimed row with the same
+        values, then to one with the same medicine, dosage, frequency and
+        duration, and only then to the remaining unclaimed rows in order.
+        Matched rows that are already in the submitted order keep their
+        position; moved and new lines get a position between their
+        neighbours, so inserting, deleting or moving one line writes one
+        row. Rows are updated only when their values or position change.
+        Returns the number of rows inserted, updated and deleted.
+        """
+        self.cursor.execute(f"""
+            SELECT id, {', '.join(self.PRESCRIPTION_ITEM_COLUMNS)}, position
+            FROM prescription_items WHERE prescription_id = ? ORDER BY position, id
+        """, (prescription_id,))
+        stored = {row[0]: (tuple(row[1:-1]), row[-1]) for row in self.cursor.fetchall()}
+        wanted = [self._prescription_item_values(item) for item in items]
+        rows: List[Optional[int]] = [None] * len(wanted)
+        claimed = set()
+        for index, item in enumerate(items):
+            try:
+                item_id = int(item['id'])
+            except (KeyError, TypeError, ValueError):
+                continue
+            if item_id in stored and item_id not in claimed:
+                rows[index] = item_id
+                claimed.add(item_id)
+        # Then by content: identical lines, then the same drug and regimen, then whatever is left
+        for same in (lambda row, values: row == values, lambda row, values: row[:4] == values[:4],
+                     lambda row, values: True):
+            for index, values in enumerate(wanted):
+                if rows[index] is None:
+                    row_id = next((row_id for row_id, (row, _) in stored.items()
+                                   if row_id not in claimed and same(row, values)), None)
+                    if row_id is not None:
+                        rows[index] = row_id
+                        claimed.add(row_id)
+        
+        old_positions = [stored[row_id][1] if row_id is not None else None for row_id in rows]
+        in_order = self._positions_in_order(old_positions)
+        positions = self._fill_positions([position if index in in_order else None
+                                          for index, position in enumerate(old_positions)])
+        
+        inserts = []
+        updates = []
+        for row_id, values, position in zip(rows, wanted, positions):
+            if row_id is None:
+                inserts.append(values + (position,))
+            elif stored[row_id] != (values, position):
+                updates.append(values + (position, row_id))
+        deletes = [row_id for row_id in stored if row_id not in claimed]
+        if updates:
+            self.cursor.executemany(f"""
+                UPDATE prescription_items
+                SET {', '.join(f'{column} = ?' for column in self.PRESCRIPTION_ITEM_COLUMNS)}, position = ?
+                WHERE id = ?
+            """, updates)
+        if deletes:
+            self.cursor.executemany("DELETE FROM prescription_items WHERE id = ?", [(row_id,) for row_id in deletes])
+        self._insert_prescription_items(prescription_id, inserts)
+        return {'inserted': len(inserts), 'updated': len(updates), 'deleted': len(deletes)}
+    
+    @queued_write
     def update_prescription(self, prescription_id: str, prescription_data: Dict, items: List[Dict]) -> bool:
         """Update an existing prescription with items"""
         log_debug(f"Updating prescription: {prescription_id}")
@@ -1113,32 +1660,15 @@ class Database:
                 prescription_id
             ))
             
-            # Delete existing items
-            self.cursor.execute("""
-                DELETE FROM prescription_items WHERE prescription_id = ?
-            """, (prescription_id,))
-            
-            # Insert new items
-            for item in items:
-                self.cursor.execute("""
-                    INSERT INTO prescription_items (prescription_id, medicine_name,
-                    dosage, frequency, duration, instructions, purpose)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    prescription_id,
-                    item['medicine_name'],
-                    item['dosage'],
-                    item['frequency'],
-                    item['duration'],
-                    item.get('instructions', ''),
-                    item.get('purpose', '')
-                ))
+            # Only rewrite the items that changed (see _sync_prescription_items)
+            self._sync_prescription_items(prescription_id, items)
             
-            self.conn.commit()
+            self._commit()
             log_info(f"Prescription updated successfully: {prescription_id}")
             return True
         except Exception as e:
             log_error(f"Failed to update prescription: {prescription_id}", e)
+            self._rollback()
             return False
     
     def get_all_medicines(self) -> List[str]:
@@ -1156,6 +1686,7 @@ class Database:
             return []
     
     # Billing operations
+    @queued_write
     def add_bill(self, bill_data: Dict) -> bool:
         """Add a new bill"""
         log_debug(f"Adding bill: {bill_data.get('bill_id')}")
@@ -1178,7 +1709,7 @@ class Database:
                 bill_data.get('payment_method', ''),
                 bill_data.get('notes', '')
             ))
-            self.conn.commit()
+            self._commit()
             log_info(f"Bill added successfully: {bill_data['bill_id']}")
             return True
         except sqlite3.IntegrityError as e:
@@ -1188,28 +1719,20 @@ class Database:
             log_error(f"Failed to add bill: {bill_data.get('bill_id')}", e)
             return False
     
-    def get_all_bills(self) -> List[Dict]:
-        """Get all bills"""
-        self.cursor.execute("""
-            SELECT b.*, p.first_name || ' ' || p.last_name as patient_name
-            FROM billing b
-            LEFT JOIN patients p ON b.patient_id = p.patient_id
-            ORDER BY b.bill_date DESC
-        """)
-        return [dict(row) for row in self.cursor.fetchall()]
+    def get_all_bills(self) -> List[RecordMixin]:
+        """Get all bills as read-only BillRecords"""
+        return self._list_records('bills', {})
     
     def get_bills_by_patient_id(self, patient_id: str) -> List[Dict]:
         """Get bills by patient ID"""
-        self.cursor.execute("""
-            SELECT b.*, p.first_name || ' ' || p.last_name as patient_name
-            FROM billing b
-            LEFT JOIN patients p ON b.patient_id = p.patient_id
-            WHERE b.patient_id = ?
-            ORDER BY b.bill_date DESC
-        """, (patient_id,))
-        return [dict(row) for row in self.cursor.fetchall()]
+        return self._find_records('bills', {'patient_id': patient_id})
+    
+    def iter_bills(self, batch_size: Optional[int] = None, **filters) -> Iterator[RecordMixin]:
+        """Stream bills matching filters without building a list"""
+        return self.iter_records('bills', batch_size, **filters)
 
     # X-ray reports operations
+    @queued_write
     def add_xray_report(
         self,
         patient_id: str,
@@ -1233,7 +1756,7 @@ class Database:
                 VALUES (?, ?, ?, ?, ?, ?, ?)
             """, (report_id, patient_id, report_date, body_part or "", findings or "",
                   file_path, file_name_original or ""))
-            self.conn.commit()
+            self._commit()
             log_info(f"X-ray report added: {report_id}")
             return report_id
         except sqlite3.IntegrityError as e:
@@ -1273,98 +1796,29 @@ class Database:
         row = self.cursor.fetchone()
         return dict(row) if row else None
 
+    @queued_write
     def delete_xray_report(self, report_id: str) -> bool:
         """Delete an X-ray report by report_id. Caller should delete file on disk."""
         try:
             self.cursor.execute("DELETE FROM xray_reports WHERE report_id = ?", (report_id,))
-            self.conn.commit()
+            self._commit()
             log_info(f"X-ray report deleted: {report_id}")
             return True
         except Exception as e:
             log_error(f"Failed to delete X-ray report: {report_id}", e)
             return False
 
-    def get_bills_by_patient_name(self, patient_name: str) -> List[Dict]:
-        """Get bills by patient name (searches first name and last name)"""
-        self.cursor.execute("""
-            SELECT b.*, p.first_name || ' ' || p.last_name as patient_name
-            FROM billing b
-            LEFT JOIN patients p ON b.patient_id = p.patient_id
-            WHERE p.first_name LIKE ? OR p.last_name LIKE ? 
-            OR (p.first_name || ' ' || p.last_name) LIKE ?
-            ORDER BY b.bill_date DESC
-        """, (f'%{patient_name}%', f'%{patient_name}%', f'%{patient_name}%'))
-        return [dict(row) for row in self.cursor.fetchall()]
-    
     def get_bills_by_date(self, date: str) -> List[Dict]:
         """Get bills by date"""
-        self.cursor.execute("""
-            SELECT b.*, p.first_name || ' ' || p.last_name as patient_name
-            FROM billing b
-            LEFT JOIN patients p ON b.patient_id = p.patient_id
-            WHERE b.bill_date = ?
-            ORDER BY b.bill_date DESC
-        """, (date,))
-        return [dict(row) for row in self.cursor.fetchall()]
+        return self._find_records('bills', {'date': date})
     
     def get_bills_by_status(self, status: str) -> List[Dict]:
         """Get bills by payment status"""
-        self.cursor.execute("""
-            SELECT b.*, p.first_name || ' ' || p.last_name as patient_name
-            FROM billing b
-            LEFT JOIN patients p ON b.patient_id = p.patient_id
-            WHERE b.payment_status = ?
-            ORDER BY b.bill_date DESC
-        """, (status,))
-        return [dict(row) for row in self.cursor.fetchall()]
-    
-    def get_bills_by_patient_name_and_date(self, patient_name: str, date: str) -> List[Dict]:
-        """Get bills by patient name and date"""
-        self.cursor.execute("""
-            SELECT b.*, p.first_name || ' ' || p.last_name as patient_name
-            FROM billing b
-            LEFT JOIN patients p ON b.patient_id = p.patient_id
-            WHERE (p.first_name LIKE ? OR p.last_name LIKE ? 
-            OR (p.first_name || ' ' || p.last_name) LIKE ?) AND b.bill_date = ?
-            ORDER BY b.bill_date DESC
-        """, (f'%{patient_name}%', f'%{patient_name}%', f'%{patient_name}%', date))
-        return [dict(row) for row in self.cursor.fetchall()]
-    
-    def get_bills_by_patient_name_and_status(self, patient_name: str, status: str) -> List[Dict]:
-        """Get bills by patient name and status"""
-        self.cursor.execute("""
-            SELECT b.*, p.first_name || ' ' || p.last_name as patient_name
-            FROM billing b
-            LEFT JOIN patients p ON b.patient_id = p.patient_id
-            WHERE (p.first_name LIKE ? OR p.last_name LIKE ? 
-            OR (p.first_name || ' ' || p.last_name) LIKE ?) AND b.payment_status = ?
-            ORDER BY b.bill_date DESC
-        """, (f'%{patient_name}%', f'%{patient_name}%', f'%{patient_name}%', status))
-        return [dict(row) for row in self.cursor.fetchall()]
+        return self._find_records('bills', {'status': status})
     
-    def get_bills_by_date_and_status(self, date: str, status: str) -> List[Dict]:
-        """Get bills by date and status"""
-        self.cursor.execute("""
-            SELECT b.*, p.first_name || ' ' || p.last_name as patient_name
-            FROM billing b
-            LEFT JOIN patients p ON b.patient_id = p.patient_id
-            WHERE b.bill_date = ? AND b.payment_status = ?
-            ORDER BY b.bill_date DESC
-        """, (date, status))
-        return [dict(row) for row in self.cursor.fetchall()]
-    
-    def get_bills_by_patient_name_date_and_status(self, patient_name: str, date: str, status: str) -> List[Dict]:
-        """Get bills by patient name, date and status"""
-        self.cursor.execute("""
-            SELECT b.*, p.first_name || ' ' || p.last_name as patient_name
-            FROM billing b
-            LEFT JOIN patients p ON b.patient_id = p.patient_id
-            WHERE (p.first_name LIKE ? OR p.last_name LIKE ? 
-            OR (p.first_name || ' ' || p.last_name) LIKE ?) 
-            AND b.bill_date = ? AND b.payment_status = ?
-            ORDER BY b.bill_date DESC
-        """, (f'%{patient_name}%', f'%{patient_name}%', f'%{patient_name}%', date, status))
-        return [dict(row) for row in self.cursor.fetchall()]
+    def find_bills(self, **filters) -> List[Dict]:
+        """Get bills matching any mix of filters (see build_filtered_query)"""
+        return self._find_records('bills', filters)
     
     def get_bill_by_id(self, bill_id: str) -> Optional[Dict]:
         """Get bill by ID"""
@@ -1377,6 +1831,7 @@ class Database:
         row = self.cursor.fetchone()
         return dict(row) if row else None
     
+    @queued_write
     def update_bill(self, bill_id: str, bill_data: Dict) -> bool:
         """Update an existing bill"""
         log_debug(f"Updating bill: {bill_id}")
@@ -1400,107 +1855,94 @@ class Database:
                 bill_data.get('notes', ''),
                 bill_id
             ))
-            self.conn.commit()
+            self._commit()
             log_info(f"Bill updated successfully: {bill_id}")
             return True
         except Exception as e:
             log_error(f"Failed to update bill: {bill_id}", e)
             return False
     
+    @queued_write
     def delete_bill(self, bill_id: str) -> bool:
         """Delete a bill"""
         log_debug(f"Deleting bill: {bill_id}")
         try:
             self.cursor.execute("DELETE FROM billing WHERE bill_id = ?", (bill_id,))
-            self.conn.commit()
+            self._commit()
             log_info(f"Bill deleted successfully: {bill_id}")
             return True
         except Exception as e:
             log_error(f"Failed to delete bill: {bill_id}", e)
             return False
     
+    @staticmethod
+    def _statistics_period(filter_type: str, filter_date: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+        """Inclusive (first, last) YYYY-MM-DD bounds for a statistics filter, or (None, None) for all time
+        
+        Plain string bounds on the stored YYYY-MM-DD dates keep the date
+        indexes usable, where strftime() on the column would not. Raises
+        ValueError for a month that is not YYYY-MM or a year that is not YYYY.
+        """
+        if not filter_date:
+            return None, None
+        if filter_type in ('daily', 'datewise'):
+            return filter_date, filter_date
+        if filter_type == 'monthly':
+            if not re.fullmatch(r'\d{4}-\d{2}', filter_date):
+                raise ValueError(f"Month must be YYYY-MM: {filter_date}")
+            # '-31' is a valid upper bound for every month in a string comparison
+            return f"{filter_date}-01", f"{filter_date}-31"
+        if filter_type == 'yearly':
+            if not re.fullmatch(r'\d{4}', filter_date):
+                raise ValueError(f"Year must be YYYY: {filter_date}")
+            return f"{filter_date}-01-01", f"{filter_date}-12-31"
+        return None, None
+    
+    def _collect_statistics(self, date_from: Optional[str] = None, date_to: Optional[str] = None) -> Dict:
+        """Dashboard figures in one statement, read from the daily_stats rollup
+        
+        Patient, doctor and active admission counts are current totals; the
+        appointment, admission and revenue figures are restricted to
+        date_from..date_to (inclusive) when given.
+        """
+        dated = "WHERE stat_date BETWEEN ? AND ?" if date_from else ""
+        self.cursor.execute(f"""
+            SELECT
+                (SELECT COUNT(*) FROM patients) AS total_patients,
+                (SELECT COUNT(*) FROM doctors) AS total_doctors,
+                period.scheduled_appointments,
+                period.completed_appointments,
+                (SELECT IFNULL(SUM(row_count), 0) FROM daily_stats
+                 WHERE source = 'admissions' AND status = 'Admitted') AS active_admissions,
+                period.total_admissions,
+                period.discharged_admissions,
+                period.total_revenue
+            FROM (
+                SELECT
+                    IFNULL(SUM(CASE WHEN source = 'appointments' AND status = 'Scheduled'
+                                    THEN row_count END), 0) AS scheduled_appointments,
+                    IFNULL(SUM(CASE WHEN source = 'appointments' AND status = 'Completed'
+                                    THEN row_count END), 0) AS completed_appointments,
+                    IFNULL(SUM(CASE WHEN source = 'admissions' THEN row_count END), 0) AS total_admissions,
+                    IFNULL(SUM(CASE WHEN source = 'admissions' AND status = 'Discharged'
+                                    THEN row_count END), 0) AS discharged_admissions,
+                    ROUND(IFNULL(SUM(CASE WHEN source = 'billing' AND status = 'Paid'
+                                          THEN amount END), 0), 2) AS total_revenue
+                FROM daily_stats
+                {dated}
+            ) period
+        """, [date_from, date_to] if date_from else [])
+        return dict(self.cursor.fetchone())
+    
     def get_statistics(self, filter_type: str = 'all', filter_date: str = None) -> Dict:
         """Get system statistics with optional filters
         
         Args:
             filter_type: 'all', 'daily', 'monthly', 'yearly', 'datewise'
-            filter_date: Date string in 'YYYY-MM-DD' format (required for 'daily' and 'datewise')
+            filter_date: 'YYYY-MM-DD' for 'daily' and 'datewise', 'YYYY-MM' for
+                'monthly', 'YYYY' for 'yearly'
         """
-        stats = {}
-        
-        # Build date filter conditions for appointments, bills, and admissions
-        appointment_filter = ""
-        bill_filter = ""
-        admission_filter = ""
-        
-        if filter_type == 'daily' and filter_date:
-            appointment_filter = f"AND appointment_date = '{filter_date}'"
-            bill_filter = f"AND bill_date = '{filter_date}'"
-            admission_filter = f"AND admission_date = '{filter_date}'"
-        elif filter_type == 'monthly' and filter_date:
-            # filter_date should be in 'YYYY-MM' format
-            appointment_filter = f"AND strftime('%Y-%m', appointment_date) = '{filter_date}'"
-            bill_filter = f"AND strftime('%Y-%m', bill_date) = '{filter_date}'"
-            admission_filter = f"AND strftime('%Y-%m', admission_date) = '{filter_date}'"
-        elif filter_type == 'yearly' and filter_date:
-            # filter_date should be in 'YYYY' format
-            appointment_filter = f"AND strftime('%Y', appointment_date) = '{filter_date}'"
-            bill_filter = f"AND strftime('%Y', bill_date) = '{filter_date}'"
-            admission_filter = f"AND strftime('%Y', admission_date) = '{filter_date}'"
-        elif filter_type == 'datewise' and filter_date:
-            appointment_filter = f"AND appointment_date = '{filter_date}'"
-            bill_filter = f"AND bill_date = '{filter_date}'"
-            admission_filter = f"AND admission_date = '{filter_date}'"
-        
-        # Total patients and doctors are not date-filtered (they're cumulative)
-        self.cursor.execute("SELECT COUNT(*) FROM patients")
-        stats['total_patients'] = self.cursor.fetchone()[0]
-        
-        self.cursor.execute("SELECT COUNT(*) FROM doctors")
-        stats['total_doctors'] = self.cursor.fetchone()[0]
-        
-        # Appointments with date filter
-        if appointment_filter:
-            self.cursor.execute(f"SELECT COUNT(*) FROM appointments WHERE status = 'Scheduled' {appointment_filter}")
-            stats['scheduled_appointments'] = self.cursor.fetchone()[0]
-            
-            self.cursor.execute(f"SELECT COUNT(*) FROM appointments WHERE status = 'Completed' {appointment_filter}")
-            stats['completed_appointments'] = self.cursor.fetchone()[0]
-        else:
-            self.cursor.execute("SELECT COUNT(*) FROM appointments WHERE status = 'Scheduled'")
-            stats['scheduled_appointments'] = self.cursor.fetchone()[0]
-            
-            self.cursor.execute("SELECT COUNT(*) FROM appointments WHERE status = 'Completed'")
-            stats['completed_appointments'] = self.cursor.fetchone()[0]
-        
-        # Admissions statistics
-        # Active admissions (currently admitted) - not date-filtered as they're current state
-        self.cursor.execute("SELECT COUNT(*) FROM admissions WHERE status = 'Admitted'")
-        stats['active_admissions'] = self.cursor.fetchone()[0]
-        
-        # Total admissions (all time or filtered by date)
-        if admission_filter:
-            self.cursor.execute(f"SELECT COUNT(*) FROM admissions WHERE 1=1 {admission_filter}")
-            stats['total_admissions'] = self.cursor.fetchone()[0]
-            
-            self.cursor.execute(f"SELECT COUNT(*) FROM admissions WHERE status = 'Discharged' {admission_filter}")
-            stats['discharged_admissions'] = self.cursor.fetchone()[0]
-        else:
-            self.cursor.execute("SELECT COUNT(*) FROM admissions")
-            stats['total_admissions'] = self.cursor.fetchone()[0]
-            
-            self.cursor.execute("SELECT COUNT(*) FROM admissions WHERE status = 'Discharged'")
-            stats['discharged_admissions'] = self.cursor.fetchone()[0]
-        
-        # Revenue with date filter
-        if bill_filter:
-            self.cursor.execute(f"SELECT SUM(total_amount) FROM billing WHERE payment_status = 'Paid' {bill_filter}")
-        else:
-            self.cursor.execute("SELECT SUM(total_amount) FROM billing WHERE payment_status = 'Paid'")
-        result = self.cursor.fetchone()[0]
-        stats['total_revenue'] = result if result else 0
-        
-        return stats
+        return self._collect_statistics(*self._statistics_period(filter_type, filter_date))
     
     def get_daily_statistics(self, date_str: str) -> Dict:
         """Get statistics for a specific date"""
@@ -1519,47 +1961,272 @@ class Database:
         return self.get_statistics('datewise', date_str)
     
     def get_date_range_statistics(self, from_date: str, to_date: str) -> Dict:
-        """Get statistics for a date range"""
-        stats = {}
-        
-        # Build date filter conditions for appointments, bills, and admissions
-        appointment_filter = f"AND appointment_date >= '{from_date}' AND appointment_date <= '{to_date}'"
-        bill_filter = f"AND bill_date >= '{from_date}' AND bill_date <= '{to_date}'"
-        admission_filter = f"AND admission_date >= '{from_date}' AND admission_date <= '{to_date}'"
-        
-        # Total patients and doctors are not date-filtered (they're cumulative)
-        self.cursor.execute("SELECT COUNT(*) FROM patients")
-        stats['total_patients'] = self.cursor.fetchone()[0]
-        
-        self.cursor.execute("SELECT COUNT(*) FROM doctors")
-        stats['total_doctors'] = self.cursor.fetchone()[0]
-        
-        # Appointments with date range filter
-        self.cursor.execute(f"SELECT COUNT(*) FROM appointments WHERE status = 'Scheduled' {appointment_filter}")
-        stats['scheduled_appointments'] = self.cursor.fetchone()[0]
+        """Get statistics for a date range (both dates inclusive, 'YYYY-MM-DD')"""
+        return self._collect_statistics(from_date, to_date)
+    
+    def get_appointment_summary(self, date_from: Optional[str] = None, date_to: Optional[str] = None,
+                                top_days: int = 10) -> Dict:
+        """Appointment counts for the appointment report, read from the daily_stats rollup
         
-        self.cursor.execute(f"SELECT COUNT(*) FROM appointments WHERE status = 'Completed' {appointment_filter}")
-        stats['completed_appointments'] = self.cursor.fetchone()[0]
+        Returns total, days (dates with at least one appointment),
+        status_distribution ({status: count}) and busiest_days (up to top_days
+        (date, count) pairs, busiest first).
+        """
+        dated = "AND stat_date BETWEEN ? AND ?" if date_from else ""
+        params = [date_from, date_to] if date_from else []
+        self.cursor.execute(f"""
+            SELECT status, SUM(row_count) FROM daily_stats
+            WHERE source = 'appointments' {dated}
+            GROUP BY status
+        """, params)
+        status_distribution = {row[0]: row[1] for row in self.cursor.fetchall()}
+        self.cursor.execute(f"""
+            SELECT stat_date, SUM(row_count) AS day_count FROM daily_stats
+            WHERE source = 'appointments' {dated}
+            GROUP BY stat_date
+            ORDER BY day_count DESC, stat_date DESC
+        """, params)
+        days = self.cursor.fetchall()
+        return {
+            'total': sum(status_distribution.values()),
+            'days': len(days),
+            'status_distribution': status_distribution,
+            'busiest_days': [(row[0], row[1]) for row in days[:top_days]],
+        }
+    
+    def get_financial_summary(self, date_from: Optional[str] = None, date_to: Optional[str] = None) -> Dict:
+        """Bill totals for the financial report, read from the daily_stats rollup
         
-        # Admissions statistics
-        # Active admissions (currently admitted) - not date-filtered as they're current state
-        self.cursor.execute("SELECT COUNT(*) FROM admissions WHERE status = 'Admitted'")
-        stats['active_admissions'] = self.cursor.fetchone()[0]
+        Returns total_bills/total_amount, paid_bills/total_revenue and
+        pending_bills/total_pending, daily_revenue ({date: paid amount}) and
+        payment_methods ({method: bill count}, '' for bills saved without
+        one). Fetch the pending bills
+        themselves with find_bills(status='Pending', limit=...).
+        """
+        dated = "AND stat_date BETWEEN ? AND ?" if date_from else ""
+        params = [date_from, date_to] if date_from else []
+        self.cursor.execute(f"""
+            SELECT status, SUM(row_count), SUM(amount) FROM daily_stats
+            WHERE source = 'billing' {dated}
+            GROUP BY status
+        """, params)
+        by_status = {row[0]: (row[1], row[2]) for row in self.cursor.fetchall()}
+        self.cursor.execute(f"""
+            SELECT stat_date, SUM(amount) FROM daily_stats
+            WHERE source = 'billing' AND status = 'Paid' {dated}
+            GROUP BY stat_date
+        """, params)
+        daily_revenue = {row[0]: row[1] for row in self.cursor.fetchall()}
+        self.cursor.execute(f"""
+            SELECT payment_method, SUM(row_count) FROM daily_stats
+            WHERE source = 'billing' {dated}
+            GROUP BY payment_method
+        """, params)
+        payment_methods = {row[0]: row[1] for row in self.cursor.fetchall()}
+        paid = by_status.get('Paid', (0, 0.0))
+        pending = by_status.get('Pending', (0, 0.0))
+        return {
+            'total_bills': sum(count for count, _ in by_status.values()),
+            'total_amount': sum(amount for _, amount in by_status.values()),
+            'paid_bills': paid[0],
+            'total_revenue': paid[1],
+            'pending_bills': pending[0],
+            'total_pending': pending[1],
+            'daily_revenue': daily_revenue,
+            'payment_methods': payment_methods,
+        }
+    
+    def get_patient_demographics(self, date_from: Optional[str] = None, date_to: Optional[str] = None,
+                                 top_n: int = 10) -> Dict:
+        """Patient counts for the patient report, aggregated in SQL
         
-        # Total admissions in date range
-        self.cursor.execute(f"SELECT COUNT(*) FROM admissions WHERE 1=1 {admission_filter}")
-        stats['total_admissions'] = self.cursor.fetchone()[0]
+        Returns total_patients, gender_distribution, blood_group_distribution
+        and age_groups (ages from date_of_birth; dates that do not parse as
+        YYYY-MM-DD are left out), plus total_appointments,
+        total_prescriptions and top_patients (up to top_n dicts of
+        patient_id, name and visits, most visits first) for the date range
+        (all time when no range is given).
+        """
+        # One pass over patients, grouped by every combination. Ages are whole
+        # 365-day years, as the reports always counted them, so each group is a
+        # range of birth dates and the text dates compare directly. Anything but
+        # a real YYYY-MM-DD date ('+0 days' rolls 2015-02-30 over) is 'parse'
+        today = datetime.now().date()
+        born_after = [(today - timedelta(days=(age + 1) * 365)).strftime('%Y-%m-%d') for age in (18, 35, 50, 65)]
+        self.cursor.execute("""
+            SELECT gender, blood_group, CASE
+                WHEN date_of_birth IS NULL THEN NULL
+                WHEN date_of_birth NOT GLOB '[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]'
+                    OR date(date_of_birth, '+0 days') IS NOT date_of_birth THEN 'parse'
+                WHEN date_of_birth > ? THEN '0-18'
+                WHEN date_of_birth > ? THEN '19-35'
+                WHEN date_of_birth > ? THEN '36-50'
+                WHEN date_of_birth > ? THEN '51-65'
+                ELSE '65+' END AS age_group, COUNT(*)
+            FROM patients
+            GROUP BY 1, 2, 3
+        """, born_after)
+        gender_distribution: Dict[str, int] = {}
+        blood_group_distribution: Dict[str, int] = {}
+        age_groups = {'0-18': 0, '19-35': 0, '36-50': 0, '51-65': 0, '65+': 0}
+        unparsed = 0
+        for gender, blood_group, age_group, count in self.cursor.fetchall():
+            gender_distribution[gender] = gender_distribution.get(gender, 0) + count
+            if blood_group:
+                blood_group_distribution[blood_group] = blood_group_distribution.get(blood_group, 0) + count
+            if age_group == 'parse':
+                unparsed += count
+            elif age_group:
+                age_groups[age_group] += count
+        if unparsed:
+            # Dates such as 2000-1-5 (or not dates at all) are parsed the way the reports always did
+            self.cursor.execute("""
+                SELECT date_of_birth, COUNT(*) FROM patients
+                WHERE date_of_birth NOT GLOB '[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]'
+                    OR date(date_of_birth, '+0 days') IS NOT date_of_birth
+                GROUP BY date_of_birth
+            """)
+            now = datetime.now()
+            for date_of_birth, count in self.cursor.fetchall():
+                try:
+                    age = (now - datetime.strptime(date_of_birth, '%Y-%m-%d')).days // 365
+                except (TypeError, ValueError):
+                    continue
+                for limit, age_group in ((18, '0-18'), (35, '19-35'), (50, '36-50'), (65, '51-65')):
+                    if age <= limit:
+                        break
+                else:
+                    age_group = '65+'
+                age_groups[age_group] += count
         
-        # Discharged admissions in date range
-        self.cursor.execute(f"SELECT COUNT(*) FROM admissions WHERE status = 'Discharged' {admission_filter}")
-        stats['discharged_admissions'] = self.cursor.fetchone()[0]
+        dated = "WHERE {column} BETWEEN ? AND ?" if date_from else ""
+        params = [date_from, date_to] if date_from else []
+        self.cursor.execute(f"""
+            SELECT SUM(row_count) FROM daily_stats
+            WHERE source = 'appointments' {dated.replace('WHERE', 'AND').format(column='stat_date')}
+        """, params)
+        total_appointments = self.cursor.fetchone()[0] or 0
+        self.cursor.execute(f"SELECT COUNT(*) FROM prescriptions {dated.format(column='prescription_date')}",
+                            params)
+        total_prescriptions = self.cursor.fetchone()[0]
+        self.cursor.execute(f"""
+            SELECT v.patient_id, v.visits, p.first_name || ' ' || p.last_name AS name
+            FROM (
+                SELECT patient_id, COUNT(*) AS visits FROM appointments
+                {dated.format(column='appointment_date')}
+                GROUP BY patient_id
+                ORDER BY visits DESC, patient_id
+                LIMIT ?
+            ) v
+            LEFT JOIN patients p ON p.patient_id = v.patient_id
+            ORDER BY v.visits DESC, v.patient_id
+        """, params + [top_n])
+        top_patients = [{'patient_id': row[0], 'name': row[2] or row[0], 'visits': row[1]}
+                        for row in self.cursor.fetchall()]
+        return {
+            'total_patients': sum(gender_distribution.values()),
+            'total_appointments': total_appointments,
+            'total_prescriptions': total_prescriptions,
+            'gender_distribution': gender_distribution,
+            'age_groups': age_groups,
+            'blood_group_distribution': blood_group_distribution,
+            'top_patients': top_patients,
+        }
+    
+    def get_doctor_performance(self, date_from: Optional[str] = None, date_to: Optional[str] = None) -> Dict:
+        """Appointment counts per doctor for the doctor report, read from the daily_stats rollup
         
-        # Revenue with date range filter
-        self.cursor.execute(f"SELECT SUM(total_amount) FROM billing WHERE payment_status = 'Paid' {bill_filter}")
-        result = self.cursor.fetchone()[0]
-        stats['total_revenue'] = result if result else 0
+        Returns total_doctors, total_appointments (including appointments of
+        unknown doctors), specialization_distribution ({specialization: doctor
+        count}) and doctor_performance: one dict per doctor with doctor_id,
+        name, specialization, total, completed, scheduled, cancelled and
+        completion_rate (percent), busiest first.
+        """
+        dated = "AND stat_date BETWEEN ? AND ?" if date_from else ""
+        params = [date_from, date_to] if date_from else []
+        # One GROUP BY doctor_id, status over the range, joined to every doctor
+        self.cursor.execute(f"""
+            WITH counts AS (
+                SELECT doctor_id, status, SUM(row_count) AS row_count FROM daily_stats
+                WHERE source = 'appointments' {dated}
+                GROUP BY doctor_id, status
+            )
+            SELECT d.doctor_id, d.first_name, d.last_name, d.specialization,
+                IFNULL(SUM(c.row_count), 0) AS total,
+                IFNULL(SUM(CASE WHEN c.status = 'Completed' THEN c.row_count END), 0),
+                IFNULL(SUM(CASE WHEN c.status = 'Scheduled' THEN c.row_count END), 0),
+                IFNULL(SUM(CASE WHEN c.status = 'Cancelled' THEN c.row_count END), 0)
+            FROM doctors d
+            LEFT JOIN counts c ON c.doctor_id = d.doctor_id
+            GROUP BY d.doctor_id
+            ORDER BY total DESC, d.doctor_id
+        """, params)
+        doctor_performance = []
+        specialization_distribution: Dict[str, int] = {}
+        for doctor_id, first_name, last_name, specialization, total, completed, scheduled, cancelled \
+                in self.cursor.fetchall():
+            specialization = specialization or 'Unknown'
+            specialization_distribution[specialization] = specialization_distribution.get(specialization, 0) + 1
+            doctor_performance.append({
+                'doctor_id': doctor_id,
+                'name': f"{first_name or ''} {last_name or ''}",
+                'specialization': specialization,
+                'total': total,
+                'completed': completed,
+                'scheduled': scheduled,
+                'cancelled': cancelled,
+                'completion_rate': completed / max(1, total) * 100,
+            })
+        self.cursor.execute(f"""
+            SELECT SUM(row_count) FROM daily_stats
+            WHERE source = 'appointments' {dated}
+        """, params)
+        return {
+            'total_doctors': len(doctor_performance),
+            'total_appointments': self.cursor.fetchone()[0] or 0,
+            'specialization_distribution': specialization_distribution,
+            'doctor_performance': doctor_performance,
+        }
+    
+    def rebuild_daily_stats(self) -> bool:
+        """Recompute the daily_stats rollup from the appointments, billing and admissions tables"""
+        try:
+            rebuild_daily_stats(self.cursor)
+            self.conn.commit()
+            log_info("Rebuilt daily_stats rollup")
+            return True
+        except Exception as e:
+            self.conn.rollback()
+            log_error("Failed to rebuild daily_stats rollup", e)
+            return False
+    
+    def check_daily_stats(self) -> List[Dict]:
+        """Compare the daily_stats rollup with the raw tables
         
-        return stats
+        Returns one dict per rollup row that is wrong, missing or extra, with
+        the key columns plus expected/actual count and amount; an empty list
+        means the rollup is consistent.
+        """
+        raw = "\n                UNION ALL ".join(daily_stats_source_query(spec) for spec in DAILY_STATS_SOURCES)
+        key = ', '.join(DAILY_STATS_KEY)
+        match = ' AND '.join(f"s.{column} = r.{column}" for column in DAILY_STATS_KEY)
+        self.cursor.execute(f"""
+            WITH raw AS (
+                {raw}
+            )
+            SELECT {', '.join(f'r.{column}' for column in DAILY_STATS_KEY)},
+                   r.row_count AS expected_count, IFNULL(s.row_count, 0) AS actual_count,
+                   ROUND(r.amount, 2) AS expected_amount, ROUND(IFNULL(s.amount, 0), 2) AS actual_amount
+            FROM raw r LEFT JOIN daily_stats s ON {match}
+            WHERE s.row_count IS NOT r.row_count OR ABS(IFNULL(s.amount, 0) - r.amount) > 0.005
+            UNION ALL
+            SELECT {', '.join(f's.{column}' for column in DAILY_STATS_KEY)},
+                   0, s.row_count, 0, ROUND(s.amount, 2)
+            FROM daily_stats s
+            WHERE NOT EXISTS (SELECT 1 FROM raw r WHERE {match})
+            ORDER BY {key}
+        """)
+        return [dict(row) for row in self.cursor.fetchall()]
     
     def get_todays_appointments(self, date: str = None) -> List[Dict]:
         """Get today's appointments"""
@@ -1627,7 +2294,7 @@ class Database:
     
     # Medicine master operations
     def populate_medicines(self) -> None:
-        """Populate medicines master table with comprehensive branded medicine list"""
+        """Populate medicines master table with the bundled branded medicine catalogue"""
         # Check if medicines already exist
         self.cursor.execute("SELECT COUNT(*) FROM medicines_master")
         count = self.cursor.fetchone()[0]
@@ -1637,332 +2304,87 @@ class Database:
         
         log_info("Populating medicines master table with branded medicines...")
         
-        medicines = [
-            # ===== PAIN & FEVER =====
-            ("Paracetamol", "Dolo", "Pain & Fever", "650mg", "Tablet", 0),
-            ("Paracetamol", "Calpol", "Pain & Fever", "500mg", "Tablet", 0),
-            ("Paracetamol", "Calpol", "Pain & Fever", "250mg/5ml", "Syrup", 1),
-            ("Paracetamol", "Crocin Advance", "Pain & Fever", "500mg", "Tablet", 0),
-            ("Ibuprofen", "Brufen", "Pain & Fever", "400mg", "Tablet", 0),
-            ("Ibuprofen", "Ibugesic", "Pain & Fever", "100mg/5ml", "Suspension", 1),
-            ("Paracetamol+Ibuprofen", "Combiflam", "Pain & Fever", "400mg/325mg", "Tablet", 0),
-            ("Aspirin", "Ecosprin", "Pain & Fever", "75mg", "Tablet", 0),
-            ("Diclofenac", "Voveran", "Pain & Fever", "50mg", "Tablet", 0),
-            ("Aceclofenac", "Hifenac", "Pain & Fever", "100mg", "Tablet", 0),
-            ("Naproxen", "Naprosyn", "Pain & Fever", "500mg", "Tablet", 0),
-
-            # ===== ANTACID & GASTRIC =====
-            ("Pantoprazole", "Pantocid", "Acidity", "40mg", "Tablet", 0),
-            ("Pantoprazole", "Pantocid", "Acidity", "4mg/ml", "Injection", 0),
-            ("Omeprazole", "Omez", "Acidity", "20mg", "Capsule", 0),
-            ("Ranitidine", "Rantac", "Acidity", "150mg", "Tablet", 0),
-            ("Sucralfate", "Sucral", "Acidity", "1g/5ml", "Syrup", 0),
-            ("Digene", "Digene", "Acidity", "Chewable", "Tablet", 0),
-            ("Domperidone", "Domstal", "Nausea", "10mg", "Tablet", 0),
-            ("ORS", "Electral", "Rehydration", "21g Sachet", "Powder", 1),
-            ("ORS", "Pedialyte", "Rehydration", "Sachet", "Powder", 1),
-
-            # ===== COUGH & COLD =====
-            ("Cetirizine", "Cetzine", "Allergy", "10mg", "Tablet", 0),
-            ("Cetirizine", "Cetzine", "Allergy", "5mg/5ml", "Syrup", 1),
-            ("Levocetirizine", "Levocet", "Allergy", "5mg", "Tablet", 0),
-            ("Dextromethorphan", "Benadryl", "Cough", "15mg/5ml", "Syrup", 1),
-            ("Ambroxol", "Mucosolvan", "Cough", "30mg/5ml", "Syrup", 1),
-            ("Montelukast+Levocetirizine", "Montair-LC", "Respiratory", "10mg/5mg", "Tablet", 0),
-            ("Phenylephrine", "Sudafed", "Cold", "10mg", "Tablet", 0),
-
-            # ===== VITAMINS & MINERALS =====
-            ("Vitamin C", "Limcee", "Vitamin", "500mg", "Tablet", 0),
-            ("Vitamin D3", "D-Rise", "Vitamin", "60k IU", "Capsule", 0),
-            ("Iron+Folic Acid", "Fefol", "Supplement", "100mg/1mg", "Tablet", 0),
-            ("Zinc", "Zinconia", "Supplement", "20mg", "Tablet", 1),
-            ("Multivitamin", "Becosules", "Vitamin", "Capsule", "Capsule", 0),
-
-            # ===== BASIC INJECTIONS =====
-            ("Paracetamol", "Paracip", "Pain & Fever", "150mg/ml", "Injection", 0),
-            ("Ranitidine", "Zinetac", "Acidity", "25mg/ml", "Injection", 0),
-
-            # ===== ANTIBIOTICS =====
-            ("Amoxicillin+Clavulanic Acid", "Augmentin", "Antibiotic", "625mg", "Tablet", 0),
-            ("Amoxicillin+Clavulanic Acid", "Augmentin", "Antibiotic", "228mg/5ml", "Syrup", 1),
-            ("Amoxicillin", "Mox", "Antibiotic", "500mg", "Capsule", 0),
-            ("Amoxicillin", "Mox Kid", "Antibiotic", "250mg/5ml", "Syrup", 1),
-            ("Cefixime", "Taxim-O", "Antibiotic", "200mg", "Tablet", 0),
-            ("Cefixime", "Suprax", "Antibiotic", "100mg/5ml", "Syrup", 1),
-            ("Cefdinir", "Omnicef", "Antibiotic", "300mg", "Capsule", 0),
-            ("Azithromycin", "Azithral", "Antibiotic", "500mg", "Tablet", 0),
-            ("Azithromycin", "Zithromax", "Antibiotic", "200mg/5ml", "Suspension", 1),
-            ("Ciprofloxacin", "Cifran", "Antibiotic", "500mg", "Tablet", 0),
-            ("Levofloxacin", "Levoflox", "Antibiotic", "500mg", "Tablet", 0),
-            ("Ofloxacin", "Oflox", "Antibiotic", "200mg", "Tablet", 0),
-            ("Metronidazole", "Flagyl", "Antibiotic", "400mg", "Tablet", 0),
-            ("Metronidazole", "Metrogyl", "Antibiotic", "200mg/5ml", "Suspension", 1),
-            ("Doxycycline", "Doxy", "Antibiotic", "100mg", "Tablet", 0),
-            ("Clarithromycin", "Claribid", "Antibiotic", "500mg", "Tablet", 0),
-            ("Linezolid", "Linox", "Antibiotic", "600mg", "Tablet", 0),
-            ("Ceftriaxone", "Monocef", "Antibiotic", "1g", "Injection", 0),
-            ("Piperacillin+Tazobactam", "Piptaz", "Antibiotic", "4.5g", "Injection", 0),
-            ("Meropenem", "Meromac", "Antibiotic", "1g", "Injection", 0),
-            ("Vancomycin", "Vancobin", "Antibiotic", "500mg", "Injection", 0),
-            ("Gentamicin", "Genticyn", "Antibiotic", "80mg/2ml", "Injection", 1),
-
-            # ===== UTI, GYNAE =====
-            ("Nitrofurantoin", "Macrodantin", "UTI", "100mg", "Capsule", 0),
-            ("Fosfomycin", "Fosfomed", "UTI", "3g", "Sachet", 0),
-            ("Tinidazole", "Tini", "Gynecological", "500mg", "Tablet", 0),
-
-            # ===== ANTI TUBERCULAR THERAPY (ATT) =====
-            ("Isoniazid", "Isonex", "ATT", "300mg", "Tablet", 0),
-            ("Rifampicin", "R-Cin", "ATT", "450mg", "Capsule", 0),
-            ("Ethambutol", "Combutol", "ATT", "800mg", "Tablet", 0),
-            ("Pyrazinamide", "Zid", "ATT", "750mg", "Tablet", 0),
-
-            # ===== ANTIFUNGALS =====
-            ("Fluconazole", "Flucos", "Antifungal", "150mg", "Tablet", 0),
-            ("Clotrimazole", "Candid", "Antifungal", "1%", "Cream", 0),
-            ("Terbinafine", "Terbinaforce", "Antifungal", "250mg", "Tablet", 0),
-
-            # ===== ANTIVIRALS =====
-            ("Acyclovir", "Zovirax", "Antiviral", "400mg", "Tablet", 0),
-            ("Oseltamivir", "Tamiflu", "Antiviral", "75mg", "Capsule", 0),
-
-            # ===== CARDIAC / BLOOD PRESSURE =====
-            ("Amlodipine", "Amlong", "Hypertension", "5mg", "Tablet", 0),
-            ("Telmisartan", "Telma", "Hypertension", "40mg", "Tablet", 0),
-            ("Losartan", "Losar", "Hypertension", "50mg", "Tablet", 0),
-            ("Metoprolol", "Betaloc", "Hypertension", "50mg", "Tablet", 0),
-            ("Atenolol", "Tenormin", "Hypertension", "50mg", "Tablet", 0),
-            ("Enalapril", "Enam", "Hypertension", "5mg", "Tablet", 0),
-            ("Clonidine", "Arkamin", "Hypertension", "100mcg", "Tablet", 0),
-
-            # ===== CHOLESTEROL =====
-            ("Atorvastatin", "Atorva", "Cholesterol", "10mg", "Tablet", 0),
-            ("Rosuvastatin", "Crestor", "Cholesterol", "10mg", "Tablet", 0),
-            ("Simvastatin", "Simvotin", "Cholesterol", "20mg", "Tablet", 0),
-
-            # ===== DIABETES =====
-            ("Metformin", "Glycomet", "Diabetes", "500mg", "Tablet", 0),
-            ("Glimepiride", "Amaryl", "Diabetes", "2mg", "Tablet", 0),
-            ("Gliclazide", "Diamicron", "Diabetes", "80mg", "Tablet", 0),
-            ("Sitagliptin", "Januvia", "Diabetes", "100mg", "Tablet", 0),
-            ("Insulin Regular", "Actrapid", "Diabetes", "100IU/ml", "Injection", 0),
-            ("Insulin Glargine", "Lantus", "Diabetes", "100IU/ml", "Injection", 0),
-
-            # ===== THYROID =====
-            ("Levothyroxine", "Thyronorm", "Thyroid", "50mcg", "Tablet", 0),
-            ("Levothyroxine", "Thyronorm", "Thyroid", "100mcg", "Tablet", 0),
-
-            # ===== ORTHO / PAIN / NEURO =====
-            ("Gabapentin", "Gabapin", "Neuropathic Pain", "300mg", "Capsule", 0),
-            ("Pregabalin", "Lyrica", "Neuropathic Pain", "75mg", "Capsule", 0),
-            ("Duloxetine", "Duzela", "Pain & Depression", "30mg", "Capsule", 0),
-            ("Tramadol", "Ultracet", "Severe Pain", "50mg", "Tablet", 0),
-            ("Etoricoxib", "Arcoxia", "Pain & Ortho", "60mg", "Tablet", 0),
-            ("Tizanidine", "Sirdalud", "Muscle Relaxant", "2mg", "Tablet", 0),
-
-            # ===== ASTHMA & COPD =====
-            ("Salbutamol", "Asthalin", "Asthma", "100mcg", "Inhaler", 0),
-            ("Formoterol+Budesonide", "Foracort", "Asthma", "200mcg", "Inhaler", 0),
-            ("Ipratropium", "Atrovent", "COPD", "20mcg", "Inhaler", 0),
-
-            # ===== PSYCHIATRY =====
-            ("Sertraline", "Serlift", "Psychiatry", "50mg", "Tablet", 0),
-            ("Clonazepam", "Lonazep", "Anxiety", "0.5mg", "Tablet", 0),
-            ("Olanzapine", "Oliza", "Schizophrenia", "5mg", "Tablet", 0),
-
-            # ===== PEDIATRIC HIGH-USE =====
-            ("Paracetamol", "Tempol", "Pediatric", "150mg/5ml", "Drops", 1),
-            ("Amoxicillin", "Mox Kid", "Pediatric", "250mg/5ml", "Syrup", 1),
-            ("Zinc", "Z&D", "Pediatric", "10mg", "Tablet", 1),
-            ("ORS", "Rehydralyte", "Pediatric", "Sachet", "Powder", 1),
-            ("Ondansetron", "Emeset", "Vomiting", "2mg/5ml", "Syrup", 1),
-            ("Albendazole", "Zentel", "Deworming", "200mg", "Chewable", 1),
-
-            # ===== EMERGENCY MEDICINES =====
-            ("Adrenaline", "Epinephrine", "Emergency", "1mg/ml", "Injection", 0),
-            ("Atropine", "Atropen", "Emergency", "0.6mg/ml", "Injection", 0),
-            ("Nitroglycerin", "Sorbitrate", "Emergency", "5mg", "Tablet", 0),
-            ("Diazepam", "Valium", "Seizure", "5mg/ml", "Injection", 0),
-            ("Hydrocortisone", "Solucortef", "Emergency", "100mg", "Injection", 0),
-            ("Magnesium Sulfate", "MgSO4", "Pre-eclampsia", "50%", "Injection", 0),
-
-            # ===== IV FLUIDS / ELECTROLYTES =====
-            ("Normal Saline", "NS", "IV Fluid", "100ml", "Infusion", 0),
-            ("Normal Saline", "NS", "IV Fluid", "500ml", "Infusion", 0),
-            ("Ringer's Lactate", "RL", "IV Fluid", "500ml", "Infusion", 0),
-            ("Dextrose Normal Saline", "DNS", "IV Fluid", "500ml", "Infusion", 0),
-            ("Dextrose 5%", "D5", "IV Fluid", "500ml", "Infusion", 0),
-            ("Potassium Chloride", "KCl", "Electrolyte", "15%", "Injection", 0),
-        ]
-        
         try:
-            for name, company, category, dosage, form, is_pediatric in medicines:
-                # Create description from available data
-                description = f"{category} medication"
-                if is_pediatric:
-                    description += " - Pediatric use"
-                
-                self.cursor.execute("""
-                    INSERT OR IGNORE INTO medicines_master 
-                    (medicine_name, company_name, category, dosage_mg, dosage_form, description, is_pediatric)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                """, (name, company, category, dosage, form, description, is_pediatric))
+            with open(get_seed_data_path(MEDICINE_SEED_FILE), 'r', encoding='utf-8', newline='') as file:
+                reader = csv.reader(file)
+                next(reader)  # header
+                rows = [
+                    (name, company, category, dosage, form,
+                     f"{category} medication - Pediatric use" if is_pediatric == '1' else f"{category} medication",
+                     int(is_pediatric))
+                    for name, company, category, dosage, form, is_pediatric in reader
+                ]
             
+            # One executemany inside one transaction
+            self.cursor.executemany("""
+                INSERT OR IGNORE INTO medicines_master 
+                (medicine_name, company_name, category, dosage_mg, dosage_form, description, is_pediatric)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, rows)
             self.conn.commit()
-            log_info(f"Successfully populated {len(medicines)} branded medicines into master table")
+            log_info(f"Successfully populated {len(rows)} branded medicines into master table")
         except Exception as e:
+            self.conn.rollback()
             log_error("Failed to populate medicines master table", e)
     
-    def get_all_medicines_master(self) -> List[Dict]:
-        """Get all medicines from master table"""
+    def get_all_medicines_master(self) -> List[RecordMixin]:
+        """Get all medicines from master table as MedicineRecords"""
         try:
-            self.cursor.execute("""
-                SELECT medicine_name, company_name, dosage_mg, dosage_form, category, description 
+            medicines = self._fetch_records(f"""
+                SELECT {self._medicine_columns()}
                 FROM medicines_master 
                 ORDER BY medicine_name ASC
-            """)
-            rows = self.cursor.fetchall()
-            medicines = []
-            for row in rows:
-                # Access Row columns by name - sqlite3.Row supports dictionary-style access
-                # Convert None to empty string and ensure all values are strings
-                try:
-                    medicine = {
-                        'medicine_name': str(row['medicine_name']) if row['medicine_name'] is not None else '',
-                        'company_name': str(row['company_name']) if row['company_name'] is not None else '',
-                        'dosage_mg': str(row['dosage_mg']) if row['dosage_mg'] is not None else '',
-                        'dosage_form': str(row['dosage_form']) if row['dosage_form'] is not None else '',
-                        'category': str(row['category']) if row['category'] is not None else '',
-                        'description': str(row['description']) if row['description'] is not None else ''
-                    }
-                except (KeyError, IndexError) as e:
-                    # Fallback to index-based access if name access fails
-                    medicine = {
-                        'medicine_name': str(row[0]) if len(row) > 0 and row[0] is not None else '',
-                        'company_name': str(row[1]) if len(row) > 1 and row[1] is not None else '',
-                        'dosage_mg': str(row[2]) if len(row) > 2 and row[2] is not None else '',
-                        'dosage_form': str(row[3]) if len(row) > 3 and row[3] is not None else '',
-                        'category': str(row[4]) if len(row) > 4 and row[4] is not None else '',
-                        'description': str(row[5]) if len(row) > 5 and row[5] is not None else ''
-                    }
-                medicines.append(medicine)
+            """, record='MedicineRecord')
             log_debug(f"Retrieved {len(medicines)} medicines from master table")
             return medicines
         except Exception as e:
             log_error("Failed to retrieve medicines from master table", e)
             return []
     
-    def search_medicines_master(self, query: str) -> List[Dict]:
+    def iter_medicines_master(self, query: str = '', batch_size: Optional[int] = None) -> Iterator[RecordMixin]:
+        """Stream catalogue rows (optionally those whose name contains query) in name order
+        
+        Values are returned as stored; unlike get_all_medicines_master,
+        missing values stay None rather than becoming ''.
+        """
+        where, params = self._medicine_name_filter(query)
+        return self._iter_rows(f"""
+            SELECT {', '.join(self.MEDICINE_FIELDS)}
+            FROM medicines_master
+            WHERE {where}
+            ORDER BY medicine_name ASC
+        """, params, batch_size, 'MedicineRecord')
+    
+    def search_medicines_master(self, query: str) -> List[RecordMixin]:
         """Search medicines by medicine name only"""
         try:
-            self.cursor.execute("""
-                SELECT medicine_name, company_name, dosage_mg, dosage_form, category, description 
+            where, params = self._medicine_name_filter(query)
+            return self._fetch_records(f"""
+                SELECT {self._medicine_columns()}
                 FROM medicines_master 
-                WHERE medicine_name LIKE ?
+                WHERE {where}
                 ORDER BY medicine_name ASC
-            """, (f'%{query}%',))
-            rows = self.cursor.fetchall()
-            medicines = []
-            for row in rows:
-                # Access Row columns by name - sqlite3.Row supports dictionary-style access
-                # Convert None to empty string and ensure all values are strings
-                try:
-                    medicine = {
-                        'medicine_name': str(row['medicine_name']) if row['medicine_name'] is not None else '',
-                        'company_name': str(row['company_name']) if row['company_name'] is not None else '',
-                        'dosage_mg': str(row['dosage_mg']) if row['dosage_mg'] is not None else '',
-                        'dosage_form': str(row['dosage_form']) if row['dosage_form'] is not None else '',
-                        'category': str(row['category']) if row['category'] is not None else '',
-                        'description': str(row['description']) if row['description'] is not None else ''
-                    }
-                except (KeyError, IndexError) as e:
-                    # Fallback to index-based access if name access fails
-                    medicine = {
-                        'medicine_name': str(row[0]) if len(row) > 0 and row[0] is not None else '',
-                        'company_name': str(row[1]) if len(row) > 1 and row[1] is not None else '',
-                        'dosage_mg': str(row[2]) if len(row) > 2 and row[2] is not None else '',
-                        'dosage_form': str(row[3]) if len(row) > 3 and row[3] is not None else '',
-                        'category': str(row[4]) if len(row) > 4 and row[4] is not None else '',
-                        'description': str(row[5]) if len(row) > 5 and row[5] is not None else ''
-                    }
-                medicines.append(medicine)
-            return medicines
+            """, params, 'MedicineRecord')
         except Exception as e:
             log_error("Failed to search medicines", e)
             return []
     
-    def get_all_medicines_master_paginated(self, limit: int = 50, offset: int = 0) -> List[Dict]:
+    def get_all_medicines_master_paginated(self, limit: int = 50, offset: int = 0) -> List[RecordMixin]:
         """Get paginated medicines from master table"""
         try:
-            self.cursor.execute("""
-                SELECT medicine_name, company_name, dosage_mg, dosage_form, category, description 
+            return self._fetch_records(f"""
+                SELECT {self._medicine_columns()}
                 FROM medicines_master 
                 ORDER BY medicine_name ASC
                 LIMIT ? OFFSET ?
-            """, (limit, offset))
-            rows = self.cursor.fetchall()
-            medicines = []
-            for row in rows:
-                try:
-                    medicine = {
-                        'medicine_name': str(row['medicine_name']) if row['medicine_name'] is not None else '',
-                        'company_name': str(row['company_name']) if row['company_name'] is not None else '',
-                        'dosage_mg': str(row['dosage_mg']) if row['dosage_mg'] is not None else '',
-                        'dosage_form': str(row['dosage_form']) if row['dosage_form'] is not None else '',
-                        'category': str(row['category']) if row['category'] is not None else '',
-                        'description': str(row['description']) if row['description'] is not None else ''
-                    }
-                except (KeyError, IndexError):
-                    medicine = {
-                        'medicine_name': str(row[0]) if len(row) > 0 and row[0] is not None else '',
-                        'company_name': str(row[1]) if len(row) > 1 and row[1] is not None else '',
-                        'dosage_mg': str(row[2]) if len(row) > 2 and row[2] is not None else '',
-                        'dosage_form': str(row[3]) if len(row) > 3 and row[3] is not None else '',
-                        'category': str(row[4]) if len(row) > 4 and row[4] is not None else '',
-                        'description': str(row[5]) if len(row) > 5 and row[5] is not None else ''
-                    }
-                medicines.append(medicine)
-            return medicines
+            """, (limit, offset), 'MedicineRecord')
         except Exception as e:
             log_error("Failed to retrieve paginated medicines from master table", e)
             return []
     
-    def search_medicines_master_paginated(self, query: str, limit: int = 50, offset: int = 0) -> List[Dict]:
+    def search_medicines_master_paginated(self, query: str, limit: int = 50, offset: int = 0) -> List[RecordMixin]:
         """Search medicines by medicine name only with pagination"""
-        try:
-            self.cursor.execute("""
-                SELECT medicine_name, company_name, dosage_mg, dosage_form, category, description 
-                FROM medicines_master 
-                WHERE medicine_name LIKE ?
-                ORDER BY medicine_name ASC
-                LIMIT ? OFFSET ?
-            """, (f'%{query}%', limit, offset))
-            rows = self.cursor.fetchall()
-            medicines = []
-            for row in rows:
-                try:
-                    medicine = {
-                        'medicine_name': str(row['medicine_name']) if row['medicine_name'] is not None else '',
-                        'company_name': str(row['company_name']) if row['company_name'] is not None else '',
-                        'dosage_mg': str(row['dosage_mg']) if row['dosage_mg'] is not None else '',
-                        'dosage_form': str(row['dosage_form']) if row['dosage_form'] is not None else '',
-                        'category': str(row['category']) if row['category'] is not None else '',
-                        'description': str(row['description']) if row['description'] is not None else ''
-                    }
-                except (KeyError, IndexError):
-                    medicine = {
-                        'medicine_name': str(row[0]) if len(row) > 0 and row[0] is not None else '',
-                        'company_name': str(row[1]) if len(row) > 1 and row[1] is not None else '',
-                        'dosage_mg': str(row[2]) if len(row) > 2 and row[2] is not None else '',
-                        'dosage_form': str(row[3]) if len(row) > 3 and row[3] is not None else '',
-                        'category': str(row[4]) if len(row) > 4 and row[4] is not None else '',
-                        'description': str(row[5]) if len(row) > 5 and row[5] is not None else ''
-                    }
-                medicines.append(medicine)
-            return medicines
-        except Exception as e:
-            log_error("Failed to search medicines with pagination", e)
-            return []
+        return self.search_medicines_master_page(query, limit, offset)[0]
     
     def get_total_medicines_count(self) -> int:
         """Get total count of medicines in master table"""
@@ -1977,16 +2399,184 @@ class Database:
     def get_search_medicines_count(self, query: str) -> int:
         """Get total count of medicines matching search query"""
         try:
-            self.cursor.execute("""
-                SELECT COUNT(*) FROM medicines_master 
-                WHERE medicine_name LIKE ?
-            """, (f'%{query}%',))
+            phrase = self._medicine_fts_phrase(query)
+            if phrase:
+                # Counted from the index alone, without touching medicines_master
+                self.cursor.execute("SELECT COUNT(*) FROM medicines_fts WHERE medicines_fts MATCH ?", (phrase,))
+            else:
+                where, params = self._medicine_name_filter(query)
+                self.cursor.execute(f"SELECT COUNT(*) FROM medicines_master WHERE {where}", params)
             count = self.cursor.fetchone()[0]
             return count if count else 0
         except Exception as e:
             log_error("Failed to get search medicines count", e)
             return 0
     
+    MEDICINE_FIELDS = ('medicine_name', 'company_name', 'dosage_mg', 'dosage_form', 'category', 'description')
+    
+    @classmethod
+    def _medicine_columns(cls, fields=None) -> str:
+        """SELECT list returning each medicine field as text, with NULL as ''"""
+        return ', '.join(f"IFNULL(CAST({key} AS TEXT), '') AS {key}" for key in fields or cls.MEDICINE_FIELDS)
+    
+    def _medicine_fts_phrase(self, query: str) -> Optional[str]:
+        """medicines_fts MATCH argument for query, or None if the trigram index cannot serve it
+        
+        The query becomes one quoted phrase; trigram phrases match as plain
+        case-insensitive substrings, exactly like LIKE '%query%'.
+        """
+        query = query.strip()
+        if len(query) >= 3 and self._has_table('medicines_fts'):
+            return '"' + query.replace('"', '""') + '"'
+        return None
+    
+    def _medicine_name_filter(self, query: str) -> Tuple[str, tuple]:
+        """WHERE clause (and its parameters) matching medicines_master names against a search box query
+        
+        Queries of three or more characters are substring matches served by the
+        medicines_fts trigram index; shorter ones are name prefix matches served
+        by idx_medicines_master_name_nocase.
+        """
+        query = query.strip()
+        phrase = self._medicine_fts_phrase(query)
+        if not query:
+            return "1 = 1", ()
+        if phrase:
+            return "id IN (SELECT rowid FROM medicines_fts WHERE medicines_fts MATCH ?)", (phrase,)
+        if len(query) >= 3:
+            return "medicine_name LIKE ? ESCAPE '\\'", ('%' + _escape_like(query) + '%',)
+        return "medicine_name LIKE ? ESCAPE '\\'", (_escape_like(query) + '%',)
+    
+    def search_medicines_master_page(self, query: str, limit: int = 50,
+                                     offset: int = 0) -> Tuple[List[RecordMixin], int]:
+        """One page of medicines matching query plus the total number of matches
+        
+        Names starting with the query rank first, read in order straight off
+        idx_medicines_master_name_nocase; names that merely contain it follow
+        and are only looked up once the page runs past the prefix matches. The
+        total comes from the indexes, so a broad query never sorts or counts
+        the whole catalogue for the first page.
+        """
+        query = query.strip()
+        if not query:
+            return self.get_all_medicines_master_paginated(limit, offset), self.get_total_medicines_count()
+        try:
+            columns = self._medicine_columns()
+            prefix = _escape_like(query) + '%'
+            medicines = self._fetch_records(f"""
+                SELECT {columns} FROM medicines_master
+                WHERE medicine_name LIKE ? ESCAPE '\\'
+                ORDER BY medicine_name COLLATE NOCASE
+                LIMIT ? OFFSET ?
+            """, (prefix, limit, offset), 'MedicineRecord')
+            total = self.get_search_medicines_count(query)
+            if len(medicines) < limit and len(query) >= 3:
+                if medicines or not offset:
+                    prefix_count = offset + len(medicines)
+                else:
+                    self.cursor.execute(
+                        "SELECT COUNT(*) FROM medicines_master WHERE medicine_name LIKE ? ESCAPE '\\'", (prefix,)
+                    )
+                    prefix_count = self.cursor.fetchone()[0]
+                where, params = self._medicine_name_filter(query)
+                medicines.extend(self._fetch_records(f"""
+                    SELECT {columns} FROM medicines_master
+                    WHERE {where} AND NOT medicine_name LIKE ? ESCAPE '\\'
+                    ORDER BY medicine_name COLLATE NOCASE
+                    LIMIT ? OFFSET ?
+                """, params + (prefix, limit - len(medicines), max(0, offset - prefix_count)), 'MedicineRecord'))
+            return medicines, total
+        except Exception as e:
+            log_error("Failed to search medicines page", e)
+            return [], 0
+    
+    def search_medicines_master_after(self, query: str = '', limit: int = 50, cursor: Optional[str] = None,
+                                      fields: Optional[List[str]] = None) -> Tuple[List[Dict], Optional[str]]:
+        """One page of the catalogue (all of it, or the matches for query) and the next page's cursor
+        
+        Same order as search_medicines_master_page - prefix matches, then
+        substring matches, each by name - but each page continues from the
+        previous page's last row instead of an OFFSET. Raises ValueError for
+        an unknown field or a cursor issued for another query.
+        """
+        query = query.strip()
+        signature = f"medicines:{query.lower()}"
+        fields = list(fields or self.MEDICINE_FIELDS)
+        unknown = set(fields) - set(self._table_columns('medicines_master'))
+        if unknown:
+            raise ValueError(f"Unknown field for medicines_master: {', '.join(sorted(unknown))}")
+        start_phase, after = 0, None
+        if cursor:
+            key = decode_cursor(cursor, signature)
+            if len(key) != 3:
+                raise ValueError("Invalid cursor")
+            start_phase, after = key[0], key[1:]
+        
+        prefix = _escape_like(query) + '%'
+        phases = [(0, "medicine_name LIKE ? ESCAPE '\\'", [prefix])]
+        if len(query) >= 3:
+            where, params = self._medicine_name_filter(query)
+            phases.append((1, f"{where} AND NOT medicine_name LIKE ? ESCAPE '\\'", list(params) + [prefix]))
+        key_columns = ("medicine_name COLLATE NOCASE", "id")
+        
+        # Read one row past the page to know whether another page follows
+        rows = []
+        for phase, condition, params in phases:
+            if phase < start_phase or len(rows) > limit:
+                continue
+            if after and phase == start_phase:
+                condition += " AND " + keyset_condition(key_columns, False)
+                params = params + keyset_params(after)
+            self.cursor.execute(f"""
+                SELECT {self._medicine_columns(fields)}, medicine_name AS _key_name, id AS _key_id
+                FROM medicines_master
+                WHERE {condition}
+                ORDER BY {', '.join(key_columns)}
+                LIMIT ?
+            """, params + [limit + 1 - len(rows)])
+            rows.extend((phase, row) for row in self.cursor.fetchall())
+        
+        next_cursor = None
+        if len(rows) > limit:
+            phase, last = rows[limit - 1]
+            next_cursor = make_cursor(signature, [phase, last['_key_name'], last['_key_id']])
+        # Plain dicts: this page only ever goes straight out as JSON
+        return [{key: row[key] for key in fields} for _, row in rows[:limit]], next_cursor
+    
+    def autocomplete_medicines(self, query: str, limit: int = 20) -> List[str]:
+        """Distinct medicine names for a type-ahead box: prefix matches first, then substring matches
+        
+        Both lookups are bounded, so the cost per keystroke does not grow with
+        the size of the catalogue.
+        """
+        try:
+            query = query.strip()
+            self.cursor.execute("""
+                SELECT medicine_name FROM medicines_master
+                WHERE medicine_name LIKE ? ESCAPE '\\'
+                GROUP BY medicine_name COLLATE NOCASE
+                ORDER BY medicine_name COLLATE NOCASE
+                LIMIT ?
+            """, (_escape_like(query) + '%', limit))
+            names = [row[0] for row in self.cursor.fetchall()]
+            if len(names) < limit and len(query) >= 3 and self._has_table('medicines_fts'):
+                seen = {name.lower() for name in names}
+                # Only look at the first few hundred index hits; a type-ahead needs a handful
+                self.cursor.execute("""
+                    SELECT medicine_name FROM medicines_master
+                    WHERE id IN (SELECT rowid FROM medicines_fts WHERE medicines_fts MATCH ? LIMIT ?)
+                    GROUP BY medicine_name COLLATE NOCASE
+                    ORDER BY medicine_name COLLATE NOCASE
+                """, ('"' + query.replace('"', '""') + '"', limit * 25))
+                for (name,) in self.cursor.fetchall():
+                    if name.lower() not in seen and len(names) < limit:
+                        seen.add(name.lower())
+                        names.append(name)
+            return names
+        except Exception as e:
+            log_error("Failed to autocomplete medicines", e)
+            return []
+    
     def get_medicine_dosages(self, medicine_name: str) -> List[str]:
         """Get all available dosages for a specific medicine"""
         try:
@@ -2023,6 +2613,7 @@ class Database:
             log_error(f"Failed to retrieve medicine {medicine_name}", e)
             return None
     
+    @queued_write
     def add_medicine_to_master(self, medicine_data: Dict) -> bool:
         """Add a single medicine to the master table"""
         try:
@@ -2040,12 +2631,13 @@ class Database:
                 medicine_data.get('description', ''),
                 medicine_data.get('is_pediatric', 0)
             ))
-            self.conn.commit()
+            self._commit()
             return True
         except Exception as e:
             log_error(f"Failed to add medicine to master: {medicine_data.get('medicine_name')}", e)
             return False
     
+    @queued_write
     def batch_add_medicines_to_master(self, medicines_list: List[Dict]) -> int:
         """Add multiple medicines to the master table in a single transaction"""
         if not medicines_list:
@@ -2070,10 +2662,10 @@ class Database:
                 if self.cursor.rowcount > 0:
                     imported += 1
             
-            self.conn.commit()
+            self._commit()
             return imported
         except Exception as e:
-            self.conn.rollback()
+            self._rollback()
             log_error(f"Failed to batch add medicines to master", e)
             return 0
     
@@ -2247,6 +2839,9 @@ class Database:
             return {'success': False, 'message': str(e), 'imported': imported, 'failed': failed}
     
     # User authentication operations
+    # Modules a user can be granted; the admin user always has all of them
+    ALL_MODULES = ('dashboard', 'patient', 'doctor', 'appointments', 'prescription', 'ipd', 'billing', 'report')
+    
     def create_default_user(self) -> None:
         """Create default user if no users exist"""
         try:
@@ -2268,8 +2863,7 @@ class Database:
                 user_id = self.cursor.lastrowid
                 
                 # Grant all module permissions to admin user
-                all_modules = ['dashboard', 'patient', 'doctor', 'appointments', 'prescription', 'ipd', 'billing', 'report']
-                for module in all_modules:
+                for module in self.ALL_MODULES:
                     self.cursor.execute("""
                         INSERT INTO user_permissions (user_id, module_name)
                         VALUES (?, ?)
@@ -2296,6 +2890,8 @@ class Database:
             row = self.cursor.fetchone()
             if row:
                 user = dict(row)
+                if username.lower() == 'admin':
+                    self.ensure_admin_permissions(user['id'])
                 log_info(f"User authenticated successfully: {username}")
                 return user
             else:
@@ -2305,6 +2901,7 @@ class Database:
             log_error(f"Error authenticating user: {username}", e)
             return None
     
+    @cached_read('users')
     def get_user_by_username(self, username: str) -> Optional[Dict]:
         """Get user by username"""
         try:
@@ -2316,6 +2913,7 @@ class Database:
             return None
     
     # User permission management operations
+    @cached_read('users', 'user_permissions')
     def user_has_permission(self, user_id: int, module_name: str) -> bool:
         """Check if a user has permission to access a specific module"""
         try:
@@ -2336,6 +2934,7 @@ class Database:
             log_error(f"Failed to check user permission: user_id={user_id}, module={module_name}", e)
             return False
     
+    @cached_read('users', 'user_permissions')
     def get_user_permissions(self, user_id: int) -> List[str]:
         """Get list of modules that a user has access to"""
         try:
@@ -2343,24 +2942,8 @@ class Database:
             self.cursor.execute("SELECT username FROM users WHERE id = ?", (user_id,))
             user_row = self.cursor.fetchone()
             if user_row and user_row[0].lower() == 'admin':
-                # Admin always has all permissions
-                all_modules = ['dashboard', 'patient', 'doctor', 'appointments', 'prescription', 'ipd', 'billing', 'report']
-                # Ensure admin has all permissions in database
-                current_perms = self.cursor.execute("""
-                    SELECT module_name FROM user_permissions 
-                    WHERE user_id = ?
-                """, (user_id,)).fetchall()
-                current_module_names = [row[0] for row in current_perms]
-                
-                # Add any missing permissions
-                for module in all_modules:
-                    if module not in current_module_names:
-                        self.cursor.execute("""
-                            INSERT INTO user_permissions (user_id, module_name)
-                            VALUES (?, ?)
-                        """, (user_id, module))
-                self.conn.commit()
-                return all_modules
+                # Admin always has all permissions (rows kept by ensure_admin_permissions)
+                return list(self.ALL_MODULES)
             
             # Regular user - get their permissions
             self.cursor.execute("""
@@ -2372,6 +2955,8 @@ class Database:
             log_error(f"Failed to get user permissions: {user_id}", e)
             return []
     
+    @queued_write
+    @invalidates('user_permissions')
     def set_user_permissions(self, user_id: int, permissions: List[str]) -> bool:
         """Set direct module permissions for a user (replaces existing permissions)"""
         try:
@@ -2391,13 +2976,41 @@ class Database:
                     INSERT INTO user_permissions (user_id, module_name)
                     VALUES (?, ?)
                 """, (user_id, module))
-            self.conn.commit()
+            self._commit()
             log_info(f"Direct permissions set successfully for user: {user_id}")
             return True
         except Exception as e:
             log_error(f"Failed to set user permissions: {user_id}", e)
             return False
     
+    @queued_write
+    def ensure_admin_permissions(self, user_id: int) -> int:
+        """Give the admin user a permission row for every module in ALL_MODULES
+        
+        Called at admin login, so modules added in later versions show up in
+        the permission lists. Writes (and expires cached permissions) only
+        when rows are missing; returns the number of rows added.
+        """
+        try:
+            self.cursor.execute("SELECT module_name FROM user_permissions WHERE user_id = ?", (user_id,))
+            current_module_names = {row[0] for row in self.cursor.fetchall()}
+            missing = [module for module in self.ALL_MODULES if module not in current_module_names]
+            if not missing:
+                return 0
+            self.cursor.executemany("""
+                INSERT INTO user_permissions (user_id, module_name)
+                VALUES (?, ?)
+            """, [(user_id, module) for module in missing])
+            self._commit()
+            self._invalidate('user_permissions')
+            log_info(f"Granted admin user {user_id} missing modules: {', '.join(missing)}")
+            return len(missing)
+        except Exception as e:
+            self._rollback()
+            log_error(f"Failed to ensure admin permissions: {user_id}", e)
+            return 0
+    
+    @cached_read('user_permissions')
     def get_user_direct_permissions(self, user_id: int) -> List[str]:
         """Get direct module permissions for a user"""
         try:
@@ -2410,6 +3023,8 @@ class Database:
             log_error(f"Failed to get user direct permissions: {user_id}", e)
             return []
     
+    @queued_write
+    @invalidates('users', 'user_permissions')
     def create_user(self, username: str, password: str, full_name: str = '', email: str = '', permissions: List[str] = None) -> Optional[int]:
         """Create a new user with username, password, email, and optional direct permissions"""
         try:
@@ -2432,7 +3047,7 @@ class Database:
                 else:
                     log_info(f"Inactive user with username '{username}' found. Deleting to allow reuse.")
                     self.cursor.execute("DELETE FROM users WHERE id = ?", (existing_user_dict['id'],))
-                    self.conn.commit()
+                    self._commit()
             
             # Now insert the new user
             self.cursor.execute("""
@@ -2450,7 +3065,7 @@ class Database:
                         VALUES (?, ?)
                     """, (user_id, module))
             
-            self.conn.commit()
+            self._commit()
             log_info(f"User created successfully: {username} (ID: {user_id})")
             return user_id
         except sqlite3.IntegrityError as e:
@@ -2460,6 +3075,7 @@ class Database:
             log_error(f"Failed to create user: {username}", e)
             return None
     
+    @cached_read('users', 'user_permissions', copy_lists=True)
     def get_all_users(self) -> List[Dict]:
         """Get all active users with their permissions"""
         try:
@@ -2481,6 +3097,8 @@ class Database:
             log_error("Failed to get all users", e)
             return []
     
+    @queued_write
+    @invalidates('users')
     def update_user(self, user_id: int, username: str = None, full_name: str = None, email: str = None, 
                     password: str = None, is_active: int = None) -> bool:
         """Update user information"""
@@ -2522,13 +3140,15 @@ class Database:
                 UPDATE users SET {', '.join(updates)}
                 WHERE id = ?
             """, params)
-            self.conn.commit()
+            self._commit()
             log_info(f"User updated successfully: {user_id}")
             return True
         except Exception as e:
             log_error(f"Failed to update user: {user_id}", e)
             return False
     
+    @queued_write
+    @invalidates('users')
     def delete_user(self, user_id: int) -> bool:
         """Delete a user (soft delete by setting is_active = 0)"""
         try:
@@ -2553,14 +3173,15 @@ class Database:
                 log_warning(f"No rows updated for user: {user_id}")
                 return False
             
-            self.conn.commit()
+            self._commit()
             log_info(f"User deleted successfully: {user_id}")
             return True
         except Exception as e:
             log_error(f"Failed to delete user: {user_id}", e)
-            self.conn.rollback()
+            self._rollback()
             return False
     
+    @cached_read('users', 'user_permissions', copy_lists=True)
     def get_user_by_id(self, user_id: int) -> Optional[Dict]:
         """Get user by ID with permissions"""
         try:
@@ -2587,29 +3208,45 @@ class Database:
 
     def create_local_backup(self, dest_path: str) -> str:
         """Create a copy of the database file at dest_path. Returns dest_path."""
-        import shutil
+        # SQLite online backup: consistent snapshot that includes pages still in the WAL
         self.conn.commit()
-        self.close()
+        dest = sqlite3.connect(dest_path)
         try:
-            shutil.copy2(self.db_name, dest_path)
-            log_info(f"Backup created: {dest_path}")
-            return dest_path
+            self.conn.backup(dest)
         finally:
-            self.connect()
+            dest.close()
+        log_info(f"Backup created: {dest_path}")
+        return dest_path
 
     def restore_from_file(self, src_path: str) -> bool:
         """Restore database from a backup file. Replaces current database."""
-        import shutil
         if not os.path.isfile(src_path):
             log_error("Restore failed: backup file not found", src_path)
             return False
-        self.close()
+        # close() stops the writer thread; single-writer mode resumes afterwards
+        writer_batch = self._writer.max_batch if self._writer is not None else None
         try:
-            shutil.copy2(src_path, self.db_name)
-            log_info(f"Database restored from: {src_path}")
+            self.conn.commit()
+            # Copy pages through SQLite rather than over the file so an open WAL
+            # cannot be replayed on top of the restored data
+            src = sqlite3.connect(src_path)
+            try:
+                src.backup(self.conn)
+            finally:
+                src.close()
+            # Other threads may hold pages cached from before the restore
+            self.close()
             self.connect()
+            if self._cache is not None:
+                self._cache.clear()
+            # Backups taken before an upgrade are at an older schema version
+            self.init_database()
+            log_info(f"Database restored from: {src_path}")
             return True
         except Exception as e:
             log_error("Restore failed", e)
             self.connect()
             return False
+        finally:
+            if writer_batch is not None:
+                self.start_writer(writer_batch)
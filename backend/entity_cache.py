@@ -0,0 +1,138 @@
+"""
+In-process read cache for Hospital Management System
+A bounded LRU of by-id lookups and small reference lists (doctors, users,
+permissions), invalidated through per-table version counters that the
+write methods bump after they commit
+"""
+import threading
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Callable, Dict, Iterable, Tuple
+
+
+class EntityCache:
+    """Bounded LRU cache whose entries are tagged with the versions of the tables they read
+
+    An entry is only served while none of its tables has been bumped since
+    it was stored; clear() drops everything (e.g. when another connection
+    has committed and we cannot tell which tables changed).
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple, Tuple[Tuple, Any]]" = OrderedDict()
+        self._versions: Dict[str, int] = {}
+        # Bumped by clear(); part of every version tag
+        self._epoch = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.clears = 0
+
+    def version(self, tables: Iterable[str]) -> Tuple:
+        """Current version tag for a set of tables (take it before reading them)"""
+        with self._lock:
+            return (self._epoch,) + tuple(self._versions.get(table, 0) for table in tables)
+
+    def get(self, key: Tuple, version: Tuple) -> Tuple[bool, Any]:
+        """(True, value) for a current entry, (False, None) on a miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, entry[1]
+            self.misses += 1
+            return False, None
+
+    def put(self, key: Tuple, version: Tuple, value: Any) -> None:
+        """Store value under the version tag taken before it was read"""
+        with self._lock:
+            self._entries[key] = (version, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def bump(self, tables: Iterable[str]) -> None:
+        """Invalidate every entry that read any of tables"""
+        with self._lock:
+            for table in tables:
+                self._versions[table] = self._versions.get(table, 0) + 1
+
+    def clear(self) -> None:
+        """Invalidate every entry"""
+        with self._lock:
+            self._entries.clear()
+            self._epoch += 1
+            self.clears += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters, current size and table versions"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'evictions': self.evictions,
+                'clears': self.clears,
+                'table_versions': dict(self._versions),
+            }
+
+
+def _copy_result(value: Any, copy_lists: bool) -> Any:
+    """Copy a cached result so callers can modify it (records are immutable and shared)"""
+    if isinstance(value, dict):
+        if copy_lists:
+            return {key: list(item) if isinstance(item, list) else item for key, item in value.items()}
+        return dict(value)
+    if isinstance(value, list):
+        return [_copy_result(item, copy_lists) for item in value]
+    return value
+
+
+def cached_read(*tables: str, copy_lists: bool = False) -> Callable:
+    """Cache a Database read method's results until a write bumps one of tables
+
+    Reads inside Database.transaction() bypass the cache, since they may
+    see the transaction's own uncommitted rows. Results are copied on the
+    way out, so changing a returned dict never changes the cache; set
+    copy_lists for results holding lists in their dicts (user permissions).
+    """
+    def decorate(method: Callable) -> Callable:
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            cache = self._cache
+            if cache is None or self._in_transaction():
+                return method(self, *args, **kwargs)
+            key = (method.__name__, args, tuple(sorted(kwargs.items())))
+            try:
+                hash(key)
+            except TypeError:
+                return method(self, *args, **kwargs)
+            self._check_external_commits()
+            version = cache.version(tables)
+            found, value = cache.get(key, version)
+            if not found:
+                value = method(self, *args, **kwargs)
+                cache.put(key, version, value)
+            return _copy_result(value, copy_lists)
+        return wrapper
+    return decorate
+
+
+def invalidates(*tables: str) -> Callable:
+    """Mark a Database write method as changing tables (bumps their cache versions once committed)"""
+    def decorate(method: Callable) -> Callable:
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                self._invalidate(*tables)
+        return wrapper
+    return decorate
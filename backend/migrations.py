@@ -0,0 +1,299 @@
+"""
+Schema migrations for Hospital Management System
+Versioned schema changes tracked with SQLite's PRAGMA user_version
+"""
+import sqlite3
+from typing import Callable, List, Optional, Tuple
+
+from utils.logger import log_info, log_error, log_warning
+
+
+def _create_hot_path_indexes(cursor: sqlite3.Cursor) -> None:
+    """Indexes for the date/status/patient filters used by Database query methods"""
+    statements = [
+        # get_appointments_by_date[_and_status], get_todays_appointments, statistics
+        "CREATE INDEX IF NOT EXISTS idx_appointments_date_status ON appointments(appointment_date, status, appointment_time)",
+        # get_appointments_by_status (ordered by date)
+        "CREATE INDEX IF NOT EXISTS idx_appointments_status_date ON appointments(status, appointment_date, appointment_time)",
+        # per-doctor schedules and doctor reports
+        "CREATE INDEX IF NOT EXISTS idx_appointments_doctor_date ON appointments(doctor_id, appointment_date)",
+        # per-patient history (patient-name filters join on patient_id)
+        "CREATE INDEX IF NOT EXISTS idx_appointments_patient_date ON appointments(patient_id, appointment_date)",
+        # get_bills_by_date[_and_status], revenue statistics
+        "CREATE INDEX IF NOT EXISTS idx_billing_date_status ON billing(bill_date, payment_status)",
+        # get_bills_by_status (ordered by date)
+        "CREATE INDEX IF NOT EXISTS idx_billing_status_date ON billing(payment_status, bill_date)",
+        # get_bills_by_patient_id and patient-name filters
+        "CREATE INDEX IF NOT EXISTS idx_billing_patient ON billing(patient_id, bill_date)",
+        # get_prescriptions_by_patient
+        "CREATE INDEX IF NOT EXISTS idx_prescriptions_patient_date ON prescriptions(patient_id, prescription_date)",
+        # get_prescriptions_by_date
+        "CREATE INDEX IF NOT EXISTS idx_prescriptions_date ON prescriptions(prescription_date)",
+        # get_prescription_items
+        "CREATE INDEX IF NOT EXISTS idx_prescription_items_prescription ON prescription_items(prescription_id)",
+        # get_all_active_admissions, admission statistics
+        "CREATE INDEX IF NOT EXISTS idx_admissions_status_date ON admissions(status, admission_date)",
+        "CREATE INDEX IF NOT EXISTS idx_admissions_date ON admissions(admission_date)",
+        # get_all_patients / recent activity ordering
+        "CREATE INDEX IF NOT EXISTS idx_patients_created ON patients(created_at)",
+        # get_medicine_dosages, get_medicine_by_name_and_dosage, name-ordered paging
+        "CREATE INDEX IF NOT EXISTS idx_medicines_master_name ON medicines_master(medicine_name, dosage_mg)",
+    ]
+    for statement in statements:
+        cursor.execute(statement)
+
+
+def fts5_trigram_available(cursor: sqlite3.Cursor) -> bool:
+    """Check whether this SQLite build has FTS5 with the trigram tokenizer (3.34+)"""
+    try:
+        cursor.execute("CREATE VIRTUAL TABLE temp._fts5_probe USING fts5(x, tokenize='trigram')")
+        cursor.execute("DROP TABLE temp._fts5_probe")
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+
+def _create_patient_search_index(cursor: sqlite3.Cursor) -> None:
+    """Trigram full-text index over the patient search columns, kept in sync by triggers"""
+    if not fts5_trigram_available(cursor):
+        log_warning("SQLite FTS5 trigram tokenizer not available - patient search stays on LIKE")
+        return
+    cursor.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS patients_fts USING fts5(
+            patient_id, first_name, last_name, phone, email,
+            content='patients', content_rowid='id', tokenize='trigram'
+        )
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS patients_fts_insert AFTER INSERT ON patients BEGIN
+            INSERT INTO patients_fts(rowid, patient_id, first_name, last_name, phone, email)
+            VALUES (new.id, new.patient_id, new.first_name, new.last_name, new.phone, new.email);
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS patients_fts_delete AFTER DELETE ON patients BEGIN
+            INSERT INTO patients_fts(patients_fts, rowid, patient_id, first_name, last_name, phone, email)
+            VALUES ('delete', old.id, old.patient_id, old.first_name, old.last_name, old.phone, old.email);
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS patients_fts_update
+        AFTER UPDATE OF patient_id, first_name, last_name, phone, email ON patients BEGIN
+            INSERT INTO patients_fts(patients_fts, rowid, patient_id, first_name, last_name, phone, email)
+            VALUES ('delete', old.id, old.patient_id, old.first_name, old.last_name, old.phone, old.email);
+            INSERT INTO patients_fts(rowid, patient_id, first_name, last_name, phone, email)
+            VALUES (new.id, new.patient_id, new.first_name, new.last_name, new.phone, new.email);
+        END
+    """)
+    # Index the patients that already exist
+    cursor.execute("INSERT INTO patients_fts(patients_fts) VALUES ('rebuild')")
+
+
+def _create_medicine_search_index(cursor: sqlite3.Cursor) -> None:
+    """Case-insensitive name index for prefix lookups and a trigram index for substring search"""
+    # LIKE 'abc%' can only use an index declared with the NOCASE collation
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_medicines_master_name_nocase "
+        "ON medicines_master(medicine_name COLLATE NOCASE)"
+    )
+    if not fts5_trigram_available(cursor):
+        log_warning("SQLite FTS5 trigram tokenizer not available - medicine search stays on LIKE")
+        return
+    cursor.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS medicines_fts USING fts5(
+            medicine_name,
+            content='medicines_master', content_rowid='id', tokenize='trigram'
+        )
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS medicines_fts_insert AFTER INSERT ON medicines_master BEGIN
+            INSERT INTO medicines_fts(rowid, medicine_name) VALUES (new.id, new.medicine_name);
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS medicines_fts_delete AFTER DELETE ON medicines_master BEGIN
+            INSERT INTO medicines_fts(medicines_fts, rowid, medicine_name)
+            VALUES ('delete', old.id, old.medicine_name);
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS medicines_fts_update
+        AFTER UPDATE OF medicine_name ON medicines_master BEGIN
+            INSERT INTO medicines_fts(medicines_fts, rowid, medicine_name)
+            VALUES ('delete', old.id, old.medicine_name);
+            INSERT INTO medicines_fts(rowid, medicine_name) VALUES (new.id, new.medicine_name);
+        END
+    """)
+    # Index the catalogue that is already loaded
+    cursor.execute("INSERT INTO medicines_fts(medicines_fts) VALUES ('rebuild')")
+
+
+# Rows rolled up into daily_stats: (source, table, date column, doctor column,
+# status column, payment method column, amount column). None means the
+# source has no such column and the key part is stored as '' (amount as 0).
+DAILY_STATS_SOURCES: List[Tuple[str, str, str, Optional[str], str, Optional[str], Optional[str]]] = [
+    ('appointments', 'appointments', 'appointment_date', 'doctor_id', 'status', None, None),
+    ('billing', 'billing', 'bill_date', None, 'payment_status', 'payment_method', 'total_amount'),
+    ('admissions', 'admissions', 'admission_date', 'doctor_id', 'status', None, None),
+]
+
+DAILY_STATS_KEY = ('stat_date', 'source', 'doctor_id', 'status', 'payment_method')
+
+
+def _daily_stats_values(source_spec: Tuple, prefix: str) -> List[str]:
+    """SQL expressions for a source row's daily_stats key, count and amount (prefix: 'new.', 'old.' or '')"""
+    source, _, date_column, doctor_column, status_column, method_column, amount_column = source_spec
+
+    def text(column: Optional[str]) -> str:
+        return f"IFNULL({prefix}{column}, '')" if column else "''"
+    return [f"{prefix}{date_column}", f"'{source}'", text(doctor_column), text(status_column),
+            text(method_column), '1', f"IFNULL({prefix}{amount_column}, 0)" if amount_column else '0']
+
+
+def _daily_stats_apply(source_spec: Tuple, prefix: str, sign: int) -> str:
+    """Trigger statements adding (sign=1) or removing (sign=-1) one source row from daily_stats"""
+    values = _daily_stats_values(source_spec, prefix)
+    key = ', '.join(DAILY_STATS_KEY)
+    statements = [f"""
+            INSERT INTO daily_stats ({key}, row_count, amount)
+            VALUES ({', '.join(values[:5])}, {sign} * {values[5]}, {sign} * {values[6]})
+            ON CONFLICT ({key}) DO UPDATE SET
+                row_count = row_count + excluded.row_count,
+                amount = amount + excluded.amount;"""]
+    if sign < 0:
+        # Drop buckets that no longer hold any rows
+        statements.append(f"""
+            DELETE FROM daily_stats WHERE ({key}) = ({', '.join(values[:5])}) AND row_count = 0;""")
+    return ''.join(statements)
+
+
+def daily_stats_source_query(source_spec: Tuple) -> str:
+    """SELECT of one source table's rows aggregated into daily_stats rows"""
+    values = _daily_stats_values(source_spec, '')
+    return (f"SELECT {', '.join(f'{expr} AS {name}' for expr, name in zip(values[:5], DAILY_STATS_KEY))}, "
+            f"COUNT(*) AS row_count, SUM({values[6]}) AS amount "
+            f"FROM {source_spec[1]} GROUP BY 1, 3, 4, 5")
+
+
+def rebuild_daily_stats(cursor: sqlite3.Cursor) -> None:
+    """Recompute every daily_stats row from the raw tables"""
+    cursor.execute("DELETE FROM daily_stats")
+    for source_spec in DAILY_STATS_SOURCES:
+        cursor.execute(f"INSERT INTO daily_stats ({', '.join(DAILY_STATS_KEY)}, row_count, amount) "
+                       f"{daily_stats_source_query(source_spec)}")
+
+
+def _create_daily_stats(cursor: sqlite3.Cursor) -> None:
+    """Per-day rollup of appointments, bills and admissions, kept current by triggers"""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS daily_stats (
+            stat_date TEXT NOT NULL,
+            source TEXT NOT NULL,
+            doctor_id TEXT NOT NULL DEFAULT '',
+            status TEXT NOT NULL DEFAULT '',
+            payment_method TEXT NOT NULL DEFAULT '',
+            row_count INTEGER NOT NULL DEFAULT 0,
+            amount REAL NOT NULL DEFAULT 0,
+            PRIMARY KEY (stat_date, source, doctor_id, status, payment_method)
+        ) WITHOUT ROWID
+    """)
+    # Date-range reads per source, and current-state counts (e.g. admitted now) across all dates
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_daily_stats_source_date ON daily_stats(source, stat_date)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_daily_stats_source_status ON daily_stats(source, status)")
+    for source_spec in DAILY_STATS_SOURCES:
+        source, table, date_column, doctor_column, status_column, method_column, amount_column = source_spec
+        watched = ', '.join(c for c in (date_column, doctor_column, status_column, method_column, amount_column) if c)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS daily_stats_{table}_insert AFTER INSERT ON {table} BEGIN
+            {_daily_stats_apply(source_spec, 'new.', 1)}
+            END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS daily_stats_{table}_delete AFTER DELETE ON {table} BEGIN
+            {_daily_stats_apply(source_spec, 'old.', -1)}
+            END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS daily_stats_{table}_update AFTER UPDATE OF {watched} ON {table} BEGIN
+            {_daily_stats_apply(source_spec, 'old.', -1)}
+            {_daily_stats_apply(source_spec, 'new.', 1)}
+            END
+        """)
+    # Roll up the rows that already exist
+    rebuild_daily_stats(cursor)
+
+
+# Gap between the positions of consecutive prescription items, so a line can
+# be inserted between two others without moving either
+PRESCRIPTION_ITEM_POSITION_STEP = 1024
+
+
+def _add_prescription_item_positions(cursor: sqlite3.Cursor) -> None:
+    """Explicit item order for prescriptions, numbered in the existing (rowid) order"""
+    cursor.execute("PRAGMA table_info(prescription_items)")
+    if 'position' not in [row[1] for row in cursor.fetchall()]:
+        cursor.execute("ALTER TABLE prescription_items ADD COLUMN position INTEGER NOT NULL DEFAULT 0")
+    cursor.execute(f"""
+        UPDATE prescription_items SET position = {PRESCRIPTION_ITEM_POSITION_STEP} * (
+            SELECT COUNT(*) FROM prescription_items earlier
+            WHERE earlier.prescription_id = prescription_items.prescription_id
+              AND earlier.id <= prescription_items.id
+        )
+    """)
+    # Replaces idx_prescription_items_prescription for get_prescription_items
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_prescription_items_position "
+        "ON prescription_items(prescription_id, position)"
+    )
+    cursor.execute("DROP INDEX IF EXISTS idx_prescription_items_prescription")
+
+
+# (version, description, step). Append only - never renumber or edit a shipped step.
+MIGRATIONS: List[Tuple[int, str, Callable[[sqlite3.Cursor], None]]] = [
+    (1, "Indexes for hot query paths", _create_hot_path_indexes),
+    (2, "Full-text index for patient search", _create_patient_search_index),
+    (3, "Prefix and full-text indexes for medicine search", _create_medicine_search_index),
+    (4, "Daily statistics rollup", _create_daily_stats),
+    (5, "Prescription item positions", _add_prescription_item_positions),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    """Read the schema version stored in the database file"""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def apply_migrations(conn: sqlite3.Connection) -> int:
+    """Apply every pending migration in order. Returns the resulting schema version.
+
+    Each step runs in its own IMMEDIATE transaction together with the
+    user_version bump, so a failed step leaves the database at the
+    previous version and another process starting at the same time
+    waits instead of applying the same step twice.
+    """
+    if conn.in_transaction:
+        conn.commit()
+    version = get_schema_version(conn)
+    for step_version, description, step in MIGRATIONS:
+        if step_version <= version:
+            continue
+        cursor = conn.cursor()
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            # Another process may have migrated while we waited for the lock
+            if get_schema_version(conn) >= step_version:
+                conn.rollback()
+                version = get_schema_version(conn)
+                continue
+            log_info(f"Applying schema migration {step_version}: {description}")
+            step(cursor)
+            cursor.execute(f"PRAGMA user_version = {int(step_version)}")
+            conn.commit()
+            version = step_version
+        except Exception as e:
+            conn.rollback()
+            log_error(f"Schema migration {step_version} failed", e)
+            raise
+    return version
@@ -0,0 +1,302 @@
+"""
+Filtered list queries for Hospital Management System
+Builds one parameterized SELECT for any mix of list filters on the
+appointments, billing, prescriptions, admissions, patients and doctors
+tables, with optional column projection and keyset (cursor) pagination
+"""
+import base64
+import binascii
+import json
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Per-entity SQL pieces. 'order' lists the sort columns, ending with the
+# primary key so every row has a unique position for keyset pagination;
+# 'day_order' replaces it when the filter covers a single day. A filter
+# mapped to None is not available for that entity.
+ENTITY_QUERIES: Dict[str, Dict] = {
+    'appointments': {
+        'table': 'appointments',
+        'alias': 'a',
+        'computed': {
+            'patient_name': "p.first_name || ' ' || p.last_name",
+            'doctor_name': "d.first_name || ' ' || d.last_name",
+        },
+        'from': """appointments a
+            LEFT JOIN patients p ON a.patient_id = p.patient_id
+            LEFT JOIN doctors d ON a.doctor_id = d.doctor_id""",
+        'patient_id': 'a.patient_id',
+        'date': 'a.appointment_date',
+        'status': 'a.status',
+        'doctor_id': 'a.doctor_id',
+        'ward': None,
+        'order': ('a.appointment_date', 'a.appointment_time', 'a.id'),
+        'default_order': 'desc',
+        'day_order': ('a.appointment_time', 'a.id'),
+    },
+    'bills': {
+        'table': 'billing',
+        'alias': 'b',
+        'computed': {
+            'patient_name': "p.first_name || ' ' || p.last_name",
+        },
+        'from': """billing b
+            LEFT JOIN patients p ON b.patient_id = p.patient_id""",
+        'patient_id': 'b.patient_id',
+        'date': 'b.bill_date',
+        'status': 'b.payment_status',
+        'doctor_id': None,
+        'ward': None,
+        'order': ('b.bill_date', 'b.id'),
+        'default_order': 'desc',
+    },
+    'prescriptions': {
+        'table': 'prescriptions',
+        'alias': 'p',
+        'computed': {
+            'doctor_name': "d.first_name || ' ' || d.last_name",
+            'patient_name': "pat.first_name || ' ' || pat.last_name",
+        },
+        'from': """prescriptions p
+            LEFT JOIN doctors d ON p.doctor_id = d.doctor_id
+            LEFT JOIN patients pat ON p.patient_id = pat.patient_id""",
+        'patient_id': 'p.patient_id',
+        'date': 'p.prescription_date',
+        'status': None,
+        'doctor_id': 'p.doctor_id',
+        'ward': None,
+        'order': ('p.prescription_date', 'p.id'),
+        'default_order': 'desc',
+    },
+    'admissions': {
+        'table': 'admissions',
+        'alias': 'a',
+        'computed': {
+            'patient_name': "p.first_name || ' ' || p.last_name",
+            'doctor_name': "d.first_name || ' ' || d.last_name",
+            # Whole days since admission (still admitted) or of the stay (discharged)
+            'days_admitted': """CAST(CASE a.status
+                WHEN 'Admitted' THEN julianday(date('now', 'localtime')) - julianday(a.admission_date)
+                WHEN 'Discharged' THEN julianday(a.discharge_date) - julianday(a.admission_date)
+                END AS INTEGER)""",
+        },
+        'from': """admissions a
+            LEFT JOIN patients p ON a.patient_id = p.patient_id
+            LEFT JOIN doctors d ON a.doctor_id = d.doctor_id""",
+        'patient_id': 'a.patient_id',
+        'date': 'a.admission_date',
+        'status': 'a.status',
+        'doctor_id': 'a.doctor_id',
+        'ward': 'a.ward',
+        # Same-day admissions fall back to insertion order, which the
+        # (status, admission_date) index already provides via the rowid
+        'order': ('a.admission_date', 'a.id'),
+        'default_order': 'desc',
+    },
+    'patients': {
+        'table': 'patients',
+        'alias': 'pt',
+        'computed': {},
+        'from': "patients pt",
+        'patient_id': 'pt.patient_id',
+        'date': None,
+        'status': None,
+        'doctor_id': None,
+        'ward': None,
+        'order': ('pt.created_at', 'pt.id'),
+        'default_order': 'desc',
+    },
+    'doctors': {
+        'table': 'doctors',
+        'alias': 'd',
+        'computed': {},
+        'from': "doctors d",
+        'patient_id': None,
+        'date': None,
+        'status': None,
+        'doctor_id': 'd.doctor_id',
+        'ward': None,
+        'order': ('d.specialization', 'd.last_name', 'd.id'),
+        'default_order': 'asc',
+    },
+}
+
+
+def encode_cursor(raw: str) -> str:
+    """Opaque URL-safe page token for the _cursor value of a page's last row"""
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def make_cursor(signature: str, values: List) -> str:
+    """Page token for a sort key computed in Python rather than by a _cursor column"""
+    return encode_cursor(json.dumps({'s': signature, 'k': values}))
+
+
+def decode_cursor(token: str, signature: str) -> List:
+    """Key values stored in a page token; ValueError if it is malformed or
+    was issued for a different list (entity, ordering or search)"""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)))
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError):
+        raise ValueError("Invalid cursor")
+    if not isinstance(payload, dict) or payload.get('s') != signature or not isinstance(payload.get('k'), list):
+        raise ValueError("Invalid cursor")
+    return payload['k']
+
+
+def keyset_condition(columns: Iterable[str], descending: bool) -> str:
+    """WHERE condition selecting the rows after a cursor position (one ? per column)
+
+    The leading column gets its own range term as well: SQLite only turns
+    the row-value comparison into an index range when there is no collation
+    on the column, and the extra term is what keeps such pages from
+    scanning from the start of the index.
+    """
+    columns = list(columns)
+    op = '<' if descending else '>'
+    return (f"{columns[0]} {op}= ? AND ({', '.join(columns)}) {op} ({', '.join('?' * len(columns))})")
+
+
+def keyset_params(values: List) -> List:
+    """Parameters for keyset_condition(): the leading value, then the full row value"""
+    return [values[0]] + list(values)
+
+
+def patient_name_subquery(patient_name: str, use_fts: bool = False) -> Tuple[str, List]:
+    """SELECT of the patient_ids whose first, last or full name contains patient_name
+
+    With use_fts every word of three or more characters is looked up in the
+    patients_fts trigram index (restricted to the name columns); shorter
+    words cannot be, so such names fall back to a LIKE scan of patients.
+    """
+    terms = patient_name.split()
+    if use_fts and terms and all(len(term) >= 3 for term in terms):
+        # Quote each term so user input is never parsed as FTS5 syntax
+        match = ' AND '.join('{first_name last_name} : "' + term.replace('"', '""') + '"' for term in terms)
+        return ("""SELECT pn.patient_id FROM patients_fts
+            JOIN patients pn ON pn.id = patients_fts.rowid
+            WHERE patients_fts MATCH ?""", [match])
+    like = f'%{patient_name}%'
+    return ("""SELECT patient_id FROM patients
+            WHERE first_name LIKE ? OR last_name LIKE ?
+            OR (first_name || ' ' || last_name) LIKE ?""", [like, like, like])
+
+
+def select_list(spec: Dict, fields: Optional[List[str]], table_columns: Iterable[str]) -> str:
+    """Columns to SELECT: everything, or just the requested fields
+
+    Raises ValueError for a field that is neither a column of the entity's
+    table nor one of its computed names.
+    """
+    alias = spec['alias']
+    if not fields:
+        return ', '.join([f"{alias}.*"] + [f"{expr} AS {name}" for name, expr in spec['computed'].items()])
+    table_columns = set(table_columns)
+    selected = []
+    for field in fields:
+        if field in spec['computed']:
+            selected.append(f"{spec['computed'][field]} AS {field}")
+        elif field in table_columns:
+            selected.append(f"{alias}.{field}")
+        else:
+            raise ValueError(f"Unknown field for {spec['table']}: {field}")
+    return ', '.join(selected)
+
+
+def build_filtered_query(entity: str, patient_name: str = '', patient_id: str = '',
+                         date: str = '', date_from: str = '', date_to: str = '',
+                         status: str = '', doctor_id: str = '', ward: str = '',
+                         order: Optional[str] = None,
+                         limit: Optional[int] = None, offset: int = 0,
+                         fields: Optional[List[str]] = None, table_columns: Iterable[str] = (),
+                         cursor: Optional[str] = None, with_cursor: bool = False,
+                         use_fts: bool = False) -> Tuple[str, List]:
+    """Build the SELECT (and its parameters) for a filtered list of entity rows
+
+    Every filter is optional and they combine with AND:
+      patient_name  substring of the patient's first, last or full name
+      patient_id    exact patient ID
+      date          a single day (shorthand for date_from = date_to = date)
+      date_from/to  inclusive YYYY-MM-DD range on the entity's date column
+      status        appointment / admission status or bill payment status
+      doctor_id     exact doctor ID
+      ward          exact admission ward
+    order is 'desc' or 'asc'; by default a single-day appointment list
+    reads as a schedule (by time) and anything else uses the entity's
+    natural order (newest first, doctors by specialization and name).
+
+    fields limits the columns returned (validated against table_columns
+    and the entity's computed names). with_cursor adds a _cursor column
+    holding the row's sort key; pass encode_cursor() of the last row's
+    value back as cursor to continue after that row.
+
+    Raises ValueError for an unknown entity, field or order, a filter the
+    entity does not have, or a cursor from a different list.
+    """
+    spec = ENTITY_QUERIES.get(entity)
+    if spec is None:
+        raise ValueError(f"Unknown entity: {entity}")
+    if date:
+        date_from = date_to = date
+
+    where = []
+    params: List = []
+    if patient_id:
+        if not spec['patient_id']:
+            raise ValueError(f"{entity} cannot be filtered by patient_id")
+        where.append(f"{spec['patient_id']} = ?")
+        params.append(patient_id)
+    if patient_name:
+        if not spec['patient_id']:
+            raise ValueError(f"{entity} cannot be filtered by patient_name")
+        subquery, sub_params = patient_name_subquery(patient_name, use_fts)
+        where.append(f"{spec['patient_id']} IN ({subquery})")
+        params.extend(sub_params)
+    if (date_from or date_to) and not spec['date']:
+        raise ValueError(f"{entity} cannot be filtered by date")
+    # Plain comparisons on the stored YYYY-MM-DD text keep the date indexes usable
+    if date_from and date_from == date_to:
+        where.append(f"{spec['date']} = ?")
+        params.append(date_from)
+    else:
+        if date_from:
+            where.append(f"{spec['date']} >= ?")
+            params.append(date_from)
+        if date_to:
+            where.append(f"{spec['date']} <= ?")
+            params.append(date_to)
+    for name, value in (('status', status), ('doctor_id', doctor_id), ('ward', ward)):
+        if not value:
+            continue
+        if not spec[name]:
+            raise ValueError(f"{entity} cannot be filtered by {name}")
+        where.append(f"{spec[name]} = ?")
+        params.append(value)
+
+    if order is None and date_from and date_from == date_to and spec.get('day_order'):
+        order_columns, descending = spec['day_order'], False
+    elif order in (None, 'desc', 'asc'):
+        order_columns, descending = spec['order'], (order or spec['default_order']) == 'desc'
+    else:
+        raise ValueError(f"Unknown order: {order}")
+    # Ties a cursor to the list it was issued for
+    signature = f"{entity}:{','.join(order_columns)}:{'desc' if descending else 'asc'}"
+    if cursor:
+        values = decode_cursor(cursor, signature)
+        if len(values) != len(order_columns):
+            raise ValueError("Invalid cursor")
+        where.append(keyset_condition(order_columns, descending))
+        params.extend(keyset_params(values))
+
+    columns = select_list(spec, fields, table_columns)
+    if with_cursor:
+        columns += f", json_object('s', ?, 'k', json_array({', '.join(order_columns)})) AS _cursor"
+        params.insert(0, signature)
+    direction = ' DESC' if descending else ''
+    sql = f"SELECT {columns}\n            FROM {spec['from']}"
+    if where:
+        sql += "\n            WHERE " + " AND ".join(where)
+    sql += "\n            ORDER BY " + ', '.join(f"{column}{direction}" for column in order_columns)
+    if limit is not None:
+        sql += "\n            LIMIT ? OFFSET ?"
+        params.extend([int(limit), int(offset)])
+    return sql, params
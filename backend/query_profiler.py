@@ -0,0 +1,321 @@
+"""
+Query profiler for Hospital Management System
+Opt-in instrumentation that times every statement run through a pooled
+connection, attributes it to the Database method that issued it, keeps
+per-method latency histograms and logs slow queries with their parameters
+and EXPLAIN QUERY PLAN output
+"""
+import re
+import sqlite3
+import sys
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional, Tuple
+
+from backend.connection_pool import PooledConnection
+from utils.logger import log_warning
+
+# Upper bounds (ms) of the histogram buckets; the last bucket is unbounded
+HISTOGRAM_BOUNDS_MS: Tuple[float, ...] = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+# "SCAN <table>" visits every row of the table (or of one of its indexes);
+# a bounded lookup shows up as "SEARCH <table> USING ... INDEX", and an FTS5
+# MATCH as "SCAN <fts table> VIRTUAL TABLE INDEX n:M..."
+FULL_SCAN = re.compile(r'^SCAN (\w+)\b(?! VIRTUAL TABLE INDEX \d+:M)')
+
+# A FROM-clause subquery computed up front; scanning its result is not a table scan
+MATERIALIZED = re.compile(r'^(?:MATERIALIZE|CO-ROUTINE) (\w+)')
+
+# Tables that are cheap to scan whatever the data size (schema lookups)
+ALWAYS_ALLOWED_SCANS = {'sqlite_master'}
+
+# Statements EXPLAIN QUERY PLAN says something useful about
+_EXPLAINABLE = ('SELECT', 'WITH', 'INSERT', 'UPDATE', 'DELETE', 'REPLACE')
+
+# Method name for statements issued from outside backend/database.py
+OUTSIDE_DATABASE = '<outside Database>'
+
+
+def full_scans(plan: List[str]) -> List[str]:
+    """Tables an EXPLAIN QUERY PLAN reads in full (materialized subqueries excluded)"""
+    materialized = {m.group(1) for m in (MATERIALIZED.match(step) for step in plan) if m}
+    return [m.group(1) for m in (FULL_SCAN.match(step) for step in plan)
+            if m and m.group(1) not in ALWAYS_ALLOWED_SCANS and m.group(1) not in materialized]
+
+
+def _calling_method(database_file: str) -> str:
+    """Name of the outermost Database method on the calling thread's stack"""
+    frame = sys._getframe(2)
+    name = OUTSIDE_DATABASE
+    while frame is not None:
+        if frame.f_code.co_filename == database_file:
+            name = frame.f_code.co_name
+        frame = frame.f_back
+    return name
+
+
+class MethodStats:
+    """Latency histogram and totals for one Database method"""
+
+    __slots__ = ('calls', 'total_ms', 'max_ms', 'buckets', 'full_scans', 'scanned_tables', 'slow')
+
+    def __init__(self):
+        self.calls = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.buckets = [0] * (len(HISTOGRAM_BOUNDS_MS) + 1)
+        self.full_scans = 0
+        self.scanned_tables = set()
+        self.slow = 0
+
+    def add(self, elapsed_ms: float) -> None:
+        self.calls += 1
+        self.total_ms += elapsed_ms
+        if elapsed_ms > self.max_ms:
+            self.max_ms = elapsed_ms
+        for index, bound in enumerate(HISTOGRAM_BOUNDS_MS):
+            if elapsed_ms <= bound:
+                self.buckets[index] += 1
+                return
+        self.buckets[-1] += 1
+
+    def percentile(self, fraction: float) -> float:
+        """Upper bound (ms) of the bucket holding the given fraction of calls"""
+        wanted = fraction * self.calls
+        seen = 0
+        for index, count in enumerate(self.buckets[:-1]):
+            seen += count
+            if count and seen >= wanted:
+                return HISTOGRAM_BOUNDS_MS[index]
+        return round(self.max_ms, 3)
+
+    def as_dict(self) -> Dict[str, Any]:
+        labels = [f"<={bound}ms" for bound in HISTOGRAM_BOUNDS_MS] + [f">{HISTOGRAM_BOUNDS_MS[-1]}ms"]
+        return {
+            'calls': self.calls,
+            'total_ms': round(self.total_ms, 3),
+            'mean_ms': round(self.total_ms / self.calls, 3) if self.calls else 0.0,
+            'max_ms': round(self.max_ms, 3),
+            'p50_ms': self.percentile(0.5),
+            'p95_ms': self.percentile(0.95),
+            'p99_ms': self.percentile(0.99),
+            'slow': self.slow,
+            'full_scans': self.full_scans,
+            'scanned_tables': sorted(self.scanned_tables),
+            'histogram': {label: count for label, count in zip(labels, self.buckets) if count},
+        }
+
+
+class QueryProfiler:
+    """Collects statement timings from ProfiledConnection / ProfiledCursor
+
+    Every statement is timed from execute() until its rows have been
+    fetched and added to the histogram of the Database method that ran it.
+    Each distinct SQL text is explained once; statements whose plan scans
+    a whole table are flagged (and logged the first time they are seen).
+    Statements slower than threshold_ms are logged with their parameters
+    and plan and kept in a bounded list for slow_queries().
+    """
+
+    def __init__(self, threshold_ms: float = 100.0, database_file: Optional[str] = None,
+                 max_slow: int = 200, max_plans: int = 1024):
+        self.threshold_ms = threshold_ms
+        self.database_file = database_file
+        self.max_plans = max_plans
+        self._methods: Dict[str, MethodStats] = {}
+        self._plans: Dict[str, Tuple[List[str], List[str]]] = {}
+        self._slow: "deque[Dict[str, Any]]" = deque(maxlen=max_slow)
+        self._lock = threading.Lock()
+
+    def calling_method(self) -> str:
+        """Database method responsible for the statement being executed"""
+        if self.database_file is None:
+            return OUTSIDE_DATABASE
+        return _calling_method(self.database_file)
+
+    def plan(self, conn: sqlite3.Connection, sql: str, parameters) -> Tuple[List[str], List[str]]:
+        """(EXPLAIN QUERY PLAN lines, fully scanned tables) for sql, explained once per SQL text"""
+        with self._lock:
+            cached = self._plans.get(sql)
+        if cached is not None:
+            return cached
+        plan: List[str] = []
+        if sql.lstrip()[:7].upper().startswith(_EXPLAINABLE) and parameters is not None:
+            try:
+                # A plain cursor, so explaining is not itself profiled
+                cursor = sqlite3.Cursor(conn)
+                plan = [row[3] for row in cursor.execute(f"EXPLAIN QUERY PLAN {sql}", parameters).fetchall()]
+            except sqlite3.Error:
+                plan = []
+        result = (plan, full_scans(plan))
+        with self._lock:
+            if len(self._plans) >= self.max_plans:
+                self._plans.clear()
+            self._plans[sql] = result
+        return result
+
+    def record(self, conn: sqlite3.Connection, method: str, sql: str, parameters, elapsed: float) -> None:
+        """Add one finished statement (elapsed in seconds) to its method's statistics"""
+        elapsed_ms = elapsed * 1000
+        with self._lock:
+            known = sql in self._plans
+        plan, scans = self.plan(conn, sql, parameters)
+        slow = elapsed_ms >= self.threshold_ms
+        with self._lock:
+            stats = self._methods.get(method)
+            if stats is None:
+                stats = self._methods[method] = MethodStats()
+            stats.add(elapsed_ms)
+            if scans:
+                stats.full_scans += 1
+                stats.scanned_tables.update(scans)
+            if slow:
+                stats.slow += 1
+                self._slow.append({
+                    'method': method,
+                    'elapsed_ms': round(elapsed_ms, 3),
+                    'sql': ' '.join(sql.split()),
+                    'parameters': _loggable(parameters),
+                    'plan': plan,
+                    'full_scans': scans,
+                    'at': time.strftime('%Y-%m-%d %H:%M:%S'),
+                })
+        if scans and not known:
+            log_warning(f"Full table scan of {', '.join(scans)} in {method}: {' '.join(sql.split())}")
+        if slow:
+            log_warning(f"Slow query in {method} ({elapsed_ms:.1f} ms): {' '.join(sql.split())} "
+                        f"parameters={_loggable(parameters)!r} plan={plan}")
+
+    def method_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-method latency histograms, slowest total time first"""
+        with self._lock:
+            items = sorted(self._methods.items(), key=lambda item: item[1].total_ms, reverse=True)
+            return {method: stats.as_dict() for method, stats in items}
+
+    def slow_queries(self) -> List[Dict[str, Any]]:
+        """Most recent slow statements, oldest first"""
+        with self._lock:
+            return list(self._slow)
+
+    def reset(self) -> None:
+        """Forget all timings and slow queries (explained plans are kept)"""
+        with self._lock:
+            self._methods.clear()
+            self._slow.clear()
+
+
+def _loggable(parameters) -> Any:
+    """Parameters as JSON-friendly values, with long blobs and text shortened"""
+    if parameters is None:
+        return None
+
+    def short(value):
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            return f"<{len(value)} bytes>"
+        if isinstance(value, str) and len(value) > 200:
+            return value[:200] + '...'
+        return value
+
+    if isinstance(parameters, dict):
+        return {key: short(value) for key, value in parameters.items()}
+    try:
+        return [short(value) for value in parameters]
+    except TypeError:
+        return repr(parameters)
+
+
+class ProfiledCursor(sqlite3.Cursor):
+    """Cursor that reports each statement to its connection's profiler
+
+    A statement is recorded once it is finished with: straight away when
+    it returns no rows, after fetchall() or fetchone(), after a short
+    fetchmany(), or when the cursor runs its next statement.
+    """
+
+    _pending = None
+
+    def _finish(self) -> None:
+        pending = self._pending
+        if pending is not None:
+            self._pending = None
+            method, sql, parameters, elapsed = pending
+            self.connection.profiler.record(self.connection, method, sql, parameters, elapsed)
+
+    def _add(self, elapsed: float) -> None:
+        method, sql, parameters, total = self._pending
+        self._pending = (method, sql, parameters, total + elapsed)
+
+    def execute(self, sql, parameters=()):
+        self._finish()
+        method = self.connection.profiler.calling_method()
+        began = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            self._pending = (method, sql, parameters, time.perf_counter() - began)
+            if self.description is None:
+                self._finish()
+
+    def executemany(self, sql, seq_of_parameters):
+        self._finish()
+        method = self.connection.profiler.calling_method()
+        began = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            # No single parameter set to explain the statement with
+            self._pending = (method, sql, None, time.perf_counter() - began)
+            self._finish()
+
+    def fetchone(self):
+        if self._pending is None:
+            return super().fetchone()
+        began = time.perf_counter()
+        try:
+            return super().fetchone()
+        finally:
+            self._add(time.perf_counter() - began)
+            self._finish()
+
+    def fetchmany(self, size=None):
+        if self._pending is None:
+            return super().fetchmany(self.arraysize if size is None else size)
+        size = self.arraysize if size is None else size
+        began = time.perf_counter()
+        rows = []
+        try:
+            rows = super().fetchmany(size)
+            return rows
+        finally:
+            self._add(time.perf_counter() - began)
+            if len(rows) < size:
+                self._finish()
+
+    def fetchall(self):
+        if self._pending is None:
+            return super().fetchall()
+        began = time.perf_counter()
+        try:
+            return super().fetchall()
+        finally:
+            self._add(time.perf_counter() - began)
+            self._finish()
+
+
+class ProfiledConnection(PooledConnection):
+    """Pooled connection whose cursors (and execute shortcuts) are profiled
+
+    The pool sets .profiler before the connection is first used.
+    """
+
+    profiler: Optional[QueryProfiler] = None
+
+    def cursor(self, factory=ProfiledCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
@@ -0,0 +1,90 @@
+"""
+Compact result rows for Hospital Management System
+Tuple-backed records with read-only dict-style access, produced by a
+sqlite3 row_factory instead of copying every sqlite3.Row into a dict
+"""
+import sqlite3
+from collections import namedtuple
+from functools import lru_cache
+from typing import Any, Callable, Dict, Tuple
+
+# Record class name per list entity (see backend/query_builder.ENTITY_QUERIES)
+RECORD_NAMES: Dict[str, str] = {
+    'patients': 'PatientRecord',
+    'doctors': 'DoctorRecord',
+    'appointments': 'AppointmentRecord',
+    'bills': 'BillRecord',
+    'prescriptions': 'PrescriptionRecord',
+    'admissions': 'AdmissionRecord',
+    'medicines': 'MedicineRecord',
+}
+
+
+class RecordMixin:
+    """Dict-style reads on top of a namedtuple: row['name'], row.get(), row.keys(), dict(row)
+
+    Records are immutable; call _asdict() (or dict(row)) for a copy that
+    can be modified.
+    """
+    __slots__ = ()
+    _columns: Tuple[str, ...] = ()
+    _index: Dict[str, int] = {}
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return tuple.__getitem__(self, self._index[key])
+        return tuple.__getitem__(self, key)
+
+    def __contains__(self, key) -> bool:
+        return key in self._index
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Column value, or default if the row has no such column"""
+        index = self._index.get(key)
+        return default if index is None else tuple.__getitem__(self, index)
+
+    def keys(self) -> Tuple[str, ...]:
+        """Column names, in SELECT order"""
+        return self._columns
+
+    def items(self):
+        """(column, value) pairs, in SELECT order"""
+        return zip(self._columns, self)
+
+    def _asdict(self) -> Dict[str, Any]:
+        return dict(zip(self._columns, self))
+
+
+@lru_cache(maxsize=256)
+def record_class(columns: Tuple[str, ...], name: str = 'Record') -> type:
+    """Record type for a SELECT's column names (one class per name and column list)
+
+    Instances are plain tuples underneath (no per-row __dict__), so a
+    large result costs about one tuple per row instead of one dict.
+    """
+    # rename=True keeps names like "COUNT(*)" usable by key even though
+    # they are not valid attribute names
+    base = namedtuple(name, columns, rename=True)
+    return type(name, (RecordMixin, base), {
+        '__slots__': (),
+        '_columns': columns,
+        '_index': {name: i for i, name in enumerate(columns)},
+    })
+
+
+def record_factory(name: str = 'Record') -> Callable[[sqlite3.Cursor, tuple], RecordMixin]:
+    """sqlite3 row_factory building name records; set it on a cursor of its own
+
+    The record class is looked up once per executed statement (when
+    cursor.description changes), not once per row.
+    """
+    current = {'description': None, 'make': None}
+
+    def factory(cursor: sqlite3.Cursor, row: tuple) -> RecordMixin:
+        description = cursor.description
+        if description is not current['description']:
+            columns = tuple(column[0] for column in description)
+            current['description'] = description
+            current['make'] = record_class(columns, name)._make
+        return current['make'](row)
+    return factory
@@ -0,0 +1,153 @@
+"""
+Single-writer queue for Hospital Management System
+Runs Database write methods on one dedicated thread and commits them in
+groups, so concurrent writers (reception desks, API requests) share one
+commit - and one fsync - instead of each taking the write lock in turn
+"""
+import queue
+import threading
+from concurrent.futures import Future
+from functools import wraps
+from typing import Callable, List, Optional, Tuple
+
+from utils.logger import log_error, log_info
+
+# Queued in place of a write to tell the writer thread to exit
+_STOP = object()
+
+
+class WriteQueue:
+    """Dedicated writer thread with group commit.
+
+    Each write submitted while the thread is busy waits in the queue; the
+    thread then takes up to max_batch of them, runs each inside its own
+    savepoint (Database._savepoint_write) and commits them together, so a
+    failed write is undone without affecting the rest of the group. Futures
+    are resolved only after the group has been committed.
+    """
+
+    def __init__(self, db, max_batch: int = 256):
+        self.db = db
+        self.max_batch = max_batch
+        self._queue: "queue.Queue" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        # Totals for monitoring and benchmarks
+        self.writes = 0
+        self.commits = 0
+
+    def start(self) -> None:
+        """Start the writer thread"""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name='hms-db-writer', daemon=True)
+        self._thread.start()
+        log_info(f"Single-writer mode started (group commit of up to {self.max_batch} writes)")
+
+    def stop(self) -> None:
+        """Finish the queued writes and stop the writer thread"""
+        if self._thread is None:
+            return
+        self._queue.put(_STOP)
+        self._thread.join()
+        self._thread = None
+        log_info(f"Single-writer mode stopped after {self.writes} writes in {self.commits} commits")
+
+    def owns_current_thread(self) -> bool:
+        """True when called from the writer thread itself"""
+        return self._thread is threading.current_thread()
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        """Queue fn(*args, **kwargs) for the writer thread; the future holds its return value"""
+        future: Future = Future()
+        if self._thread is None:
+            future.set_exception(RuntimeError("Writer thread is not running"))
+            return future
+        self._queue.put((future, fn, args, kwargs))
+        return future
+
+    def _take_batch(self) -> Tuple[List[Tuple], bool]:
+        """Block for one write, then take whatever else is already queued (up to max_batch)"""
+        batch = []
+        stop = False
+        item = self._queue.get()
+        while True:
+            if item is _STOP:
+                stop = True
+                break
+            batch.append(item)
+            if len(batch) >= self.max_batch:
+                break
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+        return batch, stop
+
+    def _run(self) -> None:
+        """Writer thread: run queued writes in groups until stopped"""
+        try:
+            while True:
+                batch, stop = self._take_batch()
+                if batch:
+                    self._run_batch(batch)
+                if stop:
+                    break
+        finally:
+            self.db.release_connection()
+
+    def _run_batch(self, batch: List[Tuple]) -> None:
+        """Run one group of writes in a single transaction"""
+        conn = self.db.conn
+        outcomes = []
+        try:
+            if conn.in_transaction:
+                conn.commit()
+            conn.execute("BEGIN IMMEDIATE")
+            # Commits inside the group are deferred; each write gets a savepoint
+            with self.db._deferred_commits():
+                for future, fn, args, kwargs in batch:
+                    if not future.set_running_or_notify_cancel():
+                        continue
+                    try:
+                        result, error = self.db._savepoint_write(fn, *args, **kwargs), None
+                    except Exception as e:
+                        result, error = None, e
+                    outcomes.append((future, result, error))
+            conn.commit()
+            self.commits += 1
+            self.writes += len(outcomes)
+        except Exception as e:
+            log_error("Group commit failed; rolling back the whole group", e)
+            try:
+                conn.rollback()
+            except Exception:
+                pass
+            # Nothing in the group was committed, including writes not yet run
+            outcomes = [(future, None, e) for future, _, _, _ in batch if not future.cancelled()]
+        # Cached lookups of the changed tables expire before any caller sees its result
+        self.db._flush_invalidations()
+        for future, result, error in outcomes:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+
+def queued_write(method: Callable) -> Callable:
+    """Mark a Database method as a write
+
+    In single-writer mode it runs on the writer thread; the calling thread
+    waits for the write's group to commit and gets the method's return
+    value, exactly as when the method runs directly. Inside
+    Database.transaction() it runs on the calling thread, in a savepoint
+    of the open transaction.
+    """
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self._in_transaction():
+            return self._savepoint_write(method, self, *args, **kwargs)
+        writer = self._writer
+        if writer is not None and not writer.owns_current_thread():
+            return writer.submit(method, self, *args, **kwargs).result()
+        return method(self, *args, **kwargs)
+    return wrapper
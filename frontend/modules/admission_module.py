@@ -291,12 +291,6 @@ class AdmissionNotesWindow:
 
         def do_save():
             try:
-                # Prevent multiple active admissions (simple rule)
-                active = self.db.get_active_admission_by_patient(self.patient_id)
-                if active:
-                    messagebox.showwarning("Already Admitted", f"Patient already has an active admission: {active['admission_id']}")
-                    return
-
                 doctor_id = None
                 if doctor_var.get() != "(None)":
                     doctor_id = doctor_var.get().split(" - ", 1)[0].strip()
@@ -317,7 +311,15 @@ class AdmissionNotesWindow:
                     messagebox.showerror("Error", "Admission date is required")
                     return
 
-                ok = self.db.add_admission(data)
+                # Prevent multiple active admissions (simple rule); checking and
+                # inserting in one transaction keeps two desks from both admitting
+                with self.db.transaction():
+                    active = self.db.get_active_admission_by_patient(self.patient_id)
+                    ok = not active and self.db.add_admission(data)
+                if active:
+                    messagebox.showwarning("Already Admitted", f"Patient already has an active admission: {active['admission_id']}")
+                    return
+
                 if ok:
                     log_info(f"Admitted patient {self.patient_id} => {admission_id}")
                     messagebox.showinfo("Success", f"Patient admitted: {admission_id}")
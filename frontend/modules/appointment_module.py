@@ -583,35 +583,12 @@ class AppointmentModule:
         date = self.date_var.get().strip()
         status = self.status_var.get()
         
-        # Determine which filter combination to apply
-        has_patient = patient_name and patient_name != ""
-        has_date = date and date != ""
-        has_status = status != "All"
-        
-        if has_patient and has_date and has_status:
-            # All three filters
-            appointments = self.db.get_appointments_by_patient_name_date_and_status(patient_name, date, status)
-        elif has_patient and has_date:
-            # Patient name and date
-            appointments = self.db.get_appointments_by_patient_name_and_date(patient_name, date)
-        elif has_patient and has_status:
-            # Patient name and status
-            appointments = self.db.get_appointments_by_patient_name_and_status(patient_name, status)
-        elif has_patient:
-            # Patient name only
-            appointments = self.db.get_appointments_by_patient_name(patient_name)
-        elif has_date and has_status:
-            # Date and status
-            appointments = self.db.get_appointments_by_date_and_status(date, status)
-        elif has_date:
-            # Date only
-            appointments = self.db.get_appointments_by_date(date)
-        elif has_status:
-            # Status only
-            appointments = self.db.get_appointments_by_status(status)
-        else:
-            # No filters - show all
-            appointments = self.db.get_all_appointments()
+        # Any combination of filters is a single database query
+        appointments = self.db.find_appointments(
+            patient_name=patient_name,
+            date=date,
+            status=status if status != "All" else ''
+        )
         
         for apt in appointments:
             self.tree.insert('', tk.END, values=(
@@ -585,36 +585,13 @@ class BillingModule:
         date = self.date_var.get().strip()
         status = self.status_var.get()
         
-        # Determine which filter combination to apply
-        has_patient = patient_name and patient_name != ""
-        has_date = date and date != ""
-        has_status = status != "All"
-        
         try:
-            if has_patient and has_date and has_status:
-                # All three filters
-                bills = self.db.get_bills_by_patient_name_date_and_status(patient_name, date, status)
-            elif has_patient and has_date:
-                # Patient name and date
-                bills = self.db.get_bills_by_patient_name_and_date(patient_name, date)
-            elif has_patient and has_status:
-                # Patient name and status
-                bills = self.db.get_bills_by_patient_name_and_status(patient_name, status)
-            elif has_patient:
-                # Patient name only
-                bills = self.db.get_bills_by_patient_name(patient_name)
-            elif has_date and has_status:
-                # Date and status
-                bills = self.db.get_bills_by_date_and_status(date, status)
-            elif has_date:
-                # Date only
-                bills = self.db.get_bills_by_date(date)
-            elif has_status:
-                # Status only
-                bills = self.db.get_bills_by_status(status)
-            else:
-                # No filters - show all
-                bills = self.db.get_all_bills()
+            # Any combination of filters is a single database query
+            bills = self.db.find_bills(
+                patient_name=patient_name,
+                date=date,
+                status=status if status != "All" else ''
+            )
             
             for bill in bills:
                 self.tree.insert('', tk.END, values=(
@@ -622,45 +622,24 @@ class IPDModule:
         self.tree.delete(*self.tree.get_children())
         
         try:
-            # Get all patients to get patient names
-            all_patients = {p['patient_id']: f"{p['first_name']} {p['last_name']}" for p in self.db.get_all_patients()}
-            
-            # Get all admissions
-            all_admissions = []
-            all_patients_list = self.db.get_all_patients()
-            
-            for patient in all_patients_list:
-                patient_admissions = self.db.get_admissions_by_patient(patient['patient_id'])
-                for admission in patient_admissions:
-                    admission['patient_name'] = f"{patient['first_name']} {patient['last_name']}"
-                    admission['patient_id'] = patient['patient_id']
-                    all_admissions.append(admission)
-            
-            # Sort by admission date (newest first)
-            all_admissions.sort(key=lambda x: x.get('admission_date', ''), reverse=True)
-            
-            # Apply status filter
+            # One query: filters, patient/doctor names, ordering and day counts all in SQL
+            filters = {}
             status_filter = self.status_filter.get()
             if status_filter != "All":
-                all_admissions = [a for a in all_admissions if a.get('status', '') == status_filter]
-            
-            # Apply date filter
+                filters['status'] = status_filter
             date_filter = self.date_filter.get().strip()
             if date_filter and date_filter != "YYYY-MM-DD":
                 try:
                     # Validate date format
-                    filter_date = datetime.strptime(date_filter, '%Y-%m-%d').date()
-                    all_admissions = [a for a in all_admissions 
-                                    if a.get('admission_date') and 
-                                    datetime.strptime(a.get('admission_date'), '%Y-%m-%d').date() == filter_date]
+                    datetime.strptime(date_filter, '%Y-%m-%d')
+                    filters['date'] = date_filter
                 except ValueError:
                     # Invalid date format, ignore filter
                     pass
             
-            # Calculate days admitted for active admissions
-            for admission in all_admissions:
+            for admission in self.db.find_admissions(**filters):
                 admission_id = admission.get('admission_id', '')
-                patient_name = admission.get('patient_name', 'Unknown')
+                patient_name = admission.get('patient_name') or 'Unknown'
                 patient_id = admission.get('patient_id', '')
                 admission_date = admission.get('admission_date', '')
                 status = admission.get('status', 'Unknown')
@@ -668,25 +647,14 @@ class IPDModule:
                 bed = admission.get('bed', '') or 'N/A'
                 doctor_name = admission.get('doctor_name', '') or 'N/A'
                 
-                # Calculate days
+                # Days since admission (active) or length of stay (discharged)
                 days = 'N/A'
-                if status == 'Admitted' and admission_date:
-                    try:
-                        adm_date = datetime.strptime(admission_date, '%Y-%m-%d')
-                        days_admitted = (datetime.now() - adm_date).days
+                days_admitted = admission.get('days_admitted')
+                if days_admitted is not None:
+                    if status == 'Admitted':
                         days = f"Day {days_admitted + 1}" if days_admitted >= 0 else "Today"
-                    except:
-                        days = 'N/A'
-                elif status == 'Discharged':
-                    discharge_date = admission.get('discharge_date', '')
-                    if discharge_date and admission_date:
-                        try:
-                            adm_date = datetime.strptime(admission_date, '%Y-%m-%d')
-                            dis_date = datetime.strptime(discharge_date, '%Y-%m-%d')
-                            days_admitted = (dis_date - adm_date).days
-                            days = f"{days_admitted} days"
-                        except:
-                            days = 'N/A'
+                    elif status == 'Discharged':
+                        days = f"{days_admitted} days"
                 
                 # Color code status
                 status_display = status
@@ -831,21 +831,8 @@ class PrescriptionModule:
         date = self.date_var.get().strip()
         
         try:
-            # Determine which filter to apply
-            if patient_name and date:
-                # Filter by both patient name and date
-                prescriptions = self.db.get_prescriptions_by_patient_name(patient_name)
-                # Filter by date in memory (since we don't have a combined method)
-                prescriptions = [p for p in prescriptions if p.get('prescription_date') == date]
-            elif patient_name:
-                # Filter by patient name only
-                prescriptions = self.db.get_prescriptions_by_patient_name(patient_name)
-            elif date:
-                # Filter by date only
-                prescriptions = self.db.get_prescriptions_by_date(date)
-            else:
-                # No filters - show all
-                prescriptions = self.db.get_all_prescriptions()
+            # Name and date filters combine in a single database query
+            prescriptions = self.db.find_prescriptions(patient_name=patient_name, date=date)
             
             # Add each prescription to the treeview
             for pres in prescriptions:
@@ -967,7 +954,7 @@ class PrescriptionModule:
             try:
                 if search_text:
                     # Try to search by patient name first
-                    prescriptions = self.db.get_prescriptions_by_patient_name(search_text)
+                    prescriptions = self.db.find_prescriptions(patient_name=search_text)
                     # If no results, try by date
                     if not prescriptions:
                         prescriptions = self.db.get_prescriptions_by_date(search_text)
@@ -2945,99 +2932,6 @@ class PrescriptionModule:
         # Animate medicines section appearance
         popup.after(250, lambda: AnimationHelper.fade_in_widget(medicines_frame, duration=400))
         
-        # Common medicines list for searchable dropdown
-        default_medicines = [
-            # Painkillers and Anti-inflammatory
-            "Paracetamol", "Ibuprofen", "Aspirin", "Diclofenac", "Naproxen",
-            "Ketorolac", "Piroxicam", "Celecoxib", "Etoricoxib", "Meloxicam",
-            "Tramadol", "Codeine", "Morphine", "Fentanyl", "Oxycodone",
-            "Pregabalin", "Gabapentin", "Carbamazepine",
-            
-            # Antibiotics
-            "Amoxicillin", "Amoxicillin-Clavulanate", "Azithromycin", "Ciprofloxacin",
-            "Levofloxacin", "Cephalexin", "Cefuroxime", "Cefixime", "Ceftriaxone",
-            "Doxycycline", "Tetracycline", "Minocycline", "Clindamycin",
-            "Erythromycin", "Clarithromycin", "Vancomycin", "Metronidazole",
-            "Tinidazole", "Nitrofurantoin", "Trimethoprim-Sulfamethoxazole",
-            
-            # Diabetes Medications
-            "Metformin", "Glipizide", "Gliclazide", "Glibenclamide", "Pioglitazone",
-            "Sitagliptin", "Vildagliptin", "Saxagliptin", "Linagliptin",
-            "Empagliflozin", "Dapagliflozin", "Canagliflozin", "Insulin",
-            "Insulin Glargine", "Insulin Lispro", "Insulin Aspart",
-            
-            # Cardiovascular Medications
-            "Amlodipine", "Atenolol", "Metoprolol", "Propranolol", "Bisoprolol",
-            "Carvedilol", "Losartan", "Valsartan", "Irbesartan", "Telmisartan",
-            "Enalapril", "Lisinopril", "Ramipril", "Captopril", "Furosemide",
-            "Hydrochlorothiazide", "Spironolactone", "Amiloride", "Indapamide",
-            "Atorvastatin", "Simvastatin", "Rosuvastatin", "Pravastatin",
-            "Clopidogrel", "Aspirin", "Warfarin", "Rivaroxaban", "Apixaban",
-            "Dabigatran", "Diltiazem", "Verapamil", "Nifedipine", "Nitroglycerin",
-            "Isosorbide", "Digoxin", "Amiodarone",
-            
-            # Gastrointestinal Medications
-            "Omeprazole", "Pantoprazole", "Esomeprazole", "Lansoprazole",
-            "Rabeprazole", "Ranitidine", "Famotidine", "Cimetidine",
-            "Domperidone", "Metoclopramide", "Ondansetron", "Dimenhydrinate",
-            "Loperamide", "Bismuth Subsalicylate", "Sucralfate", "Aluminum Hydroxide",
-            "Magnesium Hydroxide", "Simethicone", "Lactulose", "Bisacodyl",
-            
-            # Respiratory Medications
-            "Salbutamol", "Ipratropium", "Budesonide", "Fluticasone",
-            "Montelukast", "Theophylline", "Aminophylline", "Acetylcysteine",
-            "Ambroxol", "Bromhexine", "Guaifenesin",
-            
-            # Antihistamines and Allergy
-            "Cetirizine", "Loratadine", "Fexofenadine", "Desloratadine",
-            "Levocetirizine", "Diphenhydramine", "Chlorpheniramine",
-            "Hydroxyzine", "Prednisolone", "Methylprednisolone",
-            
-            # Neurological and Psychiatric
-            "Diazepam", "Alprazolam", "Clonazepam", "Lorazepam", "Sertraline",
-            "Fluoxetine", "Paroxetine", "Escitalopram", "Citalopram",
-            "Amitriptyline", "Imipramine", "Duloxetine", "Venlafaxine",
-            "Quetiapine", "Olanzapine", "Risperidone", "Haloperidol",
-            "Carbidopa-Levodopa", "Pramipexole", "Ropinirole",
-            
-            # Thyroid Medications
-            "Levothyroxine", "Liothyronine", "Propylthiouracil", "Methimazole",
-            "Carbimazole",
-            
-            # Vitamins and Supplements
-            "Calcium Carbonate", "Calcium Citrate", "Vitamin D", "Vitamin D3",
-            "Folic Acid", "Iron Sulfate", "Ferrous Fumarate", "Vitamin B12",
-            "Vitamin C", "Multivitamin", "Omega-3",
-            
-            # Antifungal
-            "Fluconazole", "Itraconazole", "Ketoconazole", "Clotrimazole",
-            "Nystatin", "Terbinafine",
-            
-            # Antiviral
-            "Acyclovir", "Valacyclovir", "Oseltamivir", "Zanamivir",
-            
-            # Eye Medications
-            "Tobramycin Eye Drops", "Ciprofloxacin Eye Drops", "Artificial Tears",
-            "Tropicamide", "Atropine Eye Drops",
-            
-            # Skin Medications
-            "Hydrocortisone Cream", "Betamethasone Cream", "Clobetasol Cream",
-            "Mupirocin", "Fusidic Acid", "Acyclovir Cream",
-            
-            # Other Common Medications
-            "Allopurinol", "Colchicine", "Probenecid", "Baclofen", "Tizanidine",
-            "Tamsulosin", "Finasteride", "Sildenafil", "Tadalafil",
-            "Tamsulosin", "Oxytocyn", "Misoprostol", "Mefenamic Acid",
-            "Progesterone", "Estradiol", "Alendronate", "Ibandronate"
-        ]
-        
-        # Get all medicines from medicines_master table only
-        db_medicines = self.db.get_all_medicines()
-        
-        # Use only medicines from medicines_master, combine with default medicines as fallback
-        common_medicines = list(set(default_medicines + db_medicines))
-        common_medicines.sort()  # Sort alphabetically
-        
         # Medicines list with remove button - better styling
         med_list_frame = tk.Frame(medicines_frame, bg='#ffffff')
         med_list_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 15))
@@ -3610,8 +3504,7 @@ class PrescriptionModule:
                     offset = (page_num - 1) * items_per_page
                     
                     if search_query:
-                        medicines = self.db.search_medicines_master_paginated(search_query, items_per_page, offset)
-                        total_items = self.db.get_search_medicines_count(search_query)
+                        medicines, total_items = self.db.search_medicines_master_page(search_query, items_per_page, offset)
                     else:
                         medicines = self.db.get_all_medicines_master_paginated(items_per_page, offset)
                         total_items = self.db.get_total_medicines_count()
@@ -4302,6 +4195,8 @@ class PrescriptionModule:
                 # Add to tree with purpose
                 tree_item = med_tree.insert('', tk.END, values=(med_name, medicine_type, dosage, frequency, duration, purpose, instructions))
                 medicine_data = {
+                    # Stored row id, so saving only rewrites the lines that changed
+                    'id': item.get('id'),
                     'medicine_name': med_name,
                     'dosage': dosage,
                     'frequency': frequency,
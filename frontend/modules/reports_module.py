@@ -543,14 +543,14 @@ Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 """
         
         for gender, count in sorted(gender_dist.items()):
-            percentage = (count / max(1, len(patients)) * 100)
+            percentage = (count / max(1, stats['total_patients']) * 100)
             report_text += f"    {gender:20s} {count:>6} ({percentage:>5.1f}%)\n"
         
         report_text += f"""
   Age Group Distribution:
 """
         for age_group, count in age_groups.items():
-            percentage = (count / max(1, len(patients)) * 100)
+            percentage = (count / max(1, stats['total_patients']) * 100)
             report_text += f"    {age_group:20s} {count:>6} ({percentage:>5.1f}%)\n"
         
         report_text += f"""
@@ -574,38 +574,24 @@ Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
         """Generate detailed financial report"""
         from_date, to_date = self.get_date_filter()
         
-        bills = self.db.get_all_bills()
-        
+        # Totals come from the daily_stats rollup; only the listed pending bills are read
         if from_date and to_date:
-            filtered_bills = []
-            for b in bills:
-                bill_date = self.parse_date_safe(b.get('bill_date'))
-                if bill_date and from_date <= bill_date <= to_date:
-                    filtered_bills.append(b)
-            bills = filtered_bills
+            date_from, date_to = from_date.strftime('%Y-%m-%d'), to_date.strftime('%Y-%m-%d')
+            summary = self.db.get_financial_summary(date_from, date_to)
+            pending_bills = self.db.find_bills(status='Pending', date_from=date_from, date_to=date_to, limit=20)
             date_range_text = f"Date Range: {from_date} to {to_date}"
         else:
+            summary = self.db.get_financial_summary()
+            pending_bills = self.db.find_bills(status='Pending', limit=20)
             date_range_text = "All Time"
         
-        paid_bills = [b for b in bills if b['payment_status'] == 'Paid']
-        pending_bills = [b for b in bills if b['payment_status'] == 'Pending']
-        
-        total_revenue = sum(float(b.get('total_amount', 0)) for b in paid_bills)
-        total_pending = sum(float(b.get('total_amount', 0)) for b in pending_bills)
-        total_amount = sum(float(b.get('total_amount', 0)) for b in bills)
-        
-        # Daily revenue breakdown
-        daily_revenue = {}
-        for bill in paid_bills:
-            date = bill.get('bill_date', 'Unknown')
-            amount = float(bill.get('total_amount', 0))
-            daily_revenue[date] = daily_revenue.get(date, 0) + amount
-        
-        # Payment method breakdown
-        payment_methods = {}
-        for bill in bills:
-            method = bill.get('payment_method', 'Unknown')
-            payment_methods[method] = payment_methods.get(method, 0) + 1
+        total_revenue = summary['total_revenue']
+        total_pending = summary['total_pending']
+        total_amount = summary['total_amount']
+        total_bills = summary['total_bills']
+        pending_count = summary['pending_bills']
+        daily_revenue = summary['daily_revenue']
+        payment_methods = summary['payment_methods']
         
         report_text = f"""
 ╔══════════════════════════════════════════════════════════════════════════════╗
@@ -622,11 +608,11 @@ Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
   Total Revenue (Paid):         ${total_revenue:>20,.2f}
   Pending Amount:               ${total_pending:>20,.2f}
   Total Bill Amount:            ${total_amount:>20,.2f}
-  Total Bills:                  {len(bills):>10}
-  Paid Bills:                   {len(paid_bills):>10}
-  Pending Bills:                {len(pending_bills):>10}
+  Total Bills:                  {total_bills:>10}
+  Paid Bills:                   {summary['paid_bills']:>10}
+  Pending Bills:                {pending_count:>10}
   Collection Rate:              {(total_revenue / max(1, total_amount) * 100):>19.1f}%
-  Average Bill Amount:          ${(total_amount / max(1, len(bills))):>20,.2f}
+  Average Bill Amount:          ${(total_amount / max(1, total_bills)):>20,.2f}
 
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
@@ -646,7 +632,7 @@ Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 """
         
         for method, count in sorted(payment_methods.items()):
-            percentage = (count / max(1, len(bills)) * 100)
+            percentage = (count / max(1, total_bills) * 100)
             report_text += f"  {method:20s} {count:>6} ({percentage:>5.1f}%)\n"
         
         report_text += f"""
@@ -659,14 +645,14 @@ Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
         if pending_bills:
             report_text += "  Bill ID          Patient Name              Amount      Date\n"
             report_text += "  " + "-" * 70 + "\n"
-            for bill in pending_bills[:20]:  # Show top 20
-                patient_name = bill.get('patient_name', 'Unknown')
+            for bill in pending_bills:  # Show top 20
+                patient_name = bill.get('patient_name') or 'Unknown'
                 bill_id = bill.get('bill_id', 'N/A')
                 amount = float(bill.get('total_amount', 0))
                 date = bill.get('bill_date', 'N/A')
                 report_text += f"  {bill_id:15s} {patient_name[:25]:25s} ${amount:>10,.2f}  {date}\n"
-            if len(pending_bills) > 20:
-                report_text += f"\n  ... and {len(pending_bills) - 20} more pending bills\n"
+            if pending_count > len(pending_bills):
+                report_text += f"\n  ... and {pending_count - len(pending_bills)} more pending bills\n"
         else:
             report_text += "  No pending bills\n"
         
@@ -678,66 +664,22 @@ Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
         """Generate patient statistics report"""
         from_date, to_date = self.get_date_filter()
         
-        patients = self.db.get_all_patients()
-        appointments = self.db.get_all_appointments()
-        prescriptions = self.db.get_all_prescriptions()
-        
+        # Counts and the top patients are aggregated in SQL
         if from_date and to_date:
-            filtered_appointments = []
-            for a in appointments:
-                appt_date = self.parse_date_safe(a.get('appointment_date'))
-                if appt_date and from_date <= appt_date <= to_date:
-                    filtered_appointments.append(a)
-            appointments = filtered_appointments
-            
-            filtered_prescriptions = []
-            for p in prescriptions:
-                presc_date = self.parse_date_safe(p.get('prescription_date'))
-                if presc_date and from_date <= presc_date <= to_date:
-                    filtered_prescriptions.append(p)
-            prescriptions = filtered_prescriptions
+            summary = self.db.get_patient_demographics(from_date.strftime('%Y-%m-%d'), to_date.strftime('%Y-%m-%d'))
             date_range_text = f"Date Range: {from_date} to {to_date}"
         else:
+            summary = self.db.get_patient_demographics()
             date_range_text = "All Time"
         
-        # Patient statistics
-        gender_dist = {}
-        age_groups = {'0-18': 0, '19-35': 0, '36-50': 0, '51-65': 0, '65+': 0}
-        blood_group_dist = {}
-        
-        # Patient visit frequency
-        patient_visits = {}
-        for appointment in appointments:
-            patient_id = appointment.get('patient_id')
-            if patient_id:
-                patient_visits[patient_id] = patient_visits.get(patient_id, 0) + 1
-        
-        for patient in patients:
-            gender = patient.get('gender', 'Unknown')
-            gender_dist[gender] = gender_dist.get(gender, 0) + 1
-            
-            blood_group = patient.get('blood_group', 'Unknown')
-            if blood_group:
-                blood_group_dist[blood_group] = blood_group_dist.get(blood_group, 0) + 1
-            
-            try:
-                dob = datetime.strptime(patient.get('date_of_birth', '2000-01-01'), '%Y-%m-%d')
-                age = (datetime.now() - dob).days // 365
-                if age <= 18:
-                    age_groups['0-18'] += 1
-                elif age <= 35:
-                    age_groups['19-35'] += 1
-                elif age <= 50:
-                    age_groups['36-50'] += 1
-                elif age <= 65:
-                    age_groups['51-65'] += 1
-                else:
-                    age_groups['65+'] += 1
-            except:
-                pass
+        total_patients = summary['total_patients']
+        total_appointments = summary['total_appointments']
+        gender_dist = summary['gender_distribution']
+        age_groups = summary['age_groups']
+        blood_group_dist = summary['blood_group_distribution']
         
         # Most frequent patients
-        top_patients = sorted(patient_visits.items(), key=lambda x: x[1], reverse=True)[:10]
+        top_patients = summary['top_patients']
         
         report_text = f"""
 ╔══════════════════════════════════════════════════════════════════════════════╗
@@ -751,10 +693,10 @@ Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 
 📊 PATIENT STATISTICS
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-  Total Patients:                {len(patients):>10}
-  Total Appointments:            {len(appointments):>10}
-  Total Prescriptions:           {len(prescriptions):>10}
-  Average Appointments/Patient:  {(len(appointments) / max(1, len(patients))):>20.1f}
+  Total Patients:                {total_patients:>10}
+  Total Appointments:            {total_appointments:>10}
+  Total Prescriptions:           {summary['total_prescriptions']:>10}
+  Average Appointments/Patient:  {(total_appointments / max(1, total_patients)):>20.1f}
 
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
@@ -763,7 +705,7 @@ Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 """
         
         for gender, count in sorted(gender_dist.items()):
-            percentage = (count / max(1, len(patients)) * 100)
+            percentage = (count / max(1, total_patients) * 100)
             report_text += f"  {gender:20s} {count:>6} ({percentage:>5.1f}%)\n"
         
         report_text += f"""
@@ -774,7 +716,7 @@ Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 """
         
         for age_group, count in age_groups.items():
-            percentage = (count / max(1, len(patients)) * 100)
+            percentage = (count / max(1, total_patients) * 100)
             report_text += f"  {age_group:20s} {count:>6} ({percentage:>5.1f}%)\n"
         
         if blood_group_dist:
@@ -785,7 +727,7 @@ Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 """
             for bg, count in sorted(blood_group_dist.items()):
-                percentage = (count / max(1, len(patients)) * 100)
+                percentage = (count / max(1, total_patients) * 100)
                 report_text += f"  {bg:20s} {count:>6} ({percentage:>5.1f}%)\n"
         
         if top_patients:
@@ -796,10 +738,8 @@ Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
   Patient ID         Visits
 """
-            for patient_id, visits in top_patients:
-                patient = next((p for p in patients if p.get('patient_id') == patient_id), None)
-                name = f"{patient.get('first_name', '')} {patient.get('last_name', '')}" if patient else patient_id
-                report_text += f"  {patient_id:15s} {visits:>6}\n"
+            for patient in top_patients:
+                report_text += f"  {patient['patient_id']:15s} {patient['visits']:>6}\n"
         
         report_text += "\n" + "═" * 75 + "\n"
         
@@ -809,43 +749,17 @@ Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
         """Generate doctor performance report"""
         from_date, to_date = self.get_date_filter()
         
-        doctors = self.db.get_all_doctors()
-        appointments = self.db.get_all_appointments()
-        
+        # Per-doctor counts are aggregated in SQL, busiest doctor first
         if from_date and to_date:
-            filtered_appointments = []
-            for a in appointments:
-                appt_date = self.parse_date_safe(a.get('appointment_date'))
-                if appt_date and from_date <= appt_date <= to_date:
-                    filtered_appointments.append(a)
-            appointments = filtered_appointments
+            summary = self.db.get_doctor_performance(from_date.strftime('%Y-%m-%d'), to_date.strftime('%Y-%m-%d'))
             date_range_text = f"Date Range: {from_date} to {to_date}"
         else:
+            summary = self.db.get_doctor_performance()
             date_range_text = "All Time"
         
-        # Doctor statistics
-        doctor_stats = {}
-        specialization_dist = {}
-        
-        for doctor in doctors:
-            doctor_id = doctor.get('doctor_id')
-            specialization = doctor.get('specialization', 'Unknown')
-            specialization_dist[specialization] = specialization_dist.get(specialization, 0) + 1
-            
-            doctor_appointments = [a for a in appointments if a.get('doctor_id') == doctor_id]
-            completed = sum(1 for a in doctor_appointments if a.get('status') == 'Completed')
-            
-            doctor_stats[doctor_id] = {
-                'name': f"{doctor.get('first_name', '')} {doctor.get('last_name', '')}",
-                'specialization': specialization,
-                'total': len(doctor_appointments),
-                'completed': completed,
-                'scheduled': sum(1 for a in doctor_appointments if a.get('status') == 'Scheduled'),
-                'cancelled': sum(1 for a in doctor_appointments if a.get('status') == 'Cancelled')
-            }
-        
-        # Sort by total appointments
-        sorted_doctors = sorted(doctor_stats.items(), key=lambda x: x[1]['total'], reverse=True)
+        total_doctors = summary['total_doctors']
+        total_appointments = summary['total_appointments']
+        specialization_dist = summary['specialization_distribution']
         
         report_text = f"""
 ╔══════════════════════════════════════════════════════════════════════════════╗
@@ -859,9 +773,9 @@ Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 
 👨‍⚕️ DOCTOR PERFORMANCE SUMMARY
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-  Total Doctors:                 {len(doctors):>10}
-  Total Appointments:             {len(appointments):>10}
-  Average Appointments/Doctor:    {(len(appointments) / max(1, len(doctors))):>20.1f}
+  Total Doctors:                 {total_doctors:>10}
+  Total Appointments:             {total_appointments:>10}
+  Average Appointments/Doctor:    {(total_appointments / max(1, total_doctors)):>20.1f}
 
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
@@ -870,7 +784,7 @@ Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 """
         
         for spec, count in sorted(specialization_dist.items(), key=lambda x: x[1], reverse=True):
-            percentage = (count / max(1, len(doctors)) * 100)
+            percentage = (count / max(1, total_doctors) * 100)
             report_text += f"  {spec:30s} {count:>6} ({percentage:>5.1f}%)\n"
         
         report_text += f"""
@@ -881,11 +795,10 @@ Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
   Doctor Name                    Specialization          Total  Completed  Scheduled  Cancelled  Rate
 """
         
-        for doctor_id, stats in sorted_doctors:
-            completion_rate = (stats['completed'] / max(1, stats['total']) * 100)
+        for stats in summary['doctor_performance']:
             name = stats['name'][:28]
             spec = stats['specialization'][:22]
-            report_text += f"  {name:28s} {spec:22s} {stats['total']:>5}  {stats['completed']:>9}  {stats['scheduled']:>9}  {stats['cancelled']:>9}  {completion_rate:>5.1f}%\n"
+            report_text += f"  {name:28s} {spec:22s} {stats['total']:>5}  {stats['completed']:>9}  {stats['scheduled']:>9}  {stats['cancelled']:>9}  {stats['completion_rate']:>5.1f}%\n"
         
         report_text += "\n" + "═" * 75 + "\n"
         
@@ -895,32 +808,17 @@ Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
         """Generate appointment statistics report"""
         from_date, to_date = self.get_date_filter()
         
-        appointments = self.db.get_all_appointments()
-        
+        # Counts come from the daily_stats rollup, not the appointment rows
         if from_date and to_date:
-            filtered_appointments = []
-            for a in appointments:
-                appt_date = self.parse_date_safe(a.get('appointment_date'))
-                if appt_date and from_date <= appt_date <= to_date:
-                    filtered_appointments.append(a)
-            appointments = filtered_appointments
+            summary = self.db.get_appointment_summary(from_date.strftime('%Y-%m-%d'), to_date.strftime('%Y-%m-%d'))
             date_range_text = f"Date Range: {from_date} to {to_date}"
         else:
+            summary = self.db.get_appointment_summary()
             date_range_text = "All Time"
         
-        # Status breakdown
-        status_dist = {}
-        daily_appointments = {}
-        
-        for appointment in appointments:
-            status = appointment.get('status', 'Unknown')
-            status_dist[status] = status_dist.get(status, 0) + 1
-            
-            date = appointment.get('appointment_date', 'Unknown')
-            daily_appointments[date] = daily_appointments.get(date, 0) + 1
-        
-        # Top 10 busiest days
-        sorted_daily = sorted(daily_appointments.items(), key=lambda x: x[1], reverse=True)[:10]
+        total_appointments = summary['total']
+        status_dist = summary['status_distribution']
+        sorted_daily = summary['busiest_days']
         
         report_text = f"""
 ╔══════════════════════════════════════════════════════════════════════════════╗
@@ -934,8 +832,8 @@ Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 
 📅 APPOINTMENT STATISTICS
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-  Total Appointments:            {len(appointments):>10}
-  Average Appointments/Day:      {(len(appointments) / max(1, len(set(a.get('appointment_date') for a in appointments)))):>20.1f}
+  Total Appointments:            {total_appointments:>10}
+  Average Appointments/Day:      {(total_appointments / max(1, summary['days'])):>20.1f}
 
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
@@ -944,7 +842,7 @@ Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 """
         
         for status, count in sorted(status_dist.items(), key=lambda x: x[1], reverse=True):
-            percentage = (count / max(1, len(appointments)) * 100)
+            percentage = (count / max(1, total_appointments) * 100)
             report_text += f"  {status:20s} {count:>6} ({percentage:>5.1f}%)\n"
         
         if sorted_daily:
@@ -1197,7 +1095,7 @@ operational metrics for the selected time period.
         doc.build(story)
     
     def export_to_csv(self, filename: str):
-        """Export report data to CSV"""
+        """Export report data to CSV (rows are streamed from the database, not loaded up front)"""
         report_type = self.report_type_var.get()
         
         with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
@@ -1211,7 +1109,7 @@ operational metrics for the selected time period.
             
             # Export data based on report type
             if report_type == 'financial':
-                bills = self.db.get_all_bills()
+                bills = self.db.iter_bills()
                 writer.writerow(['Bill ID', 'Patient Name', 'Amount', 'Status', 'Date'])
                 for bill in bills:
                     writer.writerow([
@@ -1222,7 +1120,7 @@ operational metrics for the selected time period.
                         bill.get('bill_date', '')
                     ])
             elif report_type == 'patient':
-                patients = self.db.get_all_patients()
+                patients = self.db.iter_patients()
                 writer.writerow(['Patient ID', 'Name', 'Gender', 'Date of Birth', 'Phone', 'Email'])
                 for patient in patients:
                     writer.writerow([
@@ -1234,7 +1132,7 @@ operational metrics for the selected time period.
                         patient.get('email', '')
                     ])
             elif report_type == 'doctor':
-                doctors = self.db.get_all_doctors()
+                doctors = self.db.iter_doctors()
                 writer.writerow(['Doctor ID', 'Name', 'Specialization', 'Phone', 'Email'])
                 for doctor in doctors:
                     writer.writerow([
@@ -1245,7 +1143,7 @@ operational metrics for the selected time period.
                         doctor.get('email', '')
                     ])
             elif report_type == 'appointment':
-                appointments = self.db.get_all_appointments()
+                appointments = self.db.iter_appointments()
                 writer.writerow(['Appointment ID', 'Patient', 'Doctor', 'Date', 'Time', 'Status'])
                 for appointment in appointments:
                     writer.writerow([
@@ -0,0 +1,131 @@
+"""
+Benchmark the doctor performance report against the old per-doctor scan
+Usage: python benchmark_doctor_report.py [--doctors 500] [--appointments 2000000] [--runs 5]
+
+Seeds doctors and appointments spread over three years, then times the
+old report code (every doctor and appointment loaded, and the appointment
+list filtered once per doctor) against Database.get_doctor_performance
+for all time and for one month, and checks that both give the same
+per-doctor counts. The old code is quadratic, so it runs --legacy-runs
+times only (0 skips it).
+"""
+import argparse
+import logging
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Backend imports
+from backend.database import Database
+
+SPECIALIZATIONS = ["Cardiology", "Dermatology", "General Medicine", "Neurology", "Orthopedics",
+                   "Pediatrics", "Gynecology", "ENT", "Oncology", "Psychiatry"]
+STATUSES = ["Scheduled", "Completed", "Completed", "Completed", "Cancelled", "No Show"]
+FIRST_DAY = date(2023, 1, 1)
+DAYS = 3 * 365
+MONTH = ('2024-06-01', '2024-06-30')
+
+
+def seed(db: Database, doctors: int, appointments: int) -> None:
+    """Insert synthetic doctors and appointments (daily_stats is kept by its triggers)"""
+    rng = random.Random(42)
+    db.cursor.executemany("""
+        INSERT INTO doctors (doctor_id, first_name, last_name, specialization, qualification, phone)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """, ((f"DOC-{i:05d}", f"First{i}", f"Last{i}", SPECIALIZATIONS[i % len(SPECIALIZATIONS)],
+           'MBBS, MD', f"98{i:08d}") for i in range(doctors)))
+    db.cursor.executemany("""
+        INSERT INTO appointments (appointment_id, patient_id, doctor_id, appointment_date, appointment_time, status)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """, ((f"APT-{i:09d}", f"PAT-{rng.randrange(100000):08d}", f"DOC-{rng.randrange(doctors):05d}",
+           (FIRST_DAY + timedelta(days=rng.randrange(DAYS))).isoformat(),
+           f"{rng.randrange(9, 18):02d}:00", rng.choice(STATUSES)) for i in range(appointments)))
+    db.conn.commit()
+    db.cursor.execute("ANALYZE")
+
+
+def legacy_report(db: Database, from_date=None, to_date=None) -> dict:
+    """Old get_doctor_report: per-doctor list comprehension over every appointment"""
+    doctors = db.get_all_doctors()
+    appointments = db.get_all_appointments()
+    if from_date and to_date:
+        appointments = [a for a in appointments if from_date <= a.get('appointment_date', '') <= to_date]
+    doctor_stats = {}
+    for doctor in doctors:
+        doctor_id = doctor.get('doctor_id')
+        doctor_appointments = [a for a in appointments if a.get('doctor_id') == doctor_id]
+        doctor_stats[doctor_id] = (
+            len(doctor_appointments),
+            sum(1 for a in doctor_appointments if a.get('status') == 'Completed'),
+            sum(1 for a in doctor_appointments if a.get('status') == 'Scheduled'),
+            sum(1 for a in doctor_appointments if a.get('status') == 'Cancelled'),
+        )
+    return doctor_stats
+
+
+def per_doctor(summary: dict) -> dict:
+    """get_doctor_performance counts in legacy_report's shape"""
+    return {d['doctor_id']: (d['total'], d['completed'], d['scheduled'], d['cancelled'])
+            for d in summary['doctor_performance']}
+
+
+def timed(fn, runs: int):
+    """(median ms, last result)"""
+    samples = []
+    result = None
+    for _ in range(runs):
+        began = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - began) * 1000)
+    return statistics.median(samples), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the doctor performance report")
+    parser.add_argument('--doctors', type=int, default=500)
+    parser.add_argument('--appointments', type=int, default=2000000)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--legacy-runs', type=int, default=1,
+                        help="runs of the old report code per case (0 skips it)")
+    args = parser.parse_args()
+
+    logging.getLogger('HospitalSystem').setLevel(logging.WARNING)
+    workdir = tempfile.mkdtemp(prefix='hms_doctor_report_')
+    try:
+        db = Database(os.path.join(workdir, 'hospital.db'), cache_size=0)
+        print(f"Seeding {args.doctors} doctors and {args.appointments} appointments...")
+        began = time.perf_counter()
+        seed(db, args.doctors, args.appointments)
+        print(f"Seeded in {time.perf_counter() - began:.1f}s")
+
+        print("=" * 64)
+        print(f"{'case':<24}{'old ms':>14}{'new ms':>14}{'speedup':>12}")
+        print("-" * 64)
+        mismatches = 0
+        for label, dates in (('all time', ()), ('one month', MONTH)):
+            new_ms, summary = timed(lambda: db.get_doctor_performance(*dates), args.runs)
+            if args.legacy_runs:
+                old_ms, legacy = timed(lambda: legacy_report(db, *dates), args.legacy_runs)
+                if legacy != per_doctor(summary):
+                    mismatches += 1
+                print(f"{label:<24}{old_ms:>14.1f}{new_ms:>14.1f}{old_ms / max(new_ms, 0.001):>11.0f}x")
+            else:
+                print(f"{label:<24}{'-':>14}{new_ms:>14.1f}{'-':>12}")
+        print("=" * 64)
+        if args.legacy_runs:
+            print("Per-doctor counts match" if not mismatches else f"{mismatches} case(s) differ from the old report")
+        db.close()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Benchmark medicine search and autocomplete against a large catalogue
+Usage: python benchmark_medicine_search.py [--medicines 200000] [--runs 20]
+
+Times every keystroke of a few typed medicine names (the prescription form
+calls autocomplete on each one) plus the paginated search used by the
+medicine browser, next to the old LIKE '%q%' page + count queries.
+"""
+import argparse
+import logging
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Backend imports
+from backend.database import Database
+
+SYLLABLES = ["para", "ceta", "mol", "amox", "cilin", "azi", "thro", "my", "cin", "met", "for",
+             "min", "pan", "to", "pra", "zole", "ator", "va", "sta", "tin", "cef", "ix", "ime",
+             "lev", "o", "flox", "a", "dol", "pre", "ni", "so", "lone", "xa", "gli", "be", "ride"]
+FORMS = ["Tablet", "Capsule", "Syrup", "Injection", "Cream", "Drops"]
+
+# Names typed one character at a time into the prescription form
+TYPED = ["paracetamol", "amoxicillin", "zzzq"]
+
+LEGACY_PAGE_SQL = """
+    SELECT medicine_name, company_name, dosage_mg, dosage_form, category, description
+    FROM medicines_master WHERE medicine_name LIKE ?
+    ORDER BY medicine_name ASC LIMIT 50 OFFSET 0
+"""
+LEGACY_COUNT_SQL = "SELECT COUNT(*) FROM medicines_master WHERE medicine_name LIKE ?"
+
+
+def seed_medicines(db: Database, count: int) -> None:
+    """Insert synthetic catalogue rows (the FTS triggers index them as they go in)"""
+    rng = random.Random(7)
+    rows = []
+    for i in range(count):
+        name = ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))).capitalize()
+        if i % 50 == 0:
+            name = rng.choice(("Paracetamol", "Amoxicillin", "Azithromycin")) + f" {rng.choice(FORMS)}"
+        rows.append((name, f"Pharma {i % 900}", f"{rng.choice((5, 10, 250, 500, 650))}mg",
+                     rng.choice(FORMS), "General", "General medication"))
+    db.cursor.executemany("""
+        INSERT OR IGNORE INTO medicines_master
+        (medicine_name, company_name, dosage_mg, dosage_form, category, description)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """, rows)
+    db.conn.commit()
+
+
+def timed_ms(fn, runs: int) -> float:
+    """Median milliseconds over runs"""
+    samples = []
+    for _ in range(runs):
+        began = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - began) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark medicine search and autocomplete")
+    parser.add_argument('--medicines', type=int, default=200000)
+    parser.add_argument('--runs', type=int, default=20)
+    args = parser.parse_args()
+
+    logging.getLogger('HospitalSystem').setLevel(logging.WARNING)
+    workdir = tempfile.mkdtemp(prefix='hms_medsearch_')
+    try:
+        db = Database(os.path.join(workdir, 'hospital.db'))
+        print(f"Seeding {args.medicines} medicines...")
+        began = time.perf_counter()
+        seed_medicines(db, args.medicines)
+        print(f"Seeded {db.get_total_medicines_count()} rows in {time.perf_counter() - began:.1f}s")
+
+        def legacy(q):
+            db.cursor.execute(LEGACY_PAGE_SQL, (f'%{q}%',)).fetchall()
+            db.cursor.execute(LEGACY_COUNT_SQL, (f'%{q}%',)).fetchone()
+
+        print("=" * 78)
+        print(f"{'keystroke':<14}{'autocomplete ms':>17}{'search page ms':>16}{'LIKE page+count':>17}{'matches':>12}")
+        print("-" * 78)
+        worst = 0.0
+        for word in TYPED:
+            for n in range(1, len(word) + 1):
+                q = word[:n]
+                auto_ms = timed_ms(lambda: db.autocomplete_medicines(q, 20), args.runs)
+                page_ms = timed_ms(lambda: db.search_medicines_master_page(q, 50, 0), args.runs)
+                like_ms = timed_ms(lambda: legacy(q), max(1, args.runs // 4))
+                worst = max(worst, auto_ms)
+                print(f"{q:<14}{auto_ms:>17.2f}{page_ms:>16.2f}{like_ms:>17.2f}"
+                      f"{db.search_medicines_master_page(q, 50, 0)[1]:>12}")
+        print("=" * 78)
+        print(f"Slowest autocomplete keystroke: {worst:.2f} ms")
+        db.close()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
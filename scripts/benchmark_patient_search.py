@@ -0,0 +1,99 @@
+"""
+Benchmark patient search: FTS5 trigram index vs the old LIKE scan
+Usage: python benchmark_patient_search.py [--patients 500000] [--runs 20]
+"""
+import argparse
+import logging
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Backend imports
+from backend.database import Database
+
+FIRST_NAMES = ["John", "Jane", "Michael", "Sarah", "David", "Emily", "Robert", "Jessica",
+               "William", "Ashley", "Priya", "Rahul", "Anita", "Vikram", "Sunita", "Arjun"]
+LAST_NAMES = ["Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis",
+              "Sharma", "Patel", "Singh", "Kumar", "Gupta", "Reddy", "Nair", "Iyer"]
+
+# Typical keystroke states: partial names, full names, ID and phone fragments
+QUERIES = ["joh", "john", "sharma", "pat", "vikram sin", "PAT-0004", "98765", "gmail", "zzzq"]
+
+LEGACY_SQL = """
+    SELECT * FROM patients
+    WHERE patient_id LIKE ? OR first_name LIKE ? OR last_name LIKE ?
+    OR phone LIKE ? OR email LIKE ?
+    ORDER BY created_at DESC
+"""
+
+
+def seed_patients(db: Database, count: int) -> None:
+    """Insert synthetic patients (the FTS triggers index them as they go in)"""
+    rng = random.Random(42)
+    rows = []
+    for i in range(count):
+        first = rng.choice(FIRST_NAMES) + rng.choice(("", "a", "i", "o"))
+        last = rng.choice(LAST_NAMES)
+        rows.append((f"PAT-{i:08d}", first, last, "1980-01-01", rng.choice(("Male", "Female")),
+                     f"9{rng.randrange(10 ** 9):09d}", f"{first.lower()}.{last.lower()}{i}@example.com"))
+    db.cursor.executemany("""
+        INSERT INTO patients (patient_id, first_name, last_name, date_of_birth, gender, phone, email)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    """, rows)
+    db.conn.commit()
+
+
+def timed_ms(fn, runs: int) -> float:
+    """Median milliseconds over runs"""
+    samples = []
+    for _ in range(runs):
+        began = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - began) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark FTS5 vs LIKE patient search")
+    parser.add_argument('--patients', type=int, default=500000)
+    parser.add_argument('--runs', type=int, default=20)
+    parser.add_argument('--limit', type=int, default=100)
+    args = parser.parse_args()
+
+    logging.getLogger('HospitalSystem').setLevel(logging.WARNING)
+    workdir = tempfile.mkdtemp(prefix='hms_search_')
+    try:
+        db = Database(os.path.join(workdir, 'hospital.db'))
+        print(f"Seeding {args.patients} patients...")
+        began = time.perf_counter()
+        seed_patients(db, args.patients)
+        print(f"Seeded in {time.perf_counter() - began:.1f}s")
+
+        def legacy(q):
+            like = f'%{q}%'
+            db.cursor.execute(LEGACY_SQL, (like, like, like, like, like))
+            return db.cursor.fetchall()
+
+        print("=" * 72)
+        print(f"{'query':<14}{'LIKE ms':>12}{'FTS5 ms':>12}{'speedup':>10}{'LIKE rows':>12}{'FTS rows':>12}")
+        print("-" * 72)
+        for q in QUERIES:
+            like_ms = timed_ms(lambda: legacy(q), max(1, args.runs // 4))
+            fts_ms = timed_ms(lambda: db.search_patients(q, args.limit), args.runs)
+            print(f"{q:<14}{like_ms:>12.2f}{fts_ms:>12.2f}{like_ms / max(fts_ms, 1e-6):>9.1f}x"
+                  f"{len(legacy(q)):>12}{len(db.search_patients(q, args.limit)):>12}")
+        print("=" * 72)
+        db.close()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
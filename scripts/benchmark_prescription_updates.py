@@ -0,0 +1,166 @@
+"""
+Benchmark prescription edits: item diffing vs delete-all/reinsert
+Usage: python benchmark_prescription_updates.py [--prescriptions 2000] [--items 15] [--edits 2000]
+
+Each edit changes the dosage of one line of a random prescription and
+saves the whole prescription, the way the edit dialog does. Compares
+update_prescription() (which now rewrites only the changed items) with
+the old code, which deleted every item and re-inserted each one with its
+own execute(). Reports the median and total time per edit, the rows
+written per edit (sqlite3 total_changes) and how many item ids changed,
+then checks that reordering edits (inserting at the top or in the middle,
+delete then append, lists with and without item ids) read back in
+submitted order and write only the rows they change.
+"""
+import argparse
+import logging
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Backend imports
+from backend.database import Database
+
+
+def seed(db: Database, prescriptions: int, items: int) -> None:
+    """One patient and doctor, and prescriptions with items lines each"""
+    db.add_patient({'patient_id': 'PAT-BENCH', 'first_name': 'Bench', 'last_name': 'Mark',
+                    'date_of_birth': '1980-01-01', 'gender': 'Female'})
+    db.add_doctor({'doctor_id': 'DOC-BENCH', 'first_name': 'Bench', 'last_name': 'Doctor',
+                   'specialization': 'General'})
+    with db.transaction():
+        for i in range(prescriptions):
+            db.add_prescription(
+                {'prescription_id': f"RX-{i:07d}", 'patient_id': 'PAT-BENCH', 'doctor_id': 'DOC-BENCH',
+                 'prescription_date': '2025-01-15', 'diagnosis': 'Benchmark'},
+                [{'medicine_name': f"Medicine {n}", 'dosage': '500mg', 'frequency': 'Twice daily',
+                  'duration': '7 days', 'instructions': 'After food', 'purpose': 'Benchmark'}
+                 for n in range(items)])
+
+
+def legacy_update(db: Database, prescription_id: str, data: dict, items: list) -> bool:
+    """Old update_prescription: delete every item, re-insert one execute() at a time, one commit"""
+    with db.transaction():
+        # Header update plus deleting all items (an empty item list)
+        db.update_prescription(prescription_id, data, [])
+        for item in items:
+            db.cursor.execute("""
+                INSERT INTO prescription_items (prescription_id, medicine_name,
+                dosage, frequency, duration, instructions, purpose)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, (prescription_id, item['medicine_name'], item['dosage'], item['frequency'],
+                  item['duration'], item.get('instructions', ''), item.get('purpose', '')))
+    return True
+
+
+def run(db: Database, update, prescriptions: int, edits: int, seed_value: int):
+    """(median ms, total s, rows written per edit, item ids changed per edit)"""
+    rng = random.Random(seed_value)
+    samples = []
+    written = 0
+    churned = 0
+    for _ in range(edits):
+        prescription_id = f"RX-{rng.randrange(prescriptions):07d}"
+        data = db.get_prescription_by_id(prescription_id)
+        items = db.get_prescription_items(prescription_id)
+        before = {item['id'] for item in items}
+        line = rng.randrange(len(items))
+        items[line]['dosage'] = f"{rng.randrange(1, 20) * 50}mg"
+        changes = db.conn.total_changes
+        began = time.perf_counter()
+        update(prescription_id, data, items)
+        samples.append((time.perf_counter() - began) * 1000)
+        written += db.conn.total_changes - changes
+        churned += len(before - {item['id'] for item in db.get_prescription_items(prescription_id)})
+    return statistics.median(samples), sum(samples) / 1000, written / edits, churned / edits
+
+
+def line(name: str) -> dict:
+    """One prescription item named name"""
+    return {'medicine_name': name, 'dosage': '500mg', 'frequency': 'Twice daily', 'duration': '7 days'}
+
+
+# (label, stored lines, edit, rows written) - the edit maps the stored items
+# (with ids) to the submitted list
+ORDER_CASES = [
+    ('insert at top', 'ABC', lambda a, b, c: [line('X'), a, b, c], 1),
+    ('insert in middle', 'ABC', lambda a, b, c: [a, line('X'), b, c], 1),
+    ('delete at top', 'ABC', lambda a, b, c: [b, c], 1),
+    ('drop middle, append', 'ABC', lambda a, b, c: [a, c, line('X')], 2),
+    ('delete then append', 'ABC', lambda a, b, c: [b, c, line('X')], 2),
+    ('move last to top', 'ABCDE', lambda a, b, c, d, e: [e, a, b, c, d], 1),
+    ('swap', 'ABC', lambda a, b, c: [c, b, a], 2),
+    ('no ids, insert at top', 'ABC', lambda a, b, c: [line('X'), line('A'), line('B'), line('C')], 1),
+    ('no ids, prepend', 'A', lambda a: [line('Z'), line('A')], 1),
+    ('no ids, reorder', 'ABC', lambda a, b, c: [line('C'), line('A'), line('B')], 1),
+    ('no ids, new dosage', 'ABC', lambda a, b, c: [line('A'), dict(line('B'), dosage='250mg'), line('C')], 1),
+    ('unchanged', 'ABC', lambda a, b, c: [a, b, c], 0),
+]
+
+
+def check_edits(db: Database) -> int:
+    """Run ORDER_CASES through update_prescription; return how many misorder or over-write"""
+    failures = 0
+    for number, (label, stored, edit, expected) in enumerate(ORDER_CASES):
+        prescription_id = f"RX-ORDER-{number}"
+        data = {'prescription_id': prescription_id, 'patient_id': 'PAT-BENCH', 'doctor_id': 'DOC-BENCH',
+                'prescription_date': '2025-01-15'}
+        db.add_prescription(data, [line(name) for name in stored])
+        items = edit(*db.get_prescription_items(prescription_id))
+        changes = db.conn.total_changes
+        db.update_prescription(prescription_id, data, items)
+        # One of the changes is the prescription row itself
+        written = db.conn.total_changes - changes - 1
+        submitted = [item['medicine_name'] for item in items]
+        read_back = [item['medicine_name'] for item in db.get_prescription_items(prescription_id)]
+        if read_back != submitted or written > expected:
+            failures += 1
+            print(f"  {label}: submitted {''.join(submitted)}, read back {''.join(read_back)}, "
+                  f"{written} item row(s) written (expected {expected})")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark prescription item updates")
+    parser.add_argument('--prescriptions', type=int, default=2000)
+    parser.add_argument('--items', type=int, default=15, help="lines per prescription")
+    parser.add_argument('--edits', type=int, default=2000)
+    args = parser.parse_args()
+
+    logging.getLogger('HospitalSystem').setLevel(logging.WARNING)
+    workdir = tempfile.mkdtemp(prefix='hms_rx_updates_')
+    try:
+        print(f"{args.edits} single-dose edits on {args.prescriptions} prescriptions of {args.items} lines")
+        print("=" * 76)
+        print(f"{'update':<26}{'median ms':>12}{'total s':>10}{'rows/edit':>14}{'ids lost/edit':>14}")
+        print("-" * 76)
+        cases = (
+            ('delete + reinsert (old)', lambda db: lambda *a: legacy_update(db, *a)),
+            ('item diff', lambda db: db.update_prescription),
+        )
+        for number, (label, make_update) in enumerate(cases):
+            db = Database(os.path.join(workdir, f"case{number}.db"))
+            seed(db, args.prescriptions, args.items)
+            ms, total, rows, churn = run(db, make_update(db), args.prescriptions, args.edits, 42)
+            print(f"{label:<26}{ms:>12.3f}{total:>10.2f}{rows:>14.1f}{churn:>14.1f}")
+            db.close()
+        print("=" * 76)
+        db = Database(os.path.join(workdir, 'order.db'))
+        seed(db, 0, 0)
+        failures = check_edits(db)
+        db.close()
+        print("Item order preserved with minimal writes" if not failures
+              else f"{failures} edit(s) out of order or writing too many rows")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Benchmark record tuples against the old list-of-dicts result path
+Usage: python benchmark_records.py [--patients 200000] [--medicines 200000] [--runs 5]
+
+For get_all_patients and get_all_medicines_master, compares the rows the
+methods now return (record tuples built by a row_factory) with the old
+code: sqlite3.Row copied into a dict per row, and for medicines a dict of
+str()-coerced fields per row. Reports the median time, the size of the
+per-row containers (dicts vs tuples) and the total Python memory held by
+the result list including the column values (tracemalloc).
+"""
+import argparse
+import logging
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Backend imports
+from backend.database import Database
+
+MEDICINE_COLUMNS = ('medicine_name', 'company_name', 'dosage_mg', 'dosage_form', 'category', 'description')
+
+
+def seed(db: Database, patients: int, medicines: int) -> None:
+    """Insert synthetic patients and catalogue rows"""
+    db.cursor.executemany("""
+        INSERT INTO patients (patient_id, first_name, last_name, date_of_birth, gender, phone, email, address)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    """, ((f"PAT-{i:08d}", f"First{i % 997}", f"Last{i % 991}", "1980-01-01",
+           ("Male", "Female")[i % 2], f"9{i:09d}", f"patient{i}@example.com", f"{i} Main Street")
+          for i in range(patients)))
+    db.cursor.executemany("""
+        INSERT OR IGNORE INTO medicines_master
+        (medicine_name, company_name, dosage_mg, dosage_form, category, description)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """, ((f"Medicine {i:07d}", f"Pharma {i % 900}", f"{(i % 8 + 1) * 50}mg", "Tablet",
+           "General", "General medication") for i in range(medicines)))
+    db.conn.commit()
+
+
+def legacy_patients(db: Database):
+    """Old get_all_patients: one dict per sqlite3.Row"""
+    db.cursor.execute("SELECT * FROM patients ORDER BY created_at DESC")
+    return [dict(row) for row in db.cursor.fetchall()]
+
+
+def legacy_medicines(db: Database):
+    """Old get_all_medicines_master: str()-coerced dict per row"""
+    db.cursor.execute(f"""
+        SELECT {', '.join(MEDICINE_COLUMNS)} FROM medicines_master ORDER BY medicine_name ASC
+    """)
+    return [{key: str(row[key]) if row[key] is not None else '' for key in MEDICINE_COLUMNS}
+            for row in db.cursor.fetchall()]
+
+
+def measure(fn, runs: int):
+    """(median ms, MB of row containers, MB held by the returned list)"""
+    samples = []
+    for _ in range(runs):
+        began = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - began) * 1000)
+    tracemalloc.start()
+    result = fn()
+    held = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    rows = sum(sys.getsizeof(row) for row in result)
+    del result
+    return statistics.median(samples), rows / (1024 * 1024), held / (1024 * 1024)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark record tuples vs dict rows")
+    parser.add_argument('--patients', type=int, default=200000)
+    parser.add_argument('--medicines', type=int, default=200000)
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    logging.getLogger('HospitalSystem').setLevel(logging.WARNING)
+    workdir = tempfile.mkdtemp(prefix='hms_records_')
+    try:
+        db = Database(os.path.join(workdir, 'hospital.db'))
+        print(f"Seeding {args.patients} patients and {args.medicines} medicines...")
+        seed(db, args.patients, args.medicines)
+
+        cases = [
+            ('patients: dict rows', lambda: legacy_patients(db)),
+            ('patients: records', db.get_all_patients),
+            ('medicines: str dicts', lambda: legacy_medicines(db)),
+            ('medicines: records', db.get_all_medicines_master),
+        ]
+        print("=" * 76)
+        print(f"{'result':<24}{'rows':>10}{'median ms':>14}{'row objs MB':>14}{'held MB':>14}")
+        print("-" * 76)
+        for label, fn in cases:
+            ms, rows_mb, held_mb = measure(fn, args.runs)
+            print(f"{label:<24}{len(fn()):>10}{ms:>14.1f}{rows_mb:>14.1f}{held_mb:>14.1f}")
+        print("=" * 76)
+        db.close()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
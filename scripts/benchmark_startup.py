@@ -0,0 +1,74 @@
+"""
+Benchmark Database() construction time
+Usage: python benchmark_startup.py [--runs N]
+
+  cold:      Database() on a brand new file (schema, migrations, seed data)
+  warm:      Database() on an up-to-date file (single user_version check)
+  full pass: the pre-versioning startup work (every CREATE IF NOT EXISTS,
+             PRAGMA table_info check, default user and medicine checks),
+             which used to run on every start
+"""
+import argparse
+import logging
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Backend imports
+from backend.database import Database
+from backend.migrations import apply_migrations
+
+
+def timed(fn) -> float:
+    """Milliseconds taken by fn()"""
+    began = time.perf_counter()
+    fn()
+    return (time.perf_counter() - began) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Database.__init__ cold and warm")
+    parser.add_argument('--runs', type=int, default=20)
+    args = parser.parse_args()
+
+    logging.getLogger('HospitalSystem').setLevel(logging.WARNING)
+    workdir = tempfile.mkdtemp(prefix='hms_startup_')
+    try:
+        cold = []
+        for i in range(args.runs):
+            path = os.path.join(workdir, f'cold_{i}.db')
+            cold.append(timed(lambda: Database(path).close()))
+
+        path = os.path.join(workdir, 'warm.db')
+        Database(path).close()
+        warm = [timed(lambda: Database(path).close()) for _ in range(args.runs)]
+
+        def full_pass():
+            db = Database(path)
+            db._create_base_schema()
+            apply_migrations(db.conn)
+            db.close()
+        full = [timed(full_pass) for _ in range(args.runs)]
+
+        print("=" * 60)
+        print(f"{'Database()':<28}{'median ms':>14}{'p95 ms':>14}")
+        print("-" * 60)
+        for label, samples in (('cold (new file)', cold),
+                               ('warm (up to date)', warm),
+                               ('warm + full schema pass', full)):
+            samples.sort()
+            p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+            print(f"{label:<28}{statistics.median(samples):>14.2f}{p95:>14.2f}")
+        print("=" * 60)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+Benchmark read/write throughput of each storage profile (see backend/connection_pool.py)
+Usage: python benchmark_storage_profiles.py [--source hospital.db] [--patients N] [--seconds S]
+
+Each profile runs against its own copy of the same source database:
+  - writes: sequential add_appointment() calls, one commit each
+  - mixed: reader threads (get_appointments_by_date / get_patient_by_id) running
+    while one writer thread keeps adding bills
+"""
+import argparse
+import os
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Backend imports
+from backend.database import Database
+from backend.connection_pool import STORAGE_PROFILES
+
+# Utils imports
+from utils.helpers import generate_id
+
+
+def seed_database(path: str, patients: int, doctors: int, appointments: int, bills: int) -> None:
+    """Create a database with the app schema and synthetic rows"""
+    Database(path, storage_profile='legacy').close()
+    conn = sqlite3.connect(path)
+    start = date.today() - timedelta(days=3 * 365)
+    conn.executemany(
+        "INSERT INTO patients (patient_id, first_name, last_name, date_of_birth, gender, phone) "
+        "VALUES (?, ?, ?, ?, ?, ?)",
+        ((f"PAT-{i:08d}", f"First{i}", f"Last{i % 5000}", "1980-01-01",
+          random.choice(("Male", "Female")), f"98{i:08d}") for i in range(patients))
+    )
+    conn.executemany(
+        "INSERT INTO doctors (doctor_id, first_name, last_name, specialization, consultation_fee) "
+        "VALUES (?, ?, ?, ?, ?)",
+        ((f"DOC-{i:05d}", f"Doc{i}", f"Tor{i}", "General", 500) for i in range(doctors))
+    )
+    conn.executemany(
+        "INSERT INTO appointments (appointment_id, patient_id, doctor_id, appointment_date, "
+        "appointment_time, status) VALUES (?, ?, ?, ?, ?, ?)",
+        ((f"APT-{i:09d}", f"PAT-{random.randrange(patients):08d}", f"DOC-{random.randrange(doctors):05d}",
+          (start + timedelta(days=random.randrange(3 * 365))).isoformat(), "10:00",
+          random.choice(("Scheduled", "Completed", "Cancelled"))) for i in range(appointments))
+    )
+    conn.executemany(
+        "INSERT INTO billing (bill_id, patient_id, bill_date, total_amount, payment_status) "
+        "VALUES (?, ?, ?, ?, ?)",
+        ((f"BILL-{i:09d}", f"PAT-{random.randrange(patients):08d}",
+          (start + timedelta(days=random.randrange(3 * 365))).isoformat(), 750.0,
+          random.choice(("Paid", "Pending"))) for i in range(bills))
+    )
+    conn.commit()
+    conn.close()
+
+
+def bench_writes(db: Database, count: int) -> float:
+    """Sequential single-row inserts per second"""
+    began = time.perf_counter()
+    for _ in range(count):
+        db.add_appointment({
+            'appointment_id': generate_id('APT'),
+            'patient_id': 'PAT-00000001',
+            'doctor_id': 'DOC-00001',
+            'appointment_date': date.today().isoformat(),
+            'appointment_time': '11:00',
+        })
+    return count / (time.perf_counter() - began)
+
+
+def bench_mixed(db: Database, patients: int, readers: int, seconds: float) -> dict:
+    """Reads/sec and writes/sec with concurrent readers and one writer"""
+    stop = threading.Event()
+    reads = [0] * readers
+    writes = [0]
+    days = [(date.today() - timedelta(days=d)).isoformat() for d in range(3 * 365)]
+
+    def reader(slot):
+        while not stop.is_set():
+            db.get_appointments_by_date(random.choice(days))
+            db.get_patient_by_id(f"PAT-{random.randrange(patients):08d}")
+            reads[slot] += 2
+        db.release_connection()
+
+    def writer():
+        while not stop.is_set():
+            db.add_bill({
+                'bill_id': generate_id('BILL'),
+                'patient_id': 'PAT-00000001',
+                'bill_date': date.today().isoformat(),
+                'total_amount': 100.0,
+            })
+            writes[0] += 1
+        db.release_connection()
+
+    threads = [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+    threads.append(threading.Thread(target=writer))
+    for t in threads:
+        t.start()
+    time.sleep(seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+    return {'reads_per_sec': sum(reads) / seconds, 'writes_per_sec': writes[0] / seconds}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark SQLite storage profiles")
+    parser.add_argument('--source', help="Existing hospital.db to copy (default: generate one)")
+    parser.add_argument('--patients', type=int, default=50000)
+    parser.add_argument('--appointments', type=int, default=200000)
+    parser.add_argument('--bills', type=int, default=100000)
+    parser.add_argument('--writes', type=int, default=500, help="Sequential inserts per profile")
+    parser.add_argument('--readers', type=int, default=4)
+    parser.add_argument('--seconds', type=float, default=5.0, help="Duration of the mixed phase")
+    parser.add_argument('--profiles', nargs='*', default=list(STORAGE_PROFILES))
+    args = parser.parse_args()
+
+    # The benchmark logs thousands of inserts; keep the console readable
+    import logging
+    logging.getLogger('HospitalSystem').setLevel(logging.WARNING)
+
+    workdir = tempfile.mkdtemp(prefix='hms_bench_')
+    try:
+        source = os.path.join(workdir, 'source.db')
+        if args.source:
+            shutil.copy2(args.source, source)
+        else:
+            print(f"Generating {args.patients} patients, {args.appointments} appointments, "
+                  f"{args.bills} bills...")
+            seed_database(source, args.patients, 50, args.appointments, args.bills)
+
+        print("=" * 72)
+        print(f"{'Profile':<14}{'inserts/s':>14}{'mixed reads/s':>18}{'mixed writes/s':>18}")
+        print("-" * 72)
+        for profile in args.profiles:
+            path = os.path.join(workdir, f'{profile}.db')
+            shutil.copy2(source, path)
+            db = Database(path, storage_profile=profile)
+            inserts = bench_writes(db, args.writes)
+            mixed = bench_mixed(db, args.patients, args.readers, args.seconds)
+            db.close()
+            print(f"{profile:<14}{inserts:>14.0f}{mixed['reads_per_sec']:>18.0f}"
+                  f"{mixed['writes_per_sec']:>18.0f}")
+        print("=" * 72)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,351 @@
+"""
+Benchmark suite for the Database layer at hospital scale
+Usage: python benchmark_suite.py [--scales 10000 100000 1000000] [--runs 5] [--output results.json]
+                                 [--data-dir DIR] [--baseline previous.json] [--cases search find]
+
+Builds one database per scale (number of patients) with proportional
+doctors, appointments, prescriptions, bills and admissions (see RATIOS),
+generated from --seed over a fixed date range, so the same arguments always
+produce the same data. Each case from cases() (searches, filters, statistics,
+reports, backups) runs once to warm up and then --runs times; the median,
+min, max and mean times and the number of rows returned are written as
+JSON together with the SQLite/Python versions and the row counts.
+
+Building the 1M database takes about ten minutes; pass --data-dir to keep
+the generated databases and reuse them on the next run. With --baseline
+the medians are compared to an earlier results file and cases slower by
+more than --tolerance are listed (exit status 1), so a regression shows
+up as a failing run.
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Backend imports
+from backend.database import Database
+
+# Bump whenever the generated data changes, so old databases in --data-dir are not reused
+# and results from different data are never compared
+DATASET_VERSION = 1
+
+# Rows per patient for each table; doctors scale separately (see doctor_count)
+RATIOS = {'appointments': 3, 'prescriptions': 1, 'bills': 1.5, 'admissions': 0.05}
+ITEMS_PER_PRESCRIPTION = 2
+
+# All generated dates fall in this range; queries use fixed dates inside it
+FIRST_DAY = date(2023, 1, 1)
+DAYS = 3 * 365
+
+# Rows generated and inserted per bulk_add() call
+CHUNK = 50000
+
+FIRST_NAMES = ["John", "Jane", "Michael", "Sarah", "David", "Emily", "Robert", "Jessica", "William",
+               "Ashley", "James", "Amanda", "Priya", "Rahul", "Anita", "Vikram", "Meera", "Arjun"]
+LAST_NAMES = ["Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Patel",
+              "Sharma", "Singh", "Kumar", "Gupta", "Reddy", "Nair", "Iyer", "Rao", "Das"]
+SPECIALIZATIONS = ["Cardiology", "Dermatology", "General Medicine", "Neurology", "Orthopedics",
+                   "Pediatrics", "Gynecology", "ENT", "Oncology", "Psychiatry"]
+BLOOD_GROUPS = ["A+", "A-", "B+", "B-", "AB+", "AB-", "O+", "O-"]
+GENDERS = ["Male", "Female", "Other"]
+APPOINTMENT_STATUSES = ["Scheduled", "Completed", "Completed", "Completed", "Cancelled", "No Show"]
+PAYMENT_STATUSES = ["Paid", "Paid", "Paid", "Pending", "Partial"]
+PAYMENT_METHODS = ["Cash", "Credit Card", "Debit Card", "Insurance", "Online Payment"]
+WARDS = ["General", "ICU", "Maternity", "Pediatric", "Surgical"]
+MEDICINES = ["Paracetamol", "Ibuprofen", "Amoxicillin", "Azithromycin", "Cetirizine", "Omeprazole",
+             "Metformin", "Amlodipine", "Atorvastatin", "Pantoprazole"]
+
+
+def doctor_count(patients: int) -> int:
+    """One doctor per 2000 patients, at least 20"""
+    return max(20, patients // 2000)
+
+
+def day(rng: random.Random) -> str:
+    """A random date inside the generated range"""
+    return (FIRST_DAY + timedelta(days=rng.randrange(DAYS))).isoformat()
+
+
+def patient_id(n: int) -> str:
+    return f"PAT-{n:08d}"
+
+
+def doctor_id(n: int) -> str:
+    return f"DOC-{n:05d}"
+
+
+def bulk_load(db: Database, entity: str, total: int, make_row) -> None:
+    """Insert total rows of entity in CHUNK-sized bulk_add() calls"""
+    for start in range(0, total, CHUNK):
+        rows = [make_row(n) for n in range(start, min(start + CHUNK, total))]
+        result = db.bulk_add(entity, rows)
+        if result['errors']:
+            raise RuntimeError(f"{entity}: {result['errors'][0]}")
+
+
+def build(path: str, patients: int, seed: int) -> None:
+    """Generate the database for one scale"""
+    rng = random.Random(seed)
+    db = Database(path, cache_size=0)
+    doctors = doctor_count(patients)
+    counts = {table: int(patients * ratio) for table, ratio in RATIOS.items()}
+
+    bulk_load(db, 'doctors', doctors, lambda n: {
+        'doctor_id': doctor_id(n), 'first_name': rng.choice(FIRST_NAMES), 'last_name': rng.choice(LAST_NAMES),
+        'specialization': SPECIALIZATIONS[n % len(SPECIALIZATIONS)], 'qualification': 'MBBS, MD',
+        'phone': f"98{n:08d}", 'consultation_fee': rng.choice((300, 500, 800, 1000)),
+    })
+    bulk_load(db, 'patients', patients, lambda n: {
+        'patient_id': patient_id(n), 'first_name': rng.choice(FIRST_NAMES), 'last_name': rng.choice(LAST_NAMES),
+        'date_of_birth': (date(1940, 1, 1) + timedelta(days=rng.randrange(30000))).isoformat(),
+        'gender': rng.choice(GENDERS), 'phone': f"9{n:09d}", 'email': f"patient{n}@example.com",
+        'address': f"{n} Main Street", 'blood_group': rng.choice(BLOOD_GROUPS), 'allergies': 'None',
+    })
+    bulk_load(db, 'appointments', counts['appointments'], lambda n: {
+        'appointment_id': f"APT-{n:09d}", 'patient_id': patient_id(rng.randrange(patients)),
+        'doctor_id': doctor_id(rng.randrange(doctors)), 'appointment_date': day(rng),
+        'appointment_time': f"{rng.randrange(9, 18):02d}:{rng.choice(('00', '30'))}",
+        'status': rng.choice(APPOINTMENT_STATUSES), 'notes': 'Follow-up visit',
+    })
+    bulk_load(db, 'bills', counts['bills'], lambda n: {
+        'bill_id': f"BILL-{n:09d}", 'patient_id': patient_id(rng.randrange(patients)), 'bill_date': day(rng),
+        'consultation_fee': 500, 'medicine_cost': rng.randrange(0, 2000), 'other_charges': 0,
+        'total_amount': float(rng.randrange(500, 2500)), 'payment_status': rng.choice(PAYMENT_STATUSES),
+        'payment_method': rng.choice(PAYMENT_METHODS),
+    })
+
+    def admission(n):
+        admitted = day(rng)
+        row = {'admission_id': f"ADM-{n:08d}", 'patient_id': patient_id(rng.randrange(patients)),
+               'doctor_id': doctor_id(rng.randrange(doctors)), 'admission_date': admitted,
+               'expected_days': rng.randrange(1, 10), 'ward': rng.choice(WARDS), 'bed': str(n % 40 + 1),
+               'reason': 'Observation'}
+        # Most admissions in the range have ended; the latest ones are still open
+        if admitted < (FIRST_DAY + timedelta(days=DAYS - 30)).isoformat():
+            row['status'] = 'Discharged'
+        return row
+    bulk_load(db, 'admissions', counts['admissions'], admission)
+
+    # No bulk method for prescriptions: header and items go in with executemany
+    for start in range(0, counts['prescriptions'], CHUNK):
+        numbers = range(start, min(start + CHUNK, counts['prescriptions']))
+        with db.transaction():
+            db.cursor.executemany("""
+                INSERT INTO prescriptions (prescription_id, patient_id, doctor_id, prescription_date, diagnosis)
+                VALUES (?, ?, ?, ?, ?)
+            """, [(f"PRE-{n:09d}", patient_id(rng.randrange(patients)), doctor_id(rng.randrange(doctors)),
+                   day(rng), 'Fever') for n in numbers])
+            db.cursor.executemany("""
+                INSERT INTO prescription_items (prescription_id, medicine_name, dosage, frequency, duration)
+                VALUES (?, ?, '500mg', 'Twice daily', '5 days')
+            """, [(f"PRE-{n:09d}", rng.choice(MEDICINES)) for n in numbers for _ in range(ITEMS_PER_PRESCRIPTION)])
+    db.conn.execute("ANALYZE")
+    db.conn.commit()
+    db.close()
+
+
+def row_counts(path: str) -> dict:
+    """Rows per generated table"""
+    conn = sqlite3.connect(path)
+    try:
+        return {table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                for table in ('patients', 'doctors', 'appointments', 'prescriptions', 'prescription_items',
+                              'billing', 'admissions')}
+    finally:
+        conn.close()
+
+
+def cases(db: Database, patients: int, workdir: str) -> list:
+    """(group, name, callable) for every timed operation at this scale"""
+    some_patient = patient_id(patients // 2)
+    mid = (FIRST_DAY + timedelta(days=DAYS // 2)).isoformat()
+    month = mid[:7]
+    week_end = (FIRST_DAY + timedelta(days=DAYS // 2 + 6)).isoformat()
+    backup = os.path.join(workdir, 'backup.db')
+    return [
+        ('search', 'get_patient_by_id', lambda: db.get_patient_by_id(some_patient)),
+        ('search', 'search_patients name', lambda: db.search_patients('Sharma')),
+        ('search', 'search_patients phone', lambda: db.search_patients(f"9{patients // 2:09d}")),
+        ('search', 'autocomplete_medicines', lambda: db.autocomplete_medicines('para', 20)),
+        ('filter', 'find_page patients', lambda: db.find_page('patients', limit=50)),
+        ('filter', 'find_appointments date', lambda: db.find_appointments(date=mid)),
+        ('filter', 'find_appointments doctor week',
+         lambda: db.find_appointments(doctor_id=doctor_id(1), date_from=mid, date_to=week_end)),
+        ('filter', 'find_page appointments status',
+         lambda: db.find_page('appointments', {'status': 'Scheduled'}, limit=50)),
+        ('filter', 'get_prescriptions_by_patient', lambda: db.get_prescriptions_by_patient(some_patient)),
+        ('filter', 'find_bills date pending', lambda: db.find_bills(date=mid, status='Pending')),
+        ('filter', 'find_admissions admitted', lambda: db.find_admissions(status='Admitted', limit=100)),
+        ('filter', 'get_all_active_admissions', lambda: db.get_all_active_admissions()),
+        ('statistics', 'get_statistics all', lambda: db.get_statistics()),
+        ('statistics', 'get_daily_statistics', lambda: db.get_daily_statistics(mid)),
+        ('statistics', 'get_monthly_statistics', lambda: db.get_monthly_statistics(month)),
+        ('statistics', 'get_date_range_statistics', lambda: db.get_date_range_statistics(mid, week_end)),
+        ('report', 'get_appointment_summary month',
+         lambda: db.get_appointment_summary(f"{month}-01", f"{month}-31")),
+        ('report', 'get_financial_summary month',
+         lambda: db.get_financial_summary(f"{month}-01", f"{month}-31")),
+        ('report', 'get_financial_summary all', lambda: db.get_financial_summary()),
+        ('report', 'find_bills pending page', lambda: db.find_bills(status='Pending', limit=50)),
+        ('report', 'get_patient_demographics month',
+         lambda: db.get_patient_demographics(f"{month}-01", f"{month}-31")),
+        ('report', 'get_doctor_performance month',
+         lambda: db.get_doctor_performance(f"{month}-01", f"{month}-31")),
+        ('report', 'get_all_bills', lambda: db.get_all_bills()),
+        ('report', 'get_recent_activities', lambda: db.get_recent_activities(10)),
+        ('backup', 'create_local_backup', lambda: db.create_local_backup(backup)),
+    ]
+
+
+def rows_returned(result):
+    """Rows in a method's result: a list, or the page of a (rows, cursor) pair"""
+    if isinstance(result, tuple) and result and isinstance(result[0], list):
+        return len(result[0])
+    if isinstance(result, list):
+        return len(result)
+    return None
+
+
+def time_case(fn, runs: int) -> dict:
+    """Warm up once, then time runs calls"""
+    result = fn()
+    samples = []
+    for _ in range(runs):
+        began = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - began) * 1000)
+    return {
+        'median_ms': round(statistics.median(samples), 3),
+        'min_ms': round(min(samples), 3),
+        'max_ms': round(max(samples), 3),
+        'mean_ms': round(statistics.mean(samples), 3),
+        'rows': rows_returned(result),
+    }
+
+
+def run_scale(patients: int, args, data_dir: str) -> dict:
+    """Build (or reuse) the database for one scale and time every case on it"""
+    path = os.path.join(data_dir, f"hms_bench_{patients}_seed{args.seed}_v{DATASET_VERSION}.db")
+    build_s = None
+    if not os.path.exists(path):
+        print(f"Building {patients} patient database...", flush=True)
+        began = time.perf_counter()
+        try:
+            build(path, patients, args.seed)
+        except BaseException:
+            for suffix in ('', '-wal', '-shm'):
+                if os.path.exists(path + suffix):
+                    os.remove(path + suffix)
+            raise
+        build_s = round(time.perf_counter() - began, 1)
+    # Cache off: cases measure the database, not repeat lookups served from memory
+    db = Database(path, cache_size=0)
+    workdir = tempfile.mkdtemp(prefix='hms_suite_')
+    results = {}
+    try:
+        for group, name, fn in cases(db, patients, workdir):
+            if args.cases and not any(pattern in f"{group} {name}" for pattern in args.cases):
+                continue
+            results[name] = dict(time_case(fn, args.runs), group=group)
+            timing = results[name]
+            print(f"  {group:<11}{name:<36}{timing['median_ms']:>12.3f}{timing['min_ms']:>12.3f}"
+                  f"{'' if timing['rows'] is None else timing['rows']:>10}", flush=True)
+    finally:
+        db.close()
+        shutil.rmtree(workdir, ignore_errors=True)
+    return {'build_s': build_s, 'rows': row_counts(path), 'cases': results}
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """Cases whose median is more than tolerance slower than in baseline"""
+    if baseline.get('dataset_version') != results['dataset_version'] or baseline.get('seed') != results['seed']:
+        print("Baseline was generated from different data; comparison skipped")
+        return []
+    regressions = []
+    for scale, scale_results in results['scales'].items():
+        old_cases = baseline.get('scales', {}).get(scale, {}).get('cases', {})
+        for name, timing in scale_results['cases'].items():
+            old = old_cases.get(name)
+            if not old or not old['median_ms']:
+                continue
+            ratio = timing['median_ms'] / old['median_ms']
+            if ratio > 1 + tolerance:
+                regressions.append((scale, name, old['median_ms'], timing['median_ms'], ratio))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Database methods at hospital scale")
+    parser.add_argument('--scales', type=int, nargs='+', default=[10000, 100000, 1000000],
+                        help="patients per database")
+    parser.add_argument('--runs', type=int, default=5, help="timed calls per case")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', default='benchmark_results.json', help="JSON results file ('-' for stdout)")
+    parser.add_argument('--data-dir', help="keep generated databases here and reuse them (default: temporary)")
+    parser.add_argument('--cases', nargs='*', help="only run cases whose group or name contains one of these")
+    parser.add_argument('--baseline', help="earlier results file to compare against")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="allowed slowdown against the baseline (0.25 = 25%%)")
+    args = parser.parse_args()
+
+    logging.getLogger('HospitalSystem').setLevel(logging.WARNING)
+    data_dir = os.path.abspath(args.data_dir) if args.data_dir else tempfile.mkdtemp(prefix='hms_suite_data_')
+    os.makedirs(data_dir, exist_ok=True)
+    results = {
+        'dataset_version': DATASET_VERSION,
+        'seed': args.seed,
+        'runs': args.runs,
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'environment': {
+            'python': platform.python_version(),
+            'sqlite': sqlite3.sqlite_version,
+            'platform': platform.platform(),
+            'machine': platform.machine(),
+        },
+        'scales': {},
+    }
+    try:
+        for patients in args.scales:
+            print("=" * 82)
+            print(f"{patients} patients")
+            print("=" * 82)
+            print(f"  {'group':<11}{'case':<36}{'median ms':>12}{'min ms':>12}{'rows':>10}")
+            print("-" * 82)
+            results['scales'][str(patients)] = run_scale(patients, args, data_dir)
+    finally:
+        if not args.data_dir:
+            shutil.rmtree(data_dir, ignore_errors=True)
+
+    if args.output == '-':
+        print(json.dumps(results, indent=2))
+    else:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        print("=" * 82)
+        if regressions:
+            print(f"{len(regressions)} case(s) slower than the baseline by more than {args.tolerance:.0%}")
+            for scale, name, old, new, ratio in regressions:
+                print(f"  {scale:>8} {name:<36}{old:>10.3f} -> {new:>10.3f} ms  ({ratio:.2f}x)")
+            sys.exit(1)
+        print("No regressions against the baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Benchmark concurrent inserts with and without the single-writer queue
+Usage: python benchmark_write_queue.py [--threads 16] [--writes 200] [--profile safe]
+
+Each worker thread alternates add_appointment() and add_bill() calls. With
+the writer off every call commits on its own thread (one fsync each, and
+threads wait on the write lock); with it on, calls queue to the writer
+thread and commit in groups (see backend/write_queue.py). Reports
+inserts/s for both, plus the number of commits the writer made.
+"""
+import argparse
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Backend imports
+from backend.database import Database
+
+
+def seed(db: Database) -> None:
+    """One patient and one doctor for the inserted rows to refer to"""
+    db.add_patient({'patient_id': 'PAT-BENCH', 'first_name': 'Bench', 'last_name': 'Mark',
+                    'date_of_birth': '1980-01-01', 'gender': 'Female'})
+    db.add_doctor({'doctor_id': 'DOC-BENCH', 'first_name': 'Bench', 'last_name': 'Doctor',
+                   'specialization': 'General'})
+
+
+def worker(db: Database, thread_no: int, writes: int, failures: list) -> None:
+    """Insert appointments and bills, counting calls that did not succeed"""
+    for i in range(writes):
+        key = f"{thread_no:03d}-{i:06d}"
+        if i % 2:
+            ok = db.add_bill({'bill_id': f"BILL-{key}", 'patient_id': 'PAT-BENCH',
+                              'bill_date': '2025-01-15', 'total_amount': 500.0,
+                              'payment_status': 'Paid', 'payment_method': 'Cash'})
+        else:
+            ok = db.add_appointment({'appointment_id': f"APT-{key}", 'patient_id': 'PAT-BENCH',
+                                     'doctor_id': 'DOC-BENCH', 'appointment_date': '2025-01-15',
+                                     'appointment_time': '10:00', 'status': 'Scheduled'})
+        if not ok:
+            failures.append(key)
+    db.release_connection()
+
+
+def run(path: str, profile: str, single_writer: bool, threads: int, writes: int):
+    """(inserts/s, failed calls, writer commits) for one configuration"""
+    db = Database(path, storage_profile=profile, single_writer=single_writer)
+    seed(db)
+    failures: list = []
+    workers = [threading.Thread(target=worker, args=(db, n, writes, failures)) for n in range(threads)]
+    began = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - began
+    commits = db._writer.commits if db._writer is not None else threads * writes
+    db.close()
+    return threads * writes / elapsed, len(failures), commits
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the single-writer queue")
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--writes', type=int, default=200, help="inserts per thread")
+    parser.add_argument('--profile', default='safe',
+                        help="storage profile (default 'safe': synchronous=FULL, so each commit is an fsync)")
+    args = parser.parse_args()
+
+    logging.getLogger('HospitalSystem').setLevel(logging.WARNING)
+    workdir = tempfile.mkdtemp(prefix='hms_writer_')
+    try:
+        print(f"{args.threads} threads x {args.writes} inserts, storage profile '{args.profile}'")
+        print("=" * 64)
+        print(f"{'mode':<20}{'inserts/s':>14}{'failed':>10}{'commits':>12}")
+        print("-" * 64)
+        for label, single_writer in (('commit per call', False), ('single writer', True)):
+            path = os.path.join(workdir, f"{'writer' if single_writer else 'direct'}.db")
+            rate, failed, commits = run(path, args.profile, single_writer, args.threads, args.writes)
+            print(f"{label:<20}{rate:>14.0f}{failed:>10}{commits:>12}")
+        print("=" * 64)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
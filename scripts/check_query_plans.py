@@ -0,0 +1,152 @@
+"""
+Check that Database query methods are served by indexes
+Usage: python check_query_plans.py [database_path]
+
+Runs each query method against a database (a temporary one by default),
+captures the SQL it executes and prints the EXPLAIN QUERY PLAN output.
+Exits with status 1 if a method listed in INDEXED_METHODS does a full
+table scan.
+"""
+import os
+import sys
+import tempfile
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Backend imports
+from backend.database import Database
+from backend.query_profiler import full_scans
+
+# Methods that must never scan a whole table: (method name, args or keyword args)
+INDEXED_METHODS = [
+    ('get_patient_by_id', ('PAT-00000001',)),
+    ('get_doctor_by_id', ('DOC-00001',)),
+    ('get_appointment_by_id', ('APT-00000001',)),
+    ('get_appointments_by_date', ('2025-01-15',)),
+    ('get_appointments_by_status', ('Scheduled',)),
+    ('find_appointments', {'date': '2025-01-15', 'status': 'Scheduled'}),
+    ('find_appointments', {'date_from': '2025-01-01', 'date_to': '2025-01-31', 'doctor_id': 'DOC-00001'}),
+    ('find_appointments', {'patient_name': 'john smith', 'status': 'Completed'}),
+    ('get_todays_appointments', ('2025-01-15',)),
+    ('get_admissions_by_patient', ('PAT-00000001',)),
+    ('get_active_admission_by_patient', ('PAT-00000001',)),
+    ('get_all_active_admissions', ()),
+    ('get_admission_notes', ('ADM-00000001',)),
+    ('get_prescriptions_by_date', ('2025-01-15',)),
+    ('get_prescriptions_by_patient', ('PAT-00000001',)),
+    ('get_prescription_by_id', ('PRE-00000001',)),
+    ('get_prescription_items', ('PRE-00000001',)),
+    ('get_bill_by_id', ('BILL-00000001',)),
+    ('get_bills_by_patient_id', ('PAT-00000001',)),
+    ('get_bills_by_date', ('2025-01-15',)),
+    ('get_bills_by_status', ('Pending',)),
+    ('find_bills', {'date': '2025-01-15', 'status': 'Pending'}),
+    ('find_bills', {'patient_name': 'john', 'date_from': '2025-01-01'}),
+    ('find_prescriptions', {'patient_name': 'john', 'date': '2025-01-15'}),
+    ('find_admissions', {'status': 'Admitted', 'date_from': '2025-01-01', 'limit': 50}),
+    ('find_admissions', {'status': 'Admitted', 'ward': 'ICU', 'limit': 50}),
+    ('get_xray_reports_by_patient', ('PAT-00000001',)),
+    ('get_medicine_dosages', ('Paracetamol',)),
+    ('get_medicine_by_name_and_dosage', ('Paracetamol', '500mg')),
+    ('get_user_direct_permissions', (1,)),
+    ('get_statistics', ()),
+    ('get_daily_statistics', ('2025-01-15',)),
+    ('get_monthly_statistics', ('2025-01',)),
+    ('get_yearly_statistics', ('2025',)),
+    ('get_date_range_statistics', ('2025-01-01', '2025-03-31')),
+    ('get_financial_summary', ('2025-01-01', '2025-01-31')),
+    ('search_medicines_master_paginated', ('para', 50, 0)),
+    ('autocomplete_medicines', ('para', 20)),
+]
+
+# Methods that are expected to read whole tables; reported but not enforced
+REPORTED_METHODS = [
+    ('search_patients', ('john',)),
+    ('find_appointments', {'patient_name': 'jo'}),
+    ('get_patient_demographics', ('2025-01-01', '2025-01-31')),
+    ('get_doctor_performance', ('2025-01-01', '2025-01-31')),
+]
+
+# Whole-table reads that are inherent to a method (e.g. cumulative totals)
+ALLOWED_SCANS = {
+    'get_statistics': {'patients', 'doctors', 'daily_stats'},
+    'get_daily_statistics': {'patients', 'doctors'},
+    'get_monthly_statistics': {'patients', 'doctors'},
+    'get_yearly_statistics': {'patients', 'doctors'},
+    'get_date_range_statistics': {'patients', 'doctors'},
+}
+
+
+def capture_statements(db: Database, method: str, args: tuple) -> list:
+    """Run a Database method and return the SELECT statements it executed"""
+    def call():
+        if isinstance(args, dict):
+            getattr(db, method)(**args)
+        else:
+            getattr(db, method)(*args)
+    
+    # Warm-up run: the first FTS5 query on a connection reads the index's
+    # config and sqlite_master, which would be reported as table scans
+    call()
+    statements = []
+    db.conn.set_trace_callback(statements.append)
+    try:
+        call()
+    finally:
+        db.conn.set_trace_callback(None)
+    return [s for s in statements if s.lstrip().upper().startswith(('SELECT', 'WITH'))]
+
+
+def explain(db: Database, sql: str) -> list:
+    """EXPLAIN QUERY PLAN detail lines for a fully expanded statement"""
+    return [row[3] for row in db.conn.execute(f"EXPLAIN QUERY PLAN {sql}").fetchall()]
+
+
+def check(db: Database, methods: list, enforce: bool) -> int:
+    """Print plans for methods; return the number of enforced failures"""
+    failures = 0
+    for method, args in methods:
+        scans = []
+        plans = []
+        for sql in capture_statements(db, method, args):
+            plan = explain(db, sql)
+            plans.append(plan)
+            scans.extend(table for table in full_scans(plan)
+                         if table not in ALLOWED_SCANS.get(method, ()))
+        status = 'OK' if not scans else ('FAIL' if enforce else 'SCAN')
+        print(f"[{status:<4}] {method}")
+        if scans:
+            for plan in plans:
+                for step in plan:
+                    print(f"         {step}")
+            if enforce:
+                failures += 1
+    return failures
+
+
+def main():
+    if len(sys.argv) > 1:
+        db = Database(os.path.abspath(sys.argv[1]))
+    else:
+        db = Database(os.path.join(tempfile.mkdtemp(prefix='hms_plans_'), 'hospital.db'))
+
+    print("=" * 60)
+    print("Indexed query methods")
+    print("=" * 60)
+    failures = check(db, INDEXED_METHODS, enforce=True)
+    print("\n" + "=" * 60)
+    print("Full-table methods (informational)")
+    print("=" * 60)
+    check(db, REPORTED_METHODS, enforce=False)
+    db.close()
+
+    print("-" * 60)
+    if failures:
+        print(f"{failures} indexed method(s) fell back to a full table scan")
+        sys.exit(1)
+    print("All indexed methods use an index")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Check that every desktop report can be generated
+Usage: python check_reports.py
+
+Seeds a temporary database with a patient, a doctor, an appointment, a
+prescription and a bill, then builds each ReportsModule report for all
+time and for a date range without opening a window. Exits with status 1
+if a report raises or renders empty.
+"""
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import traceback
+from datetime import date
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Backend imports
+from backend.database import Database
+
+# Frontend imports
+from frontend.modules.reports_module import ReportsModule
+
+REPORTS = ['overview', 'financial', 'patient', 'doctor', 'appointment', 'prescription', 'custom']
+DATE_RANGES = [('all time', None, None), ('January 2025', date(2025, 1, 1), date(2025, 1, 31))]
+
+
+def seed(db: Database) -> None:
+    """One of each record the reports read, dated inside DATE_RANGES"""
+    db.add_patient({'patient_id': 'PAT-CHECK', 'first_name': 'Report', 'last_name': 'Check',
+                    'date_of_birth': '1980-05-01', 'gender': 'Female', 'blood_group': 'O+'})
+    db.add_doctor({'doctor_id': 'DOC-CHECK', 'first_name': 'Report', 'last_name': 'Doctor',
+                   'specialization': 'General Medicine'})
+    db.add_appointment({'appointment_id': 'APT-CHECK', 'patient_id': 'PAT-CHECK', 'doctor_id': 'DOC-CHECK',
+                        'appointment_date': '2025-01-15', 'appointment_time': '10:00', 'status': 'Completed'})
+    db.add_prescription({'prescription_id': 'RX-CHECK', 'patient_id': 'PAT-CHECK', 'doctor_id': 'DOC-CHECK',
+                         'prescription_date': '2025-01-15', 'diagnosis': 'Check'},
+                        [{'medicine_name': 'Paracetamol', 'dosage': '500mg', 'frequency': 'Twice daily',
+                          'duration': '5 days'}])
+    db.add_bill({'bill_id': 'BILL-CHECK', 'patient_id': 'PAT-CHECK', 'bill_date': '2025-01-15',
+                 'consultation_fee': 500, 'medicine_cost': 100, 'other_charges': 0, 'total_amount': 600,
+                 'payment_status': 'Paid', 'payment_method': 'Cash'})
+
+
+def headless_reports(db: Database) -> ReportsModule:
+    """A ReportsModule without its window; display_report() keeps the text"""
+    reports = ReportsModule.__new__(ReportsModule)
+    reports.db = db
+    reports.from_date = None
+    reports.to_date = None
+    reports.display_report = lambda text: setattr(reports, 'current_report_text', text)
+    return reports
+
+
+def main():
+    logging.getLogger('HospitalSystem').setLevel(logging.WARNING)
+    workdir = tempfile.mkdtemp(prefix='hms_reports_')
+    failures = 0
+    try:
+        db = Database(os.path.join(workdir, 'hospital.db'))
+        seed(db)
+        reports = headless_reports(db)
+        print("=" * 60)
+        for label, from_date, to_date in DATE_RANGES:
+            reports.from_date, reports.to_date = from_date, to_date
+            for report in REPORTS:
+                reports.current_report_text = ''
+                try:
+                    getattr(reports, f"generate_{report}_report")()
+                    status = 'OK' if reports.current_report_text.strip() else 'EMPTY'
+                except Exception:
+                    status = 'FAIL'
+                    traceback.print_exc()
+                if status != 'OK':
+                    failures += 1
+                print(f"[{status:<5}] {report} report ({label})")
+        db.close()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print("-" * 60)
+    if failures:
+        print(f"{failures} report(s) failed")
+        sys.exit(1)
+    print("All reports generated")
+
+
+if __name__ == "__main__":
+    main()
@@ -197,37 +197,37 @@ class FakeDataGenerator:
     def generate_patients(self, count=60):
         """Generate fake patients"""
         print(f"\nGenerating {count} patients...")
-        generated = 0
-        
+        rows = []
         for i in range(count):
-            try:
-                first_name = random.choice(self.first_names)
-                last_name = random.choice(self.last_names)
-                patient_id = generate_id("PAT")
-                
-                patient_data = {
-                    'patient_id': patient_id,
-                    'first_name': first_name,
-                    'last_name': last_name,
-                    'date_of_birth': self.generate_date_of_birth(),
-                    'gender': random.choice(self.genders),
-                    'phone': self.generate_phone(),
-                    'email': self.generate_email(first_name, last_name),
-                    'address': self.generate_address(),
-                    'emergency_contact': f"{random.choice(self.first_names)} {random.choice(self.last_names)}",
-                    'emergency_phone': self.generate_phone(),
-                    'blood_group': random.choice(self.blood_groups),
-                    'allergies': random.choice(self.allergies)
-                }
-                
-                if self.db.add_patient(patient_data):
-                    self.patient_ids.append(patient_id)
-                    generated += 1
-                    if (generated % 10 == 0):
-                        print(f"  Generated {generated} patients...")
-            except Exception as e:
-                print(f"  Error generating patient {i+1}: {e}")
-                continue
+            first_name = random.choice(self.first_names)
+            last_name = random.choice(self.last_names)
+            patient_id = generate_id("PAT")
+            
+            patient_data = {
+                'patient_id': patient_id,
+                'first_name': first_name,
+                'last_name': last_name,
+                'date_of_birth': self.generate_date_of_birth(),
+                'gender': random.choice(self.genders),
+                'phone': self.generate_phone(),
+                'email': self.generate_email(first_name, last_name),
+                'address': self.generate_address(),
+                'emergency_contact': f"{random.choice(self.first_names)} {random.choice(self.last_names)}",
+                'emergency_phone': self.generate_phone(),
+                'blood_group': random.choice(self.blood_groups),
+                'allergies': random.choice(self.allergies)
+            }
+            rows.append(patient_data)
+        
+        # One executemany() per chunk instead of a commit per row
+        result = self.db.bulk_add_patients(rows)
+        rejected = {error['index'] for error in result['errors']}
+        for index, row in enumerate(rows):
+            if index not in rejected:
+                self.patient_ids.append(row['patient_id'])
+        for error in result['errors']:
+            print(f"  Error generating patient {error['index'] + 1}: {error['error']}")
+        generated = result['inserted']
         
         print(f"[OK] Successfully generated {generated} patients")
         return generated
@@ -235,36 +235,36 @@ class FakeDataGenerator:
     def generate_doctors(self, count=60):
         """Generate fake doctors"""
         print(f"\nGenerating {count} doctors...")
-        generated = 0
-        
+        rows = []
         for i in range(count):
-            try:
-                first_name = random.choice(self.first_names)
-                last_name = random.choice(self.last_names)
-                doctor_id = generate_id("DOC")
-                
-                doctor_data = {
-                    'doctor_id': doctor_id,
-                    'first_name': first_name,
-                    'last_name': last_name,
-                    'specialization': random.choice(self.specializations),
-                    'qualification': random.choice(self.qualifications),
-                    'phone': self.generate_phone(),
-                    'email': self.generate_email(first_name, last_name),
-                    'address': self.generate_address(),
-                    'consultation_fee': round(random.uniform(50, 500), 2),
-                    'available_days': random.choice(self.available_days),
-                    'available_time': random.choice(self.available_times)
-                }
-                
-                if self.db.add_doctor(doctor_data):
-                    self.doctor_ids.append(doctor_id)
-                    generated += 1
-                    if (generated % 10 == 0):
-                        print(f"  Generated {generated} doctors...")
-            except Exception as e:
-                print(f"  Error generating doctor {i+1}: {e}")
-                continue
+            first_name = random.choice(self.first_names)
+            last_name = random.choice(self.last_names)
+            doctor_id = generate_id("DOC")
+            
+            doctor_data = {
+                'doctor_id': doctor_id,
+                'first_name': first_name,
+                'last_name': last_name,
+                'specialization': random.choice(self.specializations),
+                'qualification': random.choice(self.qualifications),
+                'phone': self.generate_phone(),
+                'email': self.generate_email(first_name, last_name),
+                'address': self.generate_address(),
+                'consultation_fee': round(random.uniform(50, 500), 2),
+                'available_days': random.choice(self.available_days),
+                'available_time': random.choice(self.available_times)
+            }
+            rows.append(doctor_data)
+        
+        # One executemany() per chunk instead of a commit per row
+        result = self.db.bulk_add_doctors(rows)
+        rejected = {error['index'] for error in result['errors']}
+        for index, row in enumerate(rows):
+            if index not in rejected:
+                self.doctor_ids.append(row['doctor_id'])
+        for error in result['errors']:
+            print(f"  Error generating doctor {error['index'] + 1}: {error['error']}")
+        generated = result['inserted']
         
         print(f"[OK] Successfully generated {generated} doctors")
         return generated
@@ -277,43 +277,43 @@ class FakeDataGenerator:
             print("  Error: Need patients and doctors first!")
             return 0
         
-        generated = 0
-        
+        rows = []
         for i in range(count):
-            try:
-                appointment_id = generate_id("APT")
-                patient_id = random.choice(self.patient_ids)
-                doctor_id = random.choice(self.doctor_ids)
-                
-                # Mix of past and future appointments
-                if random.random() < 0.6:  # 60% past appointments
-                    appointment_date = self.generate_past_date(days_back_min=1, days_back_max=180)
-                    status = random.choice(["Completed", "Cancelled", "No Show"])
-                else:  # 40% future appointments
-                    appointment_date = self.generate_future_date(days_ahead_min=1, days_ahead_max=60)
-                    status = "Scheduled"
-                
-                appointment_data = {
-                    'appointment_id': appointment_id,
-                    'patient_id': patient_id,
-                    'doctor_id': doctor_id,
-                    'appointment_date': appointment_date,
-                    'appointment_time': random.choice(self.time_slots),
-                    'status': status,
-                    'notes': random.choice([
-                        "Regular checkup", "Follow-up visit", "Initial consultation",
-                        "Emergency visit", "Routine examination", ""
-                    ])
-                }
-                
-                if self.db.add_appointment(appointment_data):
-                    self.appointment_ids.append(appointment_id)
-                    generated += 1
-                    if (generated % 10 == 0):
-                        print(f"  Generated {generated} appointments...")
-            except Exception as e:
-                print(f"  Error generating appointment {i+1}: {e}")
-                continue
+            appointment_id = generate_id("APT")
+            patient_id = random.choice(self.patient_ids)
+            doctor_id = random.choice(self.doctor_ids)
+            
+            # Mix of past and future appointments
+            if random.random() < 0.6:  # 60% past appointments
+                appointment_date = self.generate_past_date(days_back_min=1, days_back_max=180)
+                status = random.choice(["Completed", "Cancelled", "No Show"])
+            else:  # 40% future appointments
+                appointment_date = self.generate_future_date(days_ahead_min=1, days_ahead_max=60)
+                status = "Scheduled"
+            
+            appointment_data = {
+                'appointment_id': appointment_id,
+                'patient_id': patient_id,
+                'doctor_id': doctor_id,
+                'appointment_date': appointment_date,
+                'appointment_time': random.choice(self.time_slots),
+                'status': status,
+                'notes': random.choice([
+                    "Regular checkup", "Follow-up visit", "Initial consultation",
+                    "Emergency visit", "Routine examination", ""
+                ])
+            }
+            rows.append(appointment_data)
+        
+        # One executemany() per chunk instead of a commit per row
+        result = self.db.bulk_add_appointments(rows)
+        rejected = {error['index'] for error in result['errors']}
+        for index, row in enumerate(rows):
+            if index not in rejected:
+                self.appointment_ids.append(row['appointment_id'])
+        for error in result['errors']:
+            print(f"  Error generating appointment {error['index'] + 1}: {error['error']}")
+        generated = result['inserted']
         
         print(f"[OK] Successfully generated {generated} appointments")
         return generated
@@ -390,49 +390,46 @@ class FakeDataGenerator:
             print("  Error: Need patients first!")
             return 0
         
-        generated = 0
-        
+        rows = []
         for i in range(count):
-            try:
-                bill_id = generate_id("BILL")
-                patient_id = random.choice(self.patient_ids)
-                
-                # Some bills linked to appointments, some not
-                appointment_id = None
-                if self.appointment_ids and random.random() < 0.6:  # 60% linked to appointments
-                    appointment_id = random.choice(self.appointment_ids)
-                
-                bill_date = self.generate_past_date(days_back_min=1, days_back_max=120)
-                
-                consultation_fee = round(random.uniform(50, 500), 2)
-                medicine_cost = round(random.uniform(20, 300), 2)
-                other_charges = round(random.uniform(0, 200), 2) if random.random() < 0.4 else 0
-                total_amount = round(consultation_fee + medicine_cost + other_charges, 2)
-                
-                bill_data = {
-                    'bill_id': bill_id,
-                    'patient_id': patient_id,
-                    'appointment_id': appointment_id,
-                    'bill_date': bill_date,
-                    'consultation_fee': consultation_fee,
-                    'medicine_cost': medicine_cost,
-                    'other_charges': other_charges,
-                    'total_amount': total_amount,
-                    'payment_status': random.choice(self.payment_statuses),
-                    'payment_method': random.choice(self.payment_methods) if random.random() < 0.7 else "",
-                    'notes': random.choice([
-                        "Payment received", "Insurance claim pending", "Partial payment",
-                        "Payment due", ""
-                    ])
-                }
-                
-                if self.db.add_bill(bill_data):
-                    generated += 1
-                    if (generated % 10 == 0):
-                        print(f"  Generated {generated} bills...")
-            except Exception as e:
-                print(f"  Error generating bill {i+1}: {e}")
-                continue
+            bill_id = generate_id("BILL")
+            patient_id = random.choice(self.patient_ids)
+            
+            # Some bills linked to appointments, some not
+            appointment_id = None
+            if self.appointment_ids and random.random() < 0.6:  # 60% linked to appointments
+                appointment_id = random.choice(self.appointment_ids)
+            
+            bill_date = self.generate_past_date(days_back_min=1, days_back_max=120)
+            
+            consultation_fee = round(random.uniform(50, 500), 2)
+            medicine_cost = round(random.uniform(20, 300), 2)
+            other_charges = round(random.uniform(0, 200), 2) if random.random() < 0.4 else 0
+            total_amount = round(consultation_fee + medicine_cost + other_charges, 2)
+            
+            bill_data = {
+                'bill_id': bill_id,
+                'patient_id': patient_id,
+                'appointment_id': appointment_id,
+                'bill_date': bill_date,
+                'consultation_fee': consultation_fee,
+                'medicine_cost': medicine_cost,
+                'other_charges': other_charges,
+                'total_amount': total_amount,
+                'payment_status': random.choice(self.payment_statuses),
+                'payment_method': random.choice(self.payment_methods) if random.random() < 0.7 else "",
+                'notes': random.choice([
+                    "Payment received", "Insurance claim pending", "Partial payment",
+                    "Payment due", ""
+                ])
+            }
+            rows.append(bill_data)
+        
+        # One executemany() per chunk instead of a commit per row
+        result = self.db.bulk_add_bills(rows)
+        for error in result['errors']:
+            print(f"  Error generating bill {error['index'] + 1}: {error['error']}")
+        generated = result['inserted']
         
         print(f"[OK] Successfully generated {generated} bills")
         return generated
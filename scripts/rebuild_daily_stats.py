@@ -0,0 +1,56 @@
+"""
+Check or rebuild the daily_stats rollup used by the dashboard and reports
+Usage: python rebuild_daily_stats.py [--check] [--db hospital.db]
+
+  (default)  recompute daily_stats from the appointments, billing and
+             admissions tables, then verify it
+  --check    only compare daily_stats with the raw tables and list the
+             differences (exit status 1 if there are any)
+"""
+import argparse
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Backend imports
+from backend.database import Database
+
+
+def print_differences(differences: list) -> None:
+    """Print rollup rows that do not match the raw tables"""
+    print(f"{'date':<12}{'source':<14}{'doctor':<14}{'status':<12}{'method':<10}"
+          f"{'count exp/act':>16}{'amount exp/act':>24}")
+    for row in differences:
+        print(f"{row['stat_date']:<12}{row['source']:<14}{row['doctor_id']:<14}{row['status']:<12}"
+              f"{row['payment_method']:<10}{row['expected_count']:>8}/{row['actual_count']:<7}"
+              f"{row['expected_amount']:>12.2f}/{row['actual_amount']:<11.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check or rebuild the daily_stats rollup")
+    parser.add_argument('--check', action='store_true', help="only verify, do not rebuild")
+    parser.add_argument('--db', default='hospital.db', help="database file (default: the app's hospital.db)")
+    args = parser.parse_args()
+
+    db = Database(args.db)
+    try:
+        if not args.check:
+            print("Rebuilding daily_stats...")
+            if not db.rebuild_daily_stats():
+                print("Rebuild failed - see the log for details")
+                sys.exit(1)
+        differences = db.check_daily_stats()
+        if differences:
+            print(f"daily_stats differs from the raw tables in {len(differences)} row(s):")
+            print_differences(differences)
+            print("Run without --check to rebuild it.")
+            sys.exit(1)
+        print("daily_stats matches the appointments, billing and admissions tables")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -39,11 +39,25 @@ async function apiCall(endpoint, method = 'GET', data = null) {
     }
 }
 
+/**
+ * Query string for a list endpoint: filters plus fields / limit / cursor.
+ * Empty values are dropped and arrays (e.g. fields) are comma-joined.
+ */
+function listQuery(params = {}) {
+    const parts = Object.entries(params)
+        .filter(([, value]) => value !== undefined && value !== null && value !== '')
+        .map(([key, value]) => `${key}=${encodeURIComponent(Array.isArray(value) ? value.join(',') : value)}`);
+    return parts.length ? `?${parts.join('&')}` : '';
+}
+
+// Rows fetched per "Load more" page of a list view
+const LIST_PAGE_SIZE = 100;
+
 /**
  * Patient API functions
  */
 const PatientAPI = {
-    getAll: () => apiCall('/patients'),
+    getAll: (params = {}) => apiCall(`/patients${listQuery(params)}`),
     search: (query) => apiCall(`/patients?search=${encodeURIComponent(query)}`),
     getById: (id) => apiCall(`/patients/${id}`),
     create: (data) => apiCall('/patients', 'POST', data),
@@ -54,7 +68,7 @@ const PatientAPI = {
  * Doctor API functions
  */
 const DoctorAPI = {
-    getAll: () => apiCall('/doctors'),
+    getAll: (params = {}) => apiCall(`/doctors${listQuery(params)}`),
     getById: (id) => apiCall(`/doctors/${id}`),
     create: (data) => apiCall('/doctors', 'POST', data),
     update: (id, data) => apiCall(`/doctors/${id}`, 'PUT', data),
@@ -65,7 +79,7 @@ const DoctorAPI = {
  * Appointment API functions
  */
 const AppointmentAPI = {
-    getAll: () => apiCall('/appointments'),
+    getAll: (params = {}) => apiCall(`/appointments${listQuery(params)}`),
     getByDate: (date) => apiCall(`/appointments?date=${date}`),
     getById: (id) => apiCall(`/appointments/${id}`),
     create: (data) => apiCall('/appointments', 'POST', data),
@@ -76,7 +90,7 @@ const AppointmentAPI = {
  * Prescription API functions
  */
 const PrescriptionAPI = {
-    getAll: () => apiCall('/prescriptions'),
+    getAll: (params = {}) => apiCall(`/prescriptions${listQuery(params)}`),
     getById: (id) => apiCall(`/prescriptions/${id}`),
     create: (data) => apiCall('/prescriptions', 'POST', data),
     update: (id, data) => apiCall(`/prescriptions/${id}`, 'PUT', data)
@@ -86,7 +100,7 @@ const PrescriptionAPI = {
  * Bill API functions
  */
 const BillAPI = {
-    getAll: () => apiCall('/bills'),
+    getAll: (params = {}) => apiCall(`/bills${listQuery(params)}`),
     getById: (id) => apiCall(`/bills/${id}`),
     create: (data) => apiCall('/bills', 'POST', data),
     update: (id, data) => apiCall(`/bills/${id}`, 'PUT', data),
@@ -111,6 +125,6 @@ const StatisticsAPI = {
 const MedicineAPI = {
     getAll: (page = 1, limit = 50) => apiCall(`/medicines?page=${page}&limit=${limit}`),
     search: (query) => apiCall(`/medicines?search=${encodeURIComponent(query)}`),
-    getAutocomplete: () => apiCall('/medicines/autocomplete')
+    getAutocomplete: (query = '', limit = 20) => apiCall(`/medicines/autocomplete?q=${encodeURIComponent(query)}&limit=${limit}`)
 };
 
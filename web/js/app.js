@@ -79,6 +79,14 @@ function showLoading(element) {
     element.innerHTML = '<div class="loading"><div class="spinner"></div></div>';
 }
 
+// "Load more" button that calls loader(nextCursor) for the next page of a list
+function loadMoreButton(nextCursor, loader) {
+    if (!nextCursor) return '';
+    return `<div style="text-align: center; margin-top: 16px;">
+        <button onclick="${loader}('${nextCursor}')" class="btn btn-secondary">Load more</button>
+    </div>`;
+}
+
 // Check API health on load
 window.addEventListener('load', async () => {
     try {
@@ -38,40 +38,40 @@ async function showAppointments() {
     await loadAppointments();
 }
 
-async function loadAppointments() {
+// Columns shown in the appointment table, and the rows loaded so far
+const APPOINTMENT_LIST_FIELDS = ['appointment_id', 'patient_name', 'doctor_name', 'appointment_date', 'appointment_time', 'status'];
+let appointmentRows = [];
+
+async function loadAppointments(cursor = null) {
     const listDiv = document.getElementById('appointments-list');
-    showLoading(listDiv);
+    if (!cursor) showLoading(listDiv);
     
     try {
-        const result = await AppointmentAPI.getAll();
-        displayAppointments(result.appointments);
+        const result = await AppointmentAPI.getAll({ fields: APPOINTMENT_LIST_FIELDS, limit: LIST_PAGE_SIZE, cursor });
+        appointmentRows = cursor ? appointmentRows.concat(result.appointments) : result.appointments;
+        displayAppointments(appointmentRows, result.next_cursor, 'loadAppointments');
     } catch (error) {
         listDiv.innerHTML = 
             `<div class="alert alert-error">❌ Error loading appointments: ${error.message}</div>`;
     }
 }
 
-async function searchAppointments() {
+async function searchAppointments(cursor = null) {
     const query = document.getElementById('appointment-search').value;
     const date = document.getElementById('appointment-date-filter').value;
     const status = document.getElementById('appointment-status-filter').value;
     
     try {
-        let url = '/appointments?';
-        const params = [];
-        
-        if (query) params.push(`patient_name=${encodeURIComponent(query)}`);
-        if (date) params.push(`date=${date}`);
-        if (status) params.push(`status=${status}`);
-        
-        if (params.length > 0) {
-            url += params.join('&');
-        } else {
-            url = '/appointments';
-        }
-        
-        const result = await apiCall(url);
-        displayAppointments(result.appointments);
+        const result = await AppointmentAPI.getAll({
+            patient_name: query,
+            date: date,
+            status: status,
+            fields: APPOINTMENT_LIST_FIELDS,
+            limit: LIST_PAGE_SIZE,
+            cursor
+        });
+        appointmentRows = cursor ? appointmentRows.concat(result.appointments) : result.appointments;
+        displayAppointments(appointmentRows, result.next_cursor, 'searchAppointments');
     } catch (error) {
         console.error('Search error:', error);
         document.getElementById('appointments-list').innerHTML = 
@@ -87,7 +87,7 @@ async function filterAppointmentsByStatus() {
     searchAppointments();
 }
 
-function displayAppointments(appointments) {
+function displayAppointments(appointments, nextCursor = null, loader = null) {
     const listDiv = document.getElementById('appointments-list');
     
     if (!appointments || appointments.length === 0) {
@@ -142,6 +142,7 @@ function displayAppointments(appointments) {
         </div>
     `;
 
+    html += loadMoreButton(nextCursor, loader);
     listDiv.innerHTML = html;
 }
 
@@ -151,10 +152,10 @@ async function showAddAppointmentForm() {
     let doctors = [];
     
     try {
-        const patientsResult = await PatientAPI.getAll();
+        const patientsResult = await PatientAPI.getAll({ fields: ['patient_id', 'first_name', 'last_name'] });
         patients = patientsResult.patients || [];
         
-        const doctorsResult = await DoctorAPI.getAll();
+        const doctorsResult = await DoctorAPI.getAll({ fields: ['doctor_id', 'first_name', 'last_name', 'specialization'] });
         doctors = doctorsResult.doctors || [];
     } catch (error) {
         alert('Error loading patients/doctors: ' + error.message);
@@ -263,10 +264,10 @@ async function editAppointment(appointmentId) {
         const appointment = result.appointment;
         
         // Load patients and doctors
-        const patientsResult = await PatientAPI.getAll();
+        const patientsResult = await PatientAPI.getAll({ fields: ['patient_id', 'first_name', 'last_name'] });
         const patients = patientsResult.patients || [];
         
-        const doctorsResult = await DoctorAPI.getAll();
+        const doctorsResult = await DoctorAPI.getAll({ fields: ['doctor_id', 'first_name', 'last_name', 'specialization'] });
         const doctors = doctorsResult.doctors || [];
         
         const content = document.getElementById('content');
@@ -43,7 +43,10 @@ async function loadBills() {
     showLoading(listDiv);
     
     try {
-        const result = await BillAPI.getAll();
+        const result = await BillAPI.getAll({
+            fields: ['bill_id', 'patient_name', 'bill_date', 'consultation_fee', 'medicine_cost',
+                     'other_charges', 'total_amount', 'payment_status', 'payment_method']
+        });
         displayBills(result.bills);
     } catch (error) {
         listDiv.innerHTML = 
@@ -181,7 +184,7 @@ async function showAddBillForm() {
     let appointments = [];
     
     try {
-        const patientsResult = await PatientAPI.getAll();
+        const patientsResult = await PatientAPI.getAll({ fields: ['patient_id', 'first_name', 'last_name'] });
         patients = patientsResult.patients || [];
         
         const appointmentsResult = await AppointmentAPI.getAll();
@@ -308,7 +311,7 @@ async function loadPatientAppointmentsForBill() {
     }
     
     try {
-        const result = await AppointmentAPI.getAll();
+        const result = await AppointmentAPI.getAll({ patient_id: patientId });
         const appointments = result.appointments || [];
         const patientAppointments = appointments.filter(a => a.patient_id === patientId);
         
@@ -408,7 +411,7 @@ async function editBill(billId) {
         const bill = result.bill;
         
         // Load patients and appointments
-        const patientsResult = await PatientAPI.getAll();
+        const patientsResult = await PatientAPI.getAll({ fields: ['patient_id', 'first_name', 'last_name'] });
         const patients = patientsResult.patients || [];
         
         const appointmentsResult = await AppointmentAPI.getAll();
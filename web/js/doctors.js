@@ -28,7 +28,9 @@ async function loadDoctors() {
     showLoading(listDiv);
     
     try {
-        const result = await DoctorAPI.getAll();
+        const result = await DoctorAPI.getAll({
+            fields: ['doctor_id', 'first_name', 'last_name', 'specialization', 'phone', 'email']
+        });
         displayDoctors(result.doctors);
     } catch (error) {
         listDiv.innerHTML = 
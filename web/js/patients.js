@@ -26,13 +26,18 @@ async function showPatients() {
     loadPatients();
 }
 
-async function loadPatients() {
+// Columns shown in the patient table, and the rows loaded so far
+const PATIENT_LIST_FIELDS = ['patient_id', 'first_name', 'last_name', 'date_of_birth', 'gender', 'phone', 'email'];
+let patientRows = [];
+
+async function loadPatients(cursor = null) {
     const listDiv = document.getElementById('patients-list');
-    showLoading(listDiv);
+    if (!cursor) showLoading(listDiv);
     
     try {
-        const result = await PatientAPI.getAll();
-        displayPatients(result.patients);
+        const result = await PatientAPI.getAll({ fields: PATIENT_LIST_FIELDS, limit: LIST_PAGE_SIZE, cursor });
+        patientRows = cursor ? patientRows.concat(result.patients) : result.patients;
+        displayPatients(patientRows, result.next_cursor, 'loadPatients');
     } catch (error) {
         listDiv.innerHTML = 
             `<div class="alert alert-error">❌ Error loading patients: ${error.message}</div>`;
@@ -54,7 +59,7 @@ async function searchPatients() {
     }
 }
 
-function displayPatients(patients) {
+function displayPatients(patients, nextCursor = null, loader = null) {
     const listDiv = document.getElementById('patients-list');
     
     if (!patients || patients.length === 0) {
@@ -101,6 +106,7 @@ function displayPatients(patients) {
         </div>
     `;
 
+    html += loadMoreButton(nextCursor, loader);
     listDiv.innerHTML = html;
 }
 
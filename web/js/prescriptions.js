@@ -32,38 +32,38 @@ async function showPrescriptions() {
     await loadPrescriptions();
 }
 
-async function loadPrescriptions() {
+// Columns shown in the prescription table, and the rows loaded so far
+const PRESCRIPTION_LIST_FIELDS = ['prescription_id', 'patient_name', 'doctor_name', 'prescription_date', 'diagnosis', 'items'];
+let prescriptionRows = [];
+
+async function loadPrescriptions(cursor = null) {
     const listDiv = document.getElementById('prescriptions-list');
-    showLoading(listDiv);
+    if (!cursor) showLoading(listDiv);
     
     try {
-        const result = await PrescriptionAPI.getAll();
-        displayPrescriptions(result.prescriptions);
+        const result = await PrescriptionAPI.getAll({ fields: PRESCRIPTION_LIST_FIELDS, limit: LIST_PAGE_SIZE, cursor });
+        prescriptionRows = cursor ? prescriptionRows.concat(result.prescriptions) : result.prescriptions;
+        displayPrescriptions(prescriptionRows, result.next_cursor, 'loadPrescriptions');
     } catch (error) {
         listDiv.innerHTML = 
             `<div class="alert alert-error">❌ Error loading prescriptions: ${error.message}</div>`;
     }
 }
 
-async function searchPrescriptions() {
+async function searchPrescriptions(cursor = null) {
     const query = document.getElementById('prescription-search').value;
     const date = document.getElementById('prescription-date-filter').value;
     
     try {
-        let url = '/prescriptions?';
-        const params = [];
-        
-        if (query) params.push(`patient_name=${encodeURIComponent(query)}`);
-        if (date) params.push(`date=${date}`);
-        
-        if (params.length > 0) {
-            url += params.join('&');
-        } else {
-            url = '/prescriptions';
-        }
-        
-        const result = await apiCall(url);
-        displayPrescriptions(result.prescriptions);
+        const result = await PrescriptionAPI.getAll({
+            patient_name: query,
+            date: date,
+            fields: PRESCRIPTION_LIST_FIELDS,
+            limit: LIST_PAGE_SIZE,
+            cursor
+        });
+        prescriptionRows = cursor ? prescriptionRows.concat(result.prescriptions) : result.prescriptions;
+        displayPrescriptions(prescriptionRows, result.next_cursor, 'searchPrescriptions');
     } catch (error) {
         console.error('Search error:', error);
         document.getElementById('prescriptions-list').innerHTML = 
@@ -75,7 +75,7 @@ async function filterPrescriptionsByDate() {
     searchPrescriptions();
 }
 
-function displayPrescriptions(prescriptions) {
+function displayPrescriptions(prescriptions, nextCursor = null, loader = null) {
     const listDiv = document.getElementById('prescriptions-list');
     
     if (!prescriptions || prescriptions.length === 0) {
@@ -125,6 +125,7 @@ function displayPrescriptions(prescriptions) {
         </div>
     `;
 
+    html += loadMoreButton(nextCursor, loader);
     listDiv.innerHTML = html;
 }
 
@@ -135,10 +136,10 @@ async function showAddPrescriptionForm() {
     let appointments = [];
     
     try {
-        const patientsResult = await PatientAPI.getAll();
+        const patientsResult = await PatientAPI.getAll({ fields: ['patient_id', 'first_name', 'last_name'] });
         patients = patientsResult.patients || [];
         
-        const doctorsResult = await DoctorAPI.getAll();
+        const doctorsResult = await DoctorAPI.getAll({ fields: ['doctor_id', 'first_name', 'last_name', 'specialization'] });
         doctors = doctorsResult.doctors || [];
         
         const appointmentsResult = await AppointmentAPI.getAll();
@@ -272,10 +273,10 @@ async function loadMedicineAutocomplete() {
 async function searchMedicines(query) {
     if (query.length < 2) return;
     try {
-        const result = await MedicineAPI.search(query);
+        const result = await MedicineAPI.getAutocomplete(query);
         const medicines = result.medicines || [];
         const datalist = document.getElementById('medicine-list');
-        datalist.innerHTML = medicines.map(m => `<option value="${m.medicine_name || m}">`).join('');
+        datalist.innerHTML = medicines.map(m => `<option value="${m}">`).join('');
     } catch (error) {
         console.error('Error searching medicines:', error);
     }
@@ -374,7 +375,7 @@ async function loadPatientAppointments() {
     }
     
     try {
-        const result = await AppointmentAPI.getAll();
+        const result = await AppointmentAPI.getAll({ patient_id: patientId });
         const appointments = result.appointments || [];
         const patientAppointments = appointments.filter(a => a.patient_id === patientId);
         